@@ -1,15 +1,25 @@
+import argparse
 import logging
+import math
 import os
-from typing import Any, List
+import signal
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set
 
+import yaml
 from dotenv import load_dotenv
 
-from src.agent.agent import DataAnalysisAgent
+from src.agent.agent import DataAnalysisAgent, DatabaseRoutingAgent
 from src.clients.db_client import DatabaseClient
-from src.clients.jira_client import JiraClient
+from src.clients.db_router import DatabaseRouter
+from src.clients.jira_client import ISSUE_DETAIL_FIELDS, JiraClient
+from src.clients.query_cache import QueryCache
+from src.clients.schema_catalog import SchemaCatalog
 from src.models.schemas import JiraTicket
 
-# configure logging
+# configure logging (the log directory isn't part of the repository)
+os.makedirs("./logs", exist_ok=True)
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
@@ -25,76 +35,250 @@ JIRA_USER_EMAIL = os.environ.get("JIRA_USER_EMAIL")
 JIRA_API_TOKEN = os.environ.get("JIRA_API_TOKEN")
 JIRA_PROJECT_KEY = os.environ.get("JIRA_PROJECT_KEY")
 
-# Database parameters
+# Database parameters (used when the config has no "databases" section)
 DB_PATH = "./data/porsche_analytics.db"
 SQLITE_CONNECTION_STRING = f"sqlite:///{DB_PATH}"
 
+# account id of the bot persisted between runs (saves a "/myself" call on start)
+JIRA_ACCOUNT_CACHE_PATH = "./data/.jira_account.json"
 
-def get_active_issue_ids_from_jira(jira_clinet: Any):
-    """Get active tickets from JIRA."""
-    # get issues ids assigned to the bot
-    active_issues = jira_clinet.get_active_issues()
-    issue_keys = [issue["key"] for issue in active_issues]
+# database schema catalog shared between runs and processes (refreshed incrementally)
+SCHEMA_CATALOG_CACHE_PATH = "./data/.schema_catalog.json"
 
-    # rule: if the last comment from bot -> no need to process the ticket
-    issue_ids = []
-    for issue in issue_keys:
-        # TODO: improve in the future (API call in a loop -> slow)
-        response = jira_clinet.get_comments(issue_key=issue)
-
-        # if empty comments -> process
-        if not response["comments"]:
-            issue_ids.append(issue)
-        else:
-            last_comment = response["comments"][-1]
-            if last_comment["author"]["accountId"] != jira_clinet.account_id:
-                issue_ids.append(issue)
-    return issue_ids
-
-
-def get_jira_tickets(jira_clinet: Any, issue_ids: List[str]):
-    tickets = []
-    active_issue_ids = get_active_issue_ids_from_jira(jira_clinet=jira_clinet)
-    for issue_id in active_issue_ids:
-        issue = jira_clinet.get_issue(issue=issue_id)
-        tickets.append(jira_clinet.extract_issue_details(issue))
-    return tickets
+# number of Jira search pages fetched concurrently during intake
+JIRA_SEARCH_WORKERS = 4
 
+# daemon mode parameters
+POLLING_INTERVAL_SECONDS = 60
+WATERMARK_OVERLAP_MINUTES = 1  # re-read a bit of the previous window (clock skew)
 
-def main(agen_config: str) -> None:
-    # load environment variables
-    load_dotenv()
 
-    # define clients
-    jira = JiraClient(
-        base_url=JIRA_BASE_URL, email=JIRA_USER_EMAIL, api_token=JIRA_API_TOKEN
-    )
-    sqlite_client = DatabaseClient(SQLITE_CONNECTION_STRING)
-    agent = DataAnalysisAgent(
-        agent_config=agen_config, db_client=sqlite_client, max_retries=3
+def is_last_comment_from_bot(jira_clinet: Any, issue: Dict[str, Any]) -> bool:
+    """Check if the last comment of an issue (as returned by search) is from the bot."""
+    comment_field = issue.get("fields", {}).get("comment") or {}
+    comments = comment_field.get("comments", [])
+
+    # search pages may truncate long comment threads -> fetch the full thread
+    if comment_field.get("total", len(comments)) > len(comments):
+        comments = jira_clinet.get_comments(issue_key=issue["key"])["comments"]
+
+    # if empty comments -> process
+    if not comments:
+        return False
+    return comments[-1]["author"]["accountId"] == jira_clinet.account_id
+
+
+def get_active_issues_from_jira(
+    jira_clinet: Any,
+    updated_within_minutes: Optional[int] = None,
+    include_keys: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """Get active issues (full payloads) from JIRA that wait for the bot's response."""
+    # one paginated search returns details and comments of the issues assigned to the bot
+    active_issues = jira_clinet.get_active_issues(
+        fields=ISSUE_DETAIL_FIELDS + ["comment"],
+        max_workers=JIRA_SEARCH_WORKERS,
+        updated_within_minutes=updated_within_minutes,
+        include_keys=include_keys,
     )
 
+    # rule: if the last comment from bot -> no need to process the ticket
+    return [
+        issue
+        for issue in active_issues
+        if not is_last_comment_from_bot(jira_clinet=jira_clinet, issue=issue)
+    ]
+
+
+def get_active_issue_ids_from_jira(jira_clinet: Any) -> List[str]:
+    """Get active tickets from JIRA."""
+    return [issue["key"] for issue in get_active_issues_from_jira(jira_clinet)]
+
+
+def get_jira_tickets(
+    jira_clinet: Any, issues: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Extract ticket details from already fetched issue payloads."""
+    return [jira_clinet.extract_issue_details(issue) for issue in issues]
+
+
+def run_polling_cycle(
+    jira: Any,
+    agent: Any,
+    updated_within_minutes: Optional[int] = None,
+    failed_ticket_ids: Optional[Set[str]] = None,
+) -> bool:
+    """
+    Fetch issues waiting for the bot and process them.
+
+    Tickets of "failed_ticket_ids" (failed in previous cycles) are fetched again even
+    if they were not updated recently. If the cycle completes, the set is replaced by
+    the tickets that failed in this cycle.
+
+    Returns True if the cycle completed, False if it failed.
+    """
+    jira_clients = {id(jira): jira, id(agent.jira_client): agent.jira_client}.values()
+    requests_before = sum(client.request_count for client in jira_clients)
+    completed = True
     try:
         # get active issues from JIRA (assigned to the bot)
-        issue_ids = get_active_issue_ids_from_jira(jira_clinet=jira)
-        jira_tickets = get_jira_tickets(jira_clinet=jira, issue_ids=issue_ids)
+        active_issues = get_active_issues_from_jira(
+            jira_clinet=jira,
+            updated_within_minutes=updated_within_minutes,
+            include_keys=sorted(failed_ticket_ids) if failed_ticket_ids else None,
+        )
+        jira_tickets = get_jira_tickets(jira_clinet=jira, issues=active_issues)
 
-        # process each ticket
+        # transfrom raw dicts into JiraTicket (pydantic model)
         logger.info(f"Found {len(jira_tickets)} issues to process")
-        for jira_ticket in jira_tickets:
-            # transfrom raw dict into JiraTicket (pydantic model)
-            jira_ticket = JiraTicket(
+        jira_tickets = [
+            JiraTicket(
                 ticket_id=jira_ticket["ticket_id"],
                 summary=jira_ticket["summary"],
                 description=jira_ticket["description"],
                 status=jira_ticket["status"],
+                project_key=jira_ticket["project"],
+                issue_type=jira_ticket["issue_type"],
+                labels=jira_ticket.get("labels") or [],
+                components=jira_ticket.get("components") or [],
             )
+            for jira_ticket in jira_tickets
+        ]
+
+        # process tickets concurrently
+        summaries = agent.process_tickets(tickets=jira_tickets)
 
-            agent.process_ticket(ticket=jira_ticket)
+        # failed tickets aren't updated by the bot -> retried by the next cycles
+        if failed_ticket_ids is not None:
+            failed_ticket_ids.clear()
+            failed_ticket_ids.update(
+                summary.ticket_id for summary in summaries if not summary.succeeded
+            )
+            if failed_ticket_ids:
+                logger.warning(
+                    f"Tickets to retry next cycle: {', '.join(sorted(failed_ticket_ids))}"
+                )
 
     except Exception as e:
-        logger.error(f"Error in main function call: {str(e)}", exc_info=True)
+        logger.error(f"Error in polling cycle: {str(e)}", exc_info=True)
+        completed = False
+
+    requests_made = sum(client.request_count for client in jira_clients)
+    logger.info(f"Polling cycle made {requests_made - requests_before} Jira requests")
+    return completed
+
+
+def create_clients(agen_config: str):
+    """Create the Jira client, the database clients and the agent."""
+    jira = JiraClient(
+        base_url=JIRA_BASE_URL,
+        email=JIRA_USER_EMAIL,
+        api_token=JIRA_API_TOKEN,
+        account_id_cache_path=JIRA_ACCOUNT_CACHE_PATH,
+    )
+    with open(agen_config, "r") as file:
+        databases = (yaml.safe_load(file) or {}).get("databases")
+
+    # retries and recurring tickets re-run identical SQL (cache keys include the database)
+    query_cache = QueryCache()
+
+    def create_db_client(connection_string: str) -> DatabaseClient:
+        return DatabaseClient(
+            connection_string,
+            read_only=True,
+            query_cache=query_cache,
+            schema_catalog=SchemaCatalog(cache_path=SCHEMA_CATALOG_CACHE_PATH),
+        )
+
+    if not databases:
+        agent = DataAnalysisAgent(
+            agent_config=agen_config,
+            db_client=create_db_client(SQLITE_CONNECTION_STRING),
+            max_retries=3,
+            jira_client=jira,
+        )
+        return jira, agent
+
+    # one agent per database, tickets are routed by component/label/referenced tables
+    router = DatabaseRouter.from_config(databases, client_factory=create_db_client)
+    agent = DatabaseRoutingAgent(
+        agent_config=agen_config,
+        router=router,
+        max_retries=3,
+        jira_client=jira,
+    )
+    return jira, agent
+
+
+def main(agen_config: str) -> None:
+    # load environment variables
+    load_dotenv()
+
+    # define clients
+    jira, agent = create_clients(agen_config=agen_config)
+    run_polling_cycle(jira=jira, agent=agent)
+
+
+def run_daemon(
+    agen_config: str, interval_seconds: float = POLLING_INTERVAL_SECONDS
+) -> None:
+    """
+    Poll JIRA until SIGTERM/SIGINT is received.
+
+    The agent (LLM client, tools, DB schema) is built once and kept warm. The first
+    cycle scans all active issues, the following ones only fetch issues updated since
+    the previous successful cycle and the tickets that failed. On shutdown the current
+    cycle (in-flight tickets) is completed before exiting.
+    """
+    load_dotenv()
+    jira, agent = create_clients(agen_config=agen_config)
+
+    stop_event = threading.Event()
+
+    def request_stop(signum, frame):
+        logger.info(f"Received signal {signum}, stopping after the current cycle")
+        stop_event.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    last_seen = None  # start time of the last successful cycle (watermark)
+    failed_ticket_ids: Set[str] = set()  # not matched by the watermark anymore
+    while not stop_event.is_set():
+        cycle_start = time.time()
+        updated_within_minutes = None
+        if last_seen is not None:
+            elapsed_minutes = math.ceil((cycle_start - last_seen) / 60)
+            updated_within_minutes = elapsed_minutes + WATERMARK_OVERLAP_MINUTES
+
+        if run_polling_cycle(
+            jira=jira,
+            agent=agent,
+            updated_within_minutes=updated_within_minutes,
+            failed_ticket_ids=failed_ticket_ids,
+        ):
+            last_seen = cycle_start
+
+        stop_event.wait(interval_seconds)
+
+    logger.info("Daemon stopped")
 
 
 if __name__ == "__main__":
-    main(agen_config="./config/config.yaml")
+    parser = argparse.ArgumentParser(description="Data analysis agent for JIRA tickets")
+    parser.add_argument("--config", default="./config/config.yaml")
+    parser.add_argument(
+        "--daemon", action="store_true", help="keep polling JIRA until stopped"
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=POLLING_INTERVAL_SECONDS,
+        help="seconds between polling cycles in daemon mode",
+    )
+    args = parser.parse_args()
+
+    if args.daemon:
+        run_daemon(agen_config=args.config, interval_seconds=args.interval)
+    else:
+        main(agen_config=args.config)
@@ -0,0 +1,75 @@
+import argparse
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.clients.db_client import DatabaseClient
+
+logging.basicConfig(level=logging.WARNING)
+
+DEFAULT_SIZES = [1_000, 100_000, 10_000_000]
+QUERY = "SELECT sale_id, model_id, price, discount, region FROM sales"
+
+
+def create_database(path: str, rows: int) -> None:
+    """Create a sales table with integer, real, nullable and text columns."""
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE sales (sale_id INTEGER PRIMARY KEY, model_id INTEGER, "
+        "price REAL, discount INTEGER, region TEXT)"
+    )
+    conn.execute(
+        "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?) "
+        "INSERT INTO sales SELECT i, i % 12, 50000 + (i % 997) * 13.5, "
+        "CASE WHEN i % 10 = 0 THEN NULL ELSE i % 20 END, "
+        "CASE i % 3 WHEN 0 THEN 'EU' WHEN 1 THEN 'US' ELSE 'APAC' END FROM n",
+        (rows,),
+    )
+    conn.commit()
+    conn.close()
+
+
+def measure(client: DatabaseClient, repeat: int) -> float:
+    """Best wall time of "execute_query" over the repeats, in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        client.execute_query(QUERY)
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def run_benchmark(sizes: list, repeat: int) -> None:
+    """Compare the SQLite column reader with the pandas read path."""
+    print(f"{'rows':>12} {'pandas (ms)':>14} {'reader (ms)':>14} {'speedup':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in sizes:
+            path = os.path.join(directory, f"sales_{rows}.db")
+            create_database(path, rows)
+            url = f"sqlite:///{path}"
+
+            pandas_client = DatabaseClient(url, sqlite_fast_path=False)
+            reader_client = DatabaseClient(url)
+            pandas_ms = measure(pandas_client, repeat)
+            reader_ms = measure(reader_client, repeat)
+            pandas_client.close()
+            reader_client.close()
+
+            print(
+                f"{rows:>12,} {pandas_ms:>14.1f} {reader_ms:>14.1f} "
+                f"{pandas_ms / reader_ms:>8.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the SQLite result reader")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    run_benchmark(args.sizes, args.repeat)
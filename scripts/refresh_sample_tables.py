@@ -0,0 +1,43 @@
+import argparse
+import logging
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.clients.db_client import DatabaseClient
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONNECTION_STRING = "sqlite:///data/porsche_analytics.db"
+
+
+def refresh_sample_tables(
+    connection_string: str, fraction: float, min_table_rows: int, force: bool
+) -> None:
+    """Build or refresh the uniform samples used by approximate execution (SQLite)."""
+    client = DatabaseClient(connection_string)
+    try:
+        refreshed = client.refresh_sample_tables(
+            fraction=fraction, min_table_rows=min_table_rows, force=force
+        )
+        logger.info(f"Refreshed {len(refreshed)} sample table(s): {', '.join(refreshed)}")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Refresh SQLite sample tables")
+    parser.add_argument("--connection-string", default=DEFAULT_CONNECTION_STRING)
+    parser.add_argument("--fraction", type=float, default=0.01)
+    parser.add_argument("--min-table-rows", type=int, default=1_000_000)
+    parser.add_argument("--force", action="store_true", help="rebuild all samples")
+    args = parser.parse_args()
+
+    refresh_sample_tables(
+        args.connection_string, args.fraction, args.min_table_rows, args.force
+    )
@@ -1,17 +1,23 @@
 import logging
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 import yaml
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from langgraph.graph import StateGraph
 
 from src.agent.workflow import create_workflow
 from src.clients.jira_client import JiraClient
-from src.models.schemas import AgentState, JiraTicket
+from src.models.schemas import AgentState, JiraTicket, TicketRunSummary
 from src.tools.insight_tool import InsightTool
+from src.tools.llm_cache import CachedLLM, LLMResponseCache
+from src.tools.schema_retriever import SchemaRetriever
+from src.tools.semantic_cache import SemanticCache
 from src.tools.sql_tool import SQLTool
 from src.tools.validator_tool import ValidatorTool
 
@@ -20,54 +26,234 @@ load_dotenv()
 logger = logging.getLogger(__name__)
 
 
+def load_yaml_config(path: str | Path) -> Dict[str, Any]:
+    """Load configuration from YAML file."""
+    with open(path, "r") as file:
+        return yaml.safe_load(file)
+
+
+def get_feature_config(config: Dict[str, Any], name: str) -> Optional[Dict[str, Any]]:
+    """Options of an optional agent feature, None if missing or "enabled: false"."""
+    options = config["agent"].get(name)
+    if not options or not options.get("enabled", True):
+        return None
+    return {key: value for key, value in options.items() if key != "enabled"}
+
+
+def run_tickets(
+    tickets: List[JiraTicket],
+    run_ticket: Callable[[JiraTicket], TicketRunSummary],
+    max_concurrency: int,
+    llm_cache: Optional[LLMResponseCache] = None,
+) -> List[TicketRunSummary]:
+    """
+    Run tickets on a thread pool and log their outcomes.
+
+    Parameters
+    ----------
+    tickets : List[JiraTicket]
+        Tickets to process.
+    run_ticket : Callable[[JiraTicket], TicketRunSummary]
+        Processes a ticket and captures its outcome (must not raise).
+    max_concurrency : int
+        The number of tickets processed at the same time.
+    llm_cache : Optional[LLMResponseCache]
+        The LLM response cache whose hit rates are logged.
+
+    Returns
+    -------
+    List[TicketRunSummary]
+        Outcome and wall time of every ticket (in the order of `tickets`).
+    """
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        summaries = list(executor.map(run_ticket, tickets))
+
+    succeeded = sum(summary.succeeded for summary in summaries)
+    logger.info(f"Processed {len(summaries)} tickets: {succeeded} succeeded")
+    for summary in summaries:
+        logger.info(
+            f"Ticket {summary.ticket_id}: "
+            f"{'succeeded' if summary.succeeded else 'failed'} "
+            f"in {summary.wall_time_ms:.0f} ms"
+        )
+    if llm_cache is not None:
+        for tool, stats in llm_cache.get_stats()["tools"].items():
+            logger.info(
+                f"LLM cache {tool}: {stats['hits']} hits, {stats['misses']} misses "
+                f"({stats['hit_rate']:.0%} hit rate)"
+            )
+    return summaries
+
+
+class ConcurrencyLimitedLLM:
+    """LLM wrapper that caps the number of concurrent calls shared by all tools."""
+
+    def __init__(self, llm: Any, max_concurrency: int):
+        self.llm = llm
+        self.semaphore = threading.BoundedSemaphore(max_concurrency)
+
+    def invoke(self, *args, **kwargs) -> Any:
+        with self.semaphore:
+            return self.llm.invoke(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.llm, name)
+
+
 class DataAnalysisAgent:
-    def __init__(self, agent_config: str, db_client: Any, max_retries: int = 3):
+    def __init__(
+        self,
+        agent_config: str,
+        db_client: Any,
+        max_retries: int = 3,
+        jira_client: Optional[Any] = None,
+        llm: Optional[Any] = None,
+        llm_cache: Optional[LLMResponseCache] = None,
+    ):
         self.config = self._load_yaml_config(agent_config)
         self.max_retries = max_retries
 
-        # initialize clients
+        # initialize clients (reuse the caller's JIRA client if provided)
         self.db_client = db_client
         self.db_schema = self.db_client.get_database_schema()
-        self.jira_client = JiraClient(
+        self.jira_client = jira_client or JiraClient(
             base_url=os.environ.get("JIRA_BASE_URL"),
             email=os.environ.get("JIRA_USER_EMAIL"),
             api_token=os.environ.get("JIRA_API_TOKEN"),
         )
 
-        # initialize LLM
-        self.llm = ChatOpenAI(
-            model=self.config["agent"]["llm"]["model_name"],
-            temperature=self.config["agent"]["llm"]["temperature"],
-            max_tokens=self.config["agent"]["llm"]["max_tokens"],
+        # initialize LLM (calls are capped across concurrently processed tickets)
+        self.llm = llm or ConcurrencyLimitedLLM(
+            llm=ChatOpenAI(
+                model=self.config["agent"]["llm"]["model_name"],
+                temperature=self.config["agent"]["llm"]["temperature"],
+                max_tokens=self.config["agent"]["llm"]["max_tokens"],
+            ),
+            max_concurrency=self.config["agent"]["llm"].get("max_concurrency", 4),
         )
 
+        # exact-match cache of LLM responses (reuse the caller's cache if provided)
+        self.llm_cache = llm_cache or self._create_llm_cache()
+
         # initialize tools
-        self.sql_generation_tool = SQLTool(llm=self.llm, db_schema=self.db_schema)
-        self.sql_validation_tool = ValidatorTool(
-            llm=self.llm, schema_dict=self.db_schema
+        self.schema_retrieval = self.config["agent"].get("schema_retrieval")
+        self.sql_generation_tool = SQLTool(
+            llm=self._get_tool_llm("sql_generation"),
+            db_schema=self.db_schema,
+            schema_retriever=self._create_schema_retriever(),
+            semantic_cache=self._create_semantic_cache(),
+            prune_schema=bool((self.schema_retrieval or {}).get("prune")),
         )
-        self.sql_insight_tool = InsightTool(llm=self.llm)
+        self.sql_validation_tool = self._create_validation_tool()
+        self.sql_insight_tool = InsightTool(llm=self._get_tool_llm("insight"))
+
+        # time budgets (None means no limit)
+        self.query_timeout_seconds = self.config["agent"].get("query_timeout_seconds")
+        self.ticket_timeout_seconds = self.config["agent"].get("ticket_timeout_seconds")
+
+        # retries send the failing query and its errors back to the LLM
+        self.repair_failed_sql = self.config["agent"].get("repair_failed_sql", True)
+
+        # EXPLAIN-based cost gate before execution (None disables it)
+        self.cost_gate = get_feature_config(self.config, "cost_gate")
+
+        # sampled execution for tickets opting in with a label (None disables it)
+        self.approximate = get_feature_config(self.config, "approximate")
+
+        # cancellation of the statements run for in-flight tickets
+        self._cancel_events: Dict[str, threading.Event] = {}
+        self._cancel_lock = threading.Lock()
 
         # langgraph workflow
         self.workflow = self._create_agent_workflow()
 
     def _load_yaml_config(self, path: str | Path) -> Dict[str, Any]:
         """Load configuration from YAML file."""
-        with open(path, "r") as file:
-            return yaml.safe_load(file)
+        return load_yaml_config(path)
 
     def _create_agent_workflow(self) -> StateGraph:
         return create_workflow(agent=self, max_retries=self.max_retries)
 
-    def process_ticket(self, ticket: JiraTicket) -> None:
+    def _create_validation_tool(self) -> ValidatorTool:
+        return ValidatorTool(
+            llm=self._get_tool_llm("sql_validation"),
+            schema_dict=self.db_schema,
+            # writes are already rejected by a read-only database
+            check_dangerous=getattr(self.db_client, "read_only", False) is not True,
+        )
+
+    def _create_llm_cache(self) -> Optional[LLMResponseCache]:
+        """Exact-match cache of LLM responses (None if not configured)."""
+        config = self.config["agent"].get("llm_cache")
+        if not config:
+            return None
+        return LLMResponseCache(
+            path=config.get("path"),
+            max_entries=config.get("max_entries", 1024),
+            max_persistent_entries=config.get("max_persistent_entries", 100_000),
+        )
+
+    def _get_tool_llm(self, tool: str) -> Any:
+        """LLM of a tool, answering repeated prompts from the cache if configured."""
+        if self.llm_cache is None:
+            return self.llm
+        return CachedLLM(llm=self.llm, cache=self.llm_cache, tool=tool)
+
+    def _create_schema_retriever(self) -> Optional[SchemaRetriever]:
+        """Index of the schema used to prompt with the relevant tables only."""
+        if not self.schema_retrieval:
+            return None
+        options = {k: v for k, v in self.schema_retrieval.items() if k != "prune"}
+        try:
+            return SchemaRetriever.from_database(self.db_client, **options)
+        except Exception as e:
+            # pruning is an optimization, the full schema still works
+            logger.warning(f"Schema retrieval disabled: {str(e)}")
+            return None
+
+    def _create_semantic_cache(self) -> Optional[SemanticCache]:
+        """Cache of validated SQL by task description (None if not configured)."""
+        config = get_feature_config(self.config, "semantic_cache")
+        if not config:
+            return None
+        embedding_model = config.get("embedding_model")
+        return SemanticCache(
+            path=config["path"],
+            # local hashed embeddings unless an embedding model is configured
+            embeddings=OpenAIEmbeddings(model=embedding_model) if embedding_model else None,
+            similarity_threshold=config.get("similarity_threshold", 0.95),
+            max_entries=config.get("max_entries", 5000),
+        )
+
+    def refresh_schema(self) -> None:
+        """Re-read the database schema (the tools are updated only if it changed)."""
+        db_schema = self.db_client.get_database_schema()
+        if db_schema == self.db_schema:
+            return
+        logger.info("Database schema changed, updating the tools")
+        self.db_schema = db_schema
+        self.sql_generation_tool.schema_retriever = self._create_schema_retriever()
+        self.sql_generation_tool.set_schema(db_schema)
+        self.sql_validation_tool = self._create_validation_tool()
+
+    def process_ticket(self, ticket: JiraTicket) -> AgentState:
         """Process a single JIRA ticket."""
         logger.info(f"Processing ticket {ticket.ticket_id}")
 
         # define initial agent state
-        initial_state = AgentState(ticket=ticket)
+        deadline = None
+        if self.ticket_timeout_seconds is not None:
+            deadline = time.monotonic() + self.ticket_timeout_seconds
+        initial_state = AgentState(ticket=ticket, deadline=deadline)
 
         # execute the workflow
-        final_state = self.workflow.invoke(initial_state)
+        with self._cancel_lock:
+            self._cancel_events[ticket.ticket_id] = threading.Event()
+        try:
+            final_state = self.workflow.invoke(initial_state)
+        finally:
+            with self._cancel_lock:
+                self._cancel_events.pop(ticket.ticket_id, None)
         final_state = AgentState.model_validate(
             final_state
         )  # convert back to Pydantic model (AgentState)
@@ -76,6 +262,185 @@ class DataAnalysisAgent:
             logger.info(f"Successfully processed ticket {ticket.ticket_id}")
         else:
             logger.error(f"Failed to process ticket {ticket.ticket_id}")
+        return final_state
+
+    def get_cancel_event(self, ticket_id: str) -> Optional[threading.Event]:
+        """Event that aborts the running statement of a ticket when set."""
+        with self._cancel_lock:
+            return self._cancel_events.get(ticket_id)
+
+    def cancel_ticket(self, ticket_id: str) -> bool:
+        """
+        Cancel the processing of an in-flight ticket (its running query is aborted).
+
+        Parameters
+        ----------
+        ticket_id : str
+            The ticket to cancel.
+
+        Returns
+        -------
+        bool
+            True if the ticket was being processed.
+        """
+        cancel_event = self.get_cancel_event(ticket_id)
+        if cancel_event is None:
+            return False
+        logger.info(f"Cancelling ticket {ticket_id}")
+        cancel_event.set()
+        return True
+
+    def cancel_all(self) -> None:
+        """Cancel the processing of all in-flight tickets."""
+        with self._cancel_lock:
+            ticket_ids = list(self._cancel_events)
+        for ticket_id in ticket_ids:
+            self.cancel_ticket(ticket_id)
+
+    def _run_ticket(self, ticket: JiraTicket) -> TicketRunSummary:
+        """Process a ticket and capture its outcome (errors don't affect other tickets)."""
+        start_time = time.perf_counter()
+        try:
+            final_state = self.process_ticket(ticket)
+            succeeded = bool(final_state.business_insight)
+            error = final_state.error_message
+        except Exception as e:
+            logger.error(
+                f"Error processing ticket {ticket.ticket_id}: {str(e)}", exc_info=True
+            )
+            succeeded, error = False, str(e)
+
+        return TicketRunSummary(
+            ticket_id=ticket.ticket_id,
+            succeeded=succeeded,
+            wall_time_ms=(time.perf_counter() - start_time) * 1000,
+            error=error,
+        )
+
+    def process_tickets(
+        self, tickets: List[JiraTicket], max_concurrency: Optional[int] = None
+    ) -> List[TicketRunSummary]:
+        """
+        Process many JIRA tickets concurrently.
+
+        Parameters
+        ----------
+        tickets : List[JiraTicket]
+            Tickets to process.
+        max_concurrency : Optional[int]
+            The number of tickets processed at the same time.
+            Defaults to "agent.max_concurrency" from the config.
+
+        Returns
+        -------
+        List[TicketRunSummary]
+            Outcome and wall time of every ticket (in the order of `tickets`).
+        """
+        if max_concurrency is None:
+            max_concurrency = self.config["agent"].get("max_concurrency", 1)
+
+        if not tickets:
+            return []
+
+        # the schema catalog is cheap to check, the prompt is re-rendered on changes only
+        self.refresh_schema()
+        return run_tickets(
+            tickets=tickets,
+            run_ticket=self._run_ticket,
+            max_concurrency=max_concurrency,
+            llm_cache=self.llm_cache,
+        )
+
+
+class DatabaseRoutingAgent:
+    """
+    Serves tickets from several databases with one DataAnalysisAgent per database.
+
+    Every ticket is routed to a database by the DatabaseRouter and processed by the
+    agent built for it (tools hold the schema of that database). The agents share
+    the JIRA client, the concurrency-limited LLM and the LLM response cache.
+    """
+
+    def __init__(
+        self,
+        agent_config: str,
+        router: Any,
+        max_retries: int = 3,
+        jira_client: Optional[Any] = None,
+    ):
+        self.config = load_yaml_config(agent_config)
+        self.router = router
+        self.agents: Dict[str, DataAnalysisAgent] = {}
+        # created by the first agent, shared by the others
+        self.llm, self.llm_cache = None, None
+        self.jira_client = jira_client
+        for name in router.targets:
+            agent = DataAnalysisAgent(
+                agent_config=agent_config,
+                db_client=router.get_database(name),
+                max_retries=max_retries,
+                jira_client=self.jira_client,
+                llm=self.llm,
+                llm_cache=self.llm_cache,
+            )
+            self.llm, self.llm_cache, self.jira_client = (
+                agent.llm,
+                agent.llm_cache,
+                agent.jira_client,
+            )
+            self.agents[name] = agent
+
+    def get_agent(self, ticket: JiraTicket) -> DataAnalysisAgent:
+        """Agent of the database the ticket is routed to."""
+        target = self.router.route(ticket)
+        logger.info(f"Ticket {ticket.ticket_id} routed to database {target}")
+        return self.agents[target]
+
+    def process_ticket(self, ticket: JiraTicket) -> AgentState:
+        """Process a single JIRA ticket on its database."""
+        return self.get_agent(ticket).process_ticket(ticket)
+
+    def _run_ticket(self, ticket: JiraTicket) -> TicketRunSummary:
+        try:
+            agent = self.get_agent(ticket)
+        except Exception as e:
+            logger.error(f"Error routing ticket {ticket.ticket_id}: {str(e)}")
+            return TicketRunSummary(
+                ticket_id=ticket.ticket_id, succeeded=False, wall_time_ms=0.0, error=str(e)
+            )
+        return agent._run_ticket(ticket)
+
+    def process_tickets(
+        self, tickets: List[JiraTicket], max_concurrency: Optional[int] = None
+    ) -> List[TicketRunSummary]:
+        """Process many JIRA tickets concurrently, each on its database."""
+        if max_concurrency is None:
+            max_concurrency = self.config["agent"].get("max_concurrency", 1)
+
+        if not tickets:
+            return []
+
+        self.refresh_schema()
+        return run_tickets(
+            tickets=tickets,
+            run_ticket=self._run_ticket,
+            max_concurrency=max_concurrency,
+            llm_cache=self.llm_cache,
+        )
+
+    def refresh_schema(self) -> None:
+        """Re-read the schema of every database."""
+        for agent in self.agents.values():
+            agent.refresh_schema()
+
+    def cancel_ticket(self, ticket_id: str) -> bool:
+        """Cancel the processing of an in-flight ticket on any database."""
+        return any([agent.cancel_ticket(ticket_id) for agent in self.agents.values()])
+
+    def cancel_all(self) -> None:
+        """Cancel the processing of all in-flight tickets."""
+        for agent in self.agents.values():
+            agent.cancel_all()
 
 
 # drop later
@@ -1,8 +1,10 @@
 import logging
-from typing import Any, Literal
+import time
+from typing import Any, Literal, Optional
 
 from langgraph.graph import END, StateGraph
 
+from src.clients.db_client import QueryCancelledError, QueryTimeoutError
 from src.models.schemas import AgentState, BusinessInsight, ValidationResult
 
 logger = logging.getLogger(__name__)
@@ -13,6 +15,10 @@ def create_workflow(agent: Any, max_retries: int = 3):
 
     """Create the agent workflow graph."""
 
+    def deadline_exceeded(state: AgentState) -> bool:
+        """Whether the ticket ran out of time (no more retries)."""
+        return state.deadline is not None and time.monotonic() >= state.deadline
+
     def check_validation_results(
         state: AgentState,
     ) -> Literal["continue", "retry", "failed"]:
@@ -20,7 +26,7 @@ def create_workflow(agent: Any, max_retries: int = 3):
         if state.validation_result and state.validation_result.is_valid:
             return "continue"
 
-        if state.retry_count < max_retries:
+        if state.retry_count < max_retries and not deadline_exceeded(state):
             return "retry"
         else:
             return "failed"
@@ -32,6 +38,9 @@ def create_workflow(agent: Any, max_retries: int = 3):
         if state.query_result:
             return "continue"
 
+        # a cancelled ticket is abandoned, a timed out query is regenerated
+        if state.error_type == "cancelled" or deadline_exceeded(state):
+            return "failed"
         if state.retry_count < max_retries:
             return "retry"
         else:
@@ -44,6 +53,34 @@ def create_workflow(agent: Any, max_retries: int = 3):
         )
         return state.model_copy(update={"retry_count": state.retry_count + 1})
 
+    def get_error_feedback(state: AgentState) -> Optional[str]:
+        """Why the previous query failed (None on the first attempt)."""
+        if state.retry_count == 0 or not state.sql_query:
+            return None
+
+        # the validation of the current query comes first, later steps didn't run
+        if state.validation_result and not state.validation_result.is_valid:
+            feedback = [
+                f"- {error}"
+                for error in state.validation_result.errors
+                if isinstance(error, str) and error
+            ]
+            if state.validation_result.suggestion:
+                feedback.append(f"Suggestion: {state.validation_result.suggestion}")
+            return "\n".join(feedback) or None
+
+        if state.error_type == "execution":
+            return f"Database error: {state.error_message}"
+        if state.error_type == "timeout":
+            return f"The query took too long: {state.error_message}"
+        if state.error_type == "cost":
+            return state.error_message
+        return None
+
+    def reject_sql(state: AgentState) -> None:
+        """Forget the failing SQL, the same prompt must not get it back from a cache."""
+        agent.sql_generation_tool.forget_query(state.sql_query)
+
     def set_agent_task_from_ticket(state: AgentState) -> AgentState:
         """Extract task from JIRA ticket."""
         logger.info(f"Extracting task from ticket {state.ticket.ticket_id}")
@@ -55,12 +92,25 @@ def create_workflow(agent: Any, max_retries: int = 3):
     ) -> AgentState:
         """Generate SQL query from task description."""
         logger.info(f"Generating SQL for the current task")
+        # retries repair the failing query with the errors it got
+        error_feedback = get_error_feedback(state) if agent.repair_failed_sql else None
         try:
+            # the first attempt sees the relevant tables only (or reuses the SQL of a
+            # similar task), retries get the full schema and a fresh LLM answer
             sql_query = agent.sql_generation_tool.generate_query(
-                task_description=state.current_task
+                task_description=state.current_task,
+                full_schema=state.retry_count > 0,
+                use_cache=state.retry_count == 0,
+                previous_sql=state.sql_query if error_feedback else None,
+                error_feedback=error_feedback,
             )
             return state.model_copy(
-                update={"sql_query": sql_query, "error_message": None}
+                update={
+                    "sql_query": sql_query,
+                    "error_message": None,
+                    "error_type": None,
+                    "query_plan": None,
+                }
             )
         except Exception as e:
             logger.error(f"Error generating SQL: {str(e)}")
@@ -73,7 +123,10 @@ def create_workflow(agent: Any, max_retries: int = 3):
             return state.model_copy(
                 update={
                     "validation_result": ValidationResult(
-                        is_valid=False, errors=["No SQL query to validate"]
+                        is_valid=False,
+                        errors=["No SQL query to validate"],
+                        warnings=[],
+                        suggestion=None,
                     )
                 }
             )
@@ -81,19 +134,124 @@ def create_workflow(agent: Any, max_retries: int = 3):
         validation_result = agent.sql_validation_tool.validate_sql(
             sql_query=state.sql_query
         )
+        if not validation_result.is_valid:
+            reject_sql(state)
         return state.model_copy(update={"validation_result": validation_result})
 
+    def check_query_cost(state: AgentState) -> AgentState:
+        """Estimate the cost of the validated SQL query from its execution plan."""
+        if not agent.cost_gate:
+            return state
+
+        logger.info("Estimating SQL query cost")
+        try:
+            estimate = agent.db_client.estimate_query_cost(
+                state.sql_query, **agent.cost_gate
+            )
+        except Exception as e:
+            # the gate is advisory, a failing EXPLAIN is reported by the execution
+            logger.warning(f"Error estimating query cost: {str(e)}")
+            return state
+
+        if estimate.full_scans or estimate.cartesian_products:
+            logger.warning(
+                f"Query plan flags - full scans: {estimate.full_scans}, "
+                f"cartesian products: {estimate.cartesian_products}"
+            )
+        if estimate.is_acceptable:
+            return state.model_copy(update={"query_plan": estimate})
+
+        # the plan is the feedback for the regeneration
+        error_message = (
+            f"Query rejected before execution: {'; '.join(estimate.reasons)}.\n"
+            f"Execution plan:\n{estimate.plan}"
+        )
+        logger.error(error_message)
+        reject_sql(state)
+        return state.model_copy(
+            update={
+                "query_plan": estimate,
+                "error_message": error_message,
+                "error_type": "cost",
+            }
+        )
+
+    def check_query_cost_results(
+        state: AgentState,
+    ) -> Literal["continue", "retry", "failed"]:
+        """Check if the query is cheap enough to be executed."""
+        if state.query_plan is None or state.query_plan.is_acceptable:
+            return "continue"
+
+        if state.retry_count < max_retries and not deadline_exceeded(state):
+            return "retry"
+        else:
+            return "failed"
+
     def execute_sql(state: AgentState) -> AgentState:
         """Execute the validated SQL query."""
         logger.info("Executing SQL query")
+
+        # the query budget is capped by the time left for the ticket
+        timeout_seconds = agent.query_timeout_seconds
+        if state.deadline is not None:
+            remaining = state.deadline - time.monotonic()
+            if remaining <= 0:
+                return state.model_copy(
+                    update={
+                        "error_message": "Ticket deadline exceeded",
+                        "error_type": "cancelled",
+                    }
+                )
+            timeout_seconds = (
+                remaining if timeout_seconds is None else min(timeout_seconds, remaining)
+            )
+
         try:
-            query_result = agent.db_client.execute_query(state.sql_query)
+            cancel_event = agent.get_cancel_event(state.ticket.ticket_id)
+            if agent.approximate and agent.approximate["label"] in state.ticket.labels:
+                # exploratory ticket: answer from a sample of the largest table
+                query_result = agent.db_client.execute_query_approximate(
+                    state.sql_query,
+                    sample_fraction=agent.approximate.get("sample_fraction", 0.01),
+                    min_table_rows=agent.approximate.get("min_table_rows", 1_000_000),
+                    timeout_seconds=timeout_seconds,
+                    cancel_event=cancel_event,
+                )
+            else:
+                query_result = agent.db_client.execute_query(
+                    state.sql_query,
+                    timeout_seconds=timeout_seconds,
+                    cancel_event=cancel_event,
+                )
+            # validated and executed -> reusable for similar tasks
+            agent.sql_generation_tool.remember_query(state.current_task, state.sql_query)
+            return state.model_copy(
+                update={
+                    "query_result": query_result,
+                    "error_message": None,
+                    "error_type": None,
+                }
+            )
+        except QueryCancelledError as e:
+            logger.error(f"Query cancelled: {str(e)}")
+            return state.model_copy(
+                update={"error_message": str(e), "error_type": "cancelled"}
+            )
+        except QueryTimeoutError as e:
+            logger.error(f"Query timed out: {str(e)}")
+            error_type = "cancelled" if deadline_exceeded(state) else "timeout"
+            if error_type == "timeout":
+                reject_sql(state)
             return state.model_copy(
-                update={"query_result": query_result, "error_message": None}
+                update={"error_message": str(e), "error_type": error_type}
             )
         except Exception as e:
             logger.error(f"Error executing query: {str(e)}")
-            return state.model_copy(update={"error_message": str(e)})
+            reject_sql(state)
+            return state.model_copy(
+                update={"error_message": str(e), "error_type": "execution"}
+            )
 
     def generate_insights(state: AgentState) -> AgentState:
         """Generate business insights from query results."""
@@ -121,7 +279,11 @@ def create_workflow(agent: Any, max_retries: int = 3):
 
         # ticket status update
         agent.jira_client.transition_issue(
-            issue_key=state.ticket.ticket_id, status_name="В работе"
+            issue_key=state.ticket.ticket_id,
+            status_name="В работе",
+            project_key=state.ticket.project_key,
+            issue_type=state.ticket.issue_type,
+            current_status=state.ticket.status,
         )
 
         # add comment with business insights
@@ -144,6 +306,7 @@ def create_workflow(agent: Any, max_retries: int = 3):
     workflow.add_node("extract_task", set_agent_task_from_ticket)
     workflow.add_node("generate_sql", generate_sql)
     workflow.add_node("validate_sql", validate_sql)
+    workflow.add_node("check_query_cost", check_query_cost)
     workflow.add_node("execute_sql", execute_sql)
     # TODO: align later on if we need query results validation!
     # workflow.add_node("validate_results", validate_results)
@@ -159,6 +322,17 @@ def create_workflow(agent: Any, max_retries: int = 3):
     workflow.add_conditional_edges(
         "validate_sql",
         check_validation_results,
+        {
+            "continue": "check_query_cost",
+            "retry": "increment_retry",
+            "failed": "update_jira_ticket",
+        },
+    )
+
+    # query plan cost gate (expensive queries are regenerated with the plan as feedback)
+    workflow.add_conditional_edges(
+        "check_query_cost",
+        check_query_cost_results,
         {
             "continue": "execute_sql",
             "retry": "increment_retry",
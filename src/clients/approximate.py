@@ -0,0 +1,314 @@
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import sqlglot
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlglot import exp
+from sqlglot.errors import SqlglotError
+
+logger = logging.getLogger(__name__)
+
+# SQLite keeps uniform samples of large tables next to them: "_sample_<table>"
+SAMPLE_TABLE_PREFIX = "_sample_"
+SAMPLE_META_TABLE = "_sample_meta"
+
+# z-score of the 95% confidence interval
+Z_95 = 1.96
+
+# resolution of the SQLite sampling fraction
+SAMPLE_RESOLUTION = 1_000_000
+
+
+@dataclass
+class _Aggregate:
+    """Aggregate of the sampled query and its helper columns"""
+
+    name: str
+    kind: str  # "count", "sum" or "avg"
+    count_column: Optional[str] = None  # rows aggregated (avg)
+    square_column: Optional[str] = None  # sum of squares (sum, avg)
+
+
+@dataclass
+class SampledQuery:
+    """Query rewritten to read a uniform sample of its largest table"""
+
+    sql: str
+    sampled_table: str
+    fraction: float
+    aggregates: List[_Aggregate] = field(default_factory=list)
+    helper_columns: List[str] = field(default_factory=list)
+
+
+def rewrite_for_sample(
+    sql_query: str,
+    dialect: Optional[str],
+    table_rows: Dict[str, Optional[int]],
+    min_table_rows: int,
+    get_sample: Callable[[str], Optional[Tuple[Optional[str], float]]],
+) -> Optional[SampledQuery]:
+    """
+    Rewrite an aggregate query to read a uniform sample of its largest table.
+
+    Supported queries are a single SELECT of COUNT/SUM/AVG aggregates (optionally
+    grouped) without subqueries, HAVING, DISTINCT or window functions. The largest
+    table (if it has at least "min_table_rows" rows) is replaced by its sample,
+    the other tables are read in full.
+
+    Parameters
+    ----------
+    sql_query : str
+        The query to rewrite.
+    dialect : Optional[str]
+        The sqlglot dialect of the query.
+    table_rows : Dict[str, Optional[int]]
+        Row estimates of the tables.
+    min_table_rows : int
+        Smaller tables are never sampled (the exact answer is cheap).
+    get_sample : Callable[[str], Optional[Tuple[Optional[str], float]]]
+        Returns the sample table replacing a table (None for TABLESAMPLE) and the
+        sampling fraction, or None if the table can't be sampled.
+
+    Returns
+    -------
+    Optional[SampledQuery]
+        The rewritten query, None if the query has to be executed exactly.
+    """
+    try:
+        statements = sqlglot.parse(sql_query, read=dialect)
+    except SqlglotError:
+        return None
+    if len(statements) != 1 or not isinstance(statements[0], exp.Select):
+        return None
+
+    tree = statements[0]
+    unsupported = (exp.Subquery, exp.With, exp.Window, exp.Union, exp.Distinct)
+    if tree.args.get("having") or any(tree.find(node) for node in unsupported):
+        return None
+    if len(list(tree.find_all(exp.Select))) > 1:
+        return None
+
+    # the largest table is sampled, it must be read only once
+    tables = list(tree.find_all(exp.Table))
+    names = [table.name for table in tables]
+    largest = max(tables, key=lambda table: table_rows.get(table.name) or 0, default=None)
+    if largest is None or (table_rows.get(largest.name) or 0) < min_table_rows:
+        return None
+    if names.count(largest.name) > 1:
+        return None
+    sample = get_sample(largest.name)
+    if sample is None:
+        return None
+    sample_table, fraction = sample
+
+    projections = []
+    aggregates = []
+    helpers = []
+    for i, projection in enumerate(tree.expressions):
+        expression = projection.unalias()
+        name = projection.alias_or_name if isinstance(projection, exp.Alias) else None
+
+        if not expression.find(exp.AggFunc):
+            projections.append(projection)  # group by key
+            continue
+        if not isinstance(expression, (exp.Count, exp.Sum, exp.Avg)):
+            return None  # MIN/MAX or aggregates inside expressions can't be scaled
+        argument = expression.this
+        if isinstance(argument, exp.Distinct) or argument.find(exp.AggFunc):
+            return None
+
+        if name is None:
+            # name the column so the helper columns can be told apart
+            name = expression.sql(dialect=dialect)
+            projection = exp.alias_(expression, name, quoted=True)
+        projections.append(projection)
+        aggregate = _Aggregate(name=name, kind=type(expression).__name__.lower())
+        if aggregate.kind in ("sum", "avg"):
+            aggregate.square_column = f"__approx_sq_{i}"
+            square = exp.Sum(
+                this=exp.Mul(
+                    this=exp.paren(argument.copy()), expression=exp.paren(argument.copy())
+                )
+            )
+            projections.append(exp.alias_(square, aggregate.square_column))
+            helpers.append(aggregate.square_column)
+        if aggregate.kind == "avg":
+            aggregate.count_column = f"__approx_n_{i}"
+            count = exp.Count(this=argument.copy())
+            projections.append(exp.alias_(count, aggregate.count_column))
+            helpers.append(aggregate.count_column)
+        aggregates.append(aggregate)
+
+    if not aggregates:
+        return None  # sampled rows themselves aren't an answer
+
+    tree.set("expressions", projections)
+    alias = largest.alias or largest.name
+    if sample_table is not None:
+        largest.set("this", exp.to_identifier(sample_table))
+        largest.set("alias", exp.TableAlias(this=exp.to_identifier(alias)))
+    else:
+        largest.set(
+            "sample",
+            exp.TableSample(
+                method=exp.var("BERNOULLI"),
+                percent=exp.Literal.number(round(fraction * 100, 6)),
+            ),
+        )
+
+    return SampledQuery(
+        sql=tree.sql(dialect=dialect),
+        sampled_table=largest.name,
+        fraction=fraction,
+        aggregates=aggregates,
+        helper_columns=helpers,
+    )
+
+
+def scale_sampled_result(
+    df: pd.DataFrame, sampled_query: SampledQuery
+) -> Tuple[pd.DataFrame, Dict[str, np.ndarray]]:
+    """
+    Scale aggregates computed on a Bernoulli sample and compute 95% error bounds.
+
+    COUNT and SUM are scaled by 1/fraction (Horvitz-Thompson estimator) with
+    variance (1 - p) / p^2 * sum(x^2). AVG needs no scaling, its variance is
+    estimated from the sample variance of the aggregated values.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The result of the sampled query (with helper columns).
+    sampled_query : SampledQuery
+        The rewritten query.
+
+    Returns
+    -------
+    Tuple[pd.DataFrame, Dict[str, np.ndarray]]
+        The scaled result without helper columns and the half-width of the 95%
+        confidence interval of every aggregate (one value per row).
+    """
+    p = sampled_query.fraction
+    df = df.copy()
+    bounds = {}
+
+    for aggregate in sampled_query.aggregates:
+        values = df[aggregate.name].astype("float64").fillna(0.0).to_numpy()
+        if aggregate.kind == "count":
+            bounds[aggregate.name] = Z_95 * np.sqrt((1 - p) / p**2 * values)
+            df[aggregate.name] = np.rint(values / p).astype("int64")
+        elif aggregate.kind == "sum":
+            squares = df[aggregate.square_column].astype("float64").fillna(0.0).to_numpy()
+            bounds[aggregate.name] = Z_95 * np.sqrt((1 - p) / p**2 * squares)
+            df[aggregate.name] = values / p
+        else:
+            counts = df[aggregate.count_column].astype("float64").to_numpy()
+            squares = df[aggregate.square_column].astype("float64").to_numpy()
+            with np.errstate(divide="ignore", invalid="ignore"):
+                variance = np.maximum(squares / counts - values**2, 0.0)
+                bounds[aggregate.name] = Z_95 * np.sqrt(variance / counts * (1 - p))
+
+    return df.drop(columns=sampled_query.helper_columns), bounds
+
+
+def get_sample_table_name(table: str) -> str:
+    """Name of the table holding the uniform sample of a table."""
+    return f"{SAMPLE_TABLE_PREFIX}{table}"
+
+
+def read_sample_meta(conn: Connection) -> Dict[str, Dict[str, float]]:
+    """Read the SQLite sample tables metadata (empty if no sample was built)."""
+    exists = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": SAMPLE_META_TABLE},
+    ).scalar()
+    if not exists:
+        return {}
+    rows = conn.execute(
+        text(
+            f"SELECT table_name, sample_table, fraction, source_rows, sample_rows, "
+            f"refreshed_at FROM {SAMPLE_META_TABLE}"
+        )
+    ).mappings()
+    return {row["table_name"]: dict(row) for row in rows}
+
+
+def refresh_sample_table(
+    conn: Connection, table: str, fraction: float, source_rows: int
+) -> Dict[str, float]:
+    """
+    (Re)build the uniform Bernoulli sample of a SQLite table.
+
+    Parameters
+    ----------
+    conn : Connection
+        A writable connection (the caller commits).
+    table : str
+        The table to sample.
+    fraction : float
+        The probability of every row to be in the sample.
+    source_rows : int
+        The number of rows of the table (stored to detect stale samples).
+
+    Returns
+    -------
+    Dict[str, float]
+        The metadata of the sample.
+    """
+    quote = conn.dialect.identifier_preparer.quote
+    sample_table = get_sample_table_name(table)
+    threshold = max(1, int(fraction * SAMPLE_RESOLUTION))
+
+    conn.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {SAMPLE_META_TABLE} ("
+            "table_name TEXT PRIMARY KEY, sample_table TEXT, fraction REAL, "
+            "source_rows INTEGER, sample_rows INTEGER, refreshed_at REAL)"
+        )
+    )
+    conn.execute(text(f"DROP TABLE IF EXISTS {quote(sample_table)}"))
+    conn.execute(
+        text(
+            f"CREATE TABLE {quote(sample_table)} AS SELECT * FROM {quote(table)} "
+            f"WHERE (random() & 2147483647) % {SAMPLE_RESOLUTION} < {threshold}"
+        )
+    )
+    sample_rows = conn.execute(text(f"SELECT count(*) FROM {quote(sample_table)}")).scalar()
+
+    meta = {
+        "table_name": table,
+        "sample_table": sample_table,
+        "fraction": threshold / SAMPLE_RESOLUTION,
+        "source_rows": source_rows,
+        "sample_rows": sample_rows,
+        "refreshed_at": time.time(),
+    }
+    conn.execute(
+        text(
+            f"INSERT OR REPLACE INTO {SAMPLE_META_TABLE} VALUES "
+            "(:table_name, :sample_table, :fraction, :source_rows, :sample_rows, :refreshed_at)"
+        ),
+        meta,
+    )
+    logger.info(
+        f"Sample of {table} refreshed: {sample_rows} of {source_rows} rows "
+        f"({meta['fraction']:.2%})"
+    )
+    return meta
+
+
+def is_sample_stale(
+    meta: Dict[str, float], source_rows: Optional[int], max_age_seconds: float
+) -> bool:
+    """Whether a sample is too old or its table grew/shrank by more than 10%."""
+    if time.time() - meta["refreshed_at"] > max_age_seconds:
+        return True
+    if source_rows is None or not meta["source_rows"]:
+        return False
+    return not math.isclose(source_rows, meta["source_rows"], rel_tol=0.1)
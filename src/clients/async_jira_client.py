@@ -0,0 +1,518 @@
+import asyncio
+import logging
+import random
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from src.clients.jira_client import (
+    RETRY_STATUS_CODES,
+    BaseJiraClient,
+    JiraBadRequestError,
+    JiraRetry,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncJiraClient(BaseJiraClient):
+    def __init__(
+        self,
+        *,
+        base_url: str,
+        api_token: str,
+        email: str,
+        max_in_flight: int = 20,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        backoff_jitter: float = 0.5,
+        timeout: float = 30.0,
+        transition_cache_ttl: float = 3600.0,
+        account_id_cache_path: Optional[str] = None,
+        account_id_cache_ttl: float = 86400.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        """
+        Initialize the asynchronous Jira client. All requests share one connection pool
+        and at most `max_in_flight` of them are sent to Jira at the same time.
+
+        Parameters
+        ----------
+        base_url : str
+            The base URL of the Jira instance.
+        api_token : str
+            The API token for authenticating with Jira.
+        email : str
+            The email address associated with the Jira account.
+        max_in_flight : int
+            The maximum number of concurrent requests (and pooled connections).
+        max_retries : int
+            The number of retries for rate limited (429) and failed (5xx) requests.
+        backoff_factor : float
+            The base of the exponential backoff between retries (in seconds).
+            "Retry-After" header sent by Jira takes precedence over it.
+        backoff_jitter : float
+            The maximum random delay (in seconds) added to every backoff.
+        timeout : float
+            The timeout of a single request (in seconds).
+        transition_cache_ttl : float
+            The number of seconds transition IDs are cached for "transition_issue".
+        account_id_cache_path : Optional[str]
+            JSON file to persist the account ID in (shared with JiraClient).
+        account_id_cache_ttl : float
+            The number of seconds the persisted account ID stays valid.
+        transport : Optional[httpx.AsyncBaseTransport]
+            Custom httpx transport (e.g. httpx.MockTransport in tests).
+        """
+        self.email = email
+        self.api_token = self._fix_api_token(api_token)
+        self.base_url = self._fix_base_url(base_url)
+        self.auth = httpx.BasicAuth(username=self.email, password=self.api_token)
+        self.headers = {"Content-Type": "application/json"}
+        self.request_count = 0  # number of HTTP calls made to Jira
+        self._account_id: Optional[str] = None  # resolved by "get_account_id"
+        self._init_transition_cache(ttl=transition_cache_ttl)
+        self._init_account_id_cache(
+            path=account_id_cache_path, ttl=account_id_cache_ttl
+        )
+
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_jitter = backoff_jitter
+        self.retry_policy = JiraRetry(
+            total=max_retries, status_forcelist=RETRY_STATUS_CODES
+        )
+        self.semaphore = asyncio.Semaphore(max_in_flight)
+        self.client = httpx.AsyncClient(
+            auth=self.auth,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_in_flight,
+                max_keepalive_connections=max_in_flight,
+            ),
+            transport=transport,
+        )
+
+    @property
+    def account_id(self) -> Optional[str]:
+        """
+        The account ID of the authenticated user, None until it is resolved.
+
+        Unlike JiraClient.account_id, reading it never calls Jira (a property can't
+        be awaited): the persisted account ID is used if there is one, otherwise
+        "await get_account_id()" has to be called first.
+        """
+        if self._account_id is None:
+            self._account_id = self._load_cached_account_id()
+        return self._account_id
+
+    async def __aenter__(self) -> "AsyncJiraClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close all pooled connections of the client."""
+        await self.client.aclose()
+
+    def _get_backoff_time(self, attempt: int, response: httpx.Response) -> float:
+        """
+        Compute the delay before the next retry.
+
+        Parameters
+        ----------
+        attempt : int
+            The number of the failed attempt (starting from 0).
+        response : httpx.Response
+            The response that triggered the retry.
+
+        Returns
+        -------
+        float
+            "Retry-After" delay if Jira sent it, otherwise exponential backoff with jitter.
+        """
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            return self.retry_policy.parse_retry_after(retry_after)
+
+        backoff = self.backoff_factor * (2**attempt)
+        return min(
+            backoff + random.uniform(0, self.backoff_jitter),
+            self.retry_policy.DEFAULT_BACKOFF_MAX,
+        )
+
+    async def _request(
+        self, method: str, url: str, **kwargs
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Send an HTTP request and retry it on rate limiting and transient server errors.
+
+        Parameters
+        ----------
+            method: str
+                The HTTP method to use (e.g., 'GET', 'POST', 'PUT', 'DELETE').
+            url: str
+                The full URL to send the request to.
+            **kwargs:
+                Optional arguments passed directly to `httpx.AsyncClient.request` (e.g., json, params, files).
+
+        Returns
+        -------
+            Dict[str, Any]
+                The parsed JSON response or processed output from the server.
+        """
+        headers = kwargs.pop("headers", self.headers)
+
+        for attempt in range(self.max_retries + 1):
+            async with self.semaphore:
+                self.request_count += 1
+                response = await self.client.request(
+                    method=method, url=url, headers=headers, **kwargs
+                )
+
+            retryable = self.retry_policy.is_retry(
+                method.upper(), response.status_code
+            )
+            if not retryable or attempt == self.max_retries:
+                break
+
+            delay = self._get_backoff_time(attempt, response)
+            logger.warning(
+                f"Jira responded with {response.status_code}, retrying in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+
+        return self._handle_response(response)
+
+    async def _search(
+        self,
+        url: str,
+        jql: str,
+        limit: int,
+        start_at: int,
+        batch_size: int,
+        fields: Optional[List[str]],
+        validate_query: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Run a paginated JQL search. The first page reports the total number of issues,
+        the remaining pages are requested concurrently and merged in order.
+
+        Parameters
+        ----------
+        url : str
+            The search endpoint.
+        jql : str
+            Jira Query Language string.
+        limit : int
+            The maximum number of issues to retrieve. If -1, retrieves all matching issues.
+        start_at : int
+            The index of the first issue to return.
+        batch_size : int
+            The maximum number of issues to fetch per request.
+        fields : Optional[List[str]]
+            Issue fields to include in every page.
+        validate_query : Optional[str]
+            The JQL validation mode ("warn" tolerates keys of deleted issues), None
+            uses the Jira default ("strict").
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+            The retrieved issues.
+        """
+
+        def page_params(offset: int, size: int) -> Dict[str, Any]:
+            params = {"jql": jql, "maxResults": size, "startAt": offset}
+            if fields:
+                params["fields"] = ",".join(fields)
+            if validate_query:
+                params["validateQuery"] = validate_query
+            return params
+
+        first_size = batch_size if limit == -1 else min(limit, batch_size)
+        if first_size <= 0:
+            return []
+
+        first_page = await self._request(
+            method="get", url=url, params=page_params(start_at, first_size)
+        )
+        if not first_page or "issues" not in first_page:
+            return []
+
+        issues = list(first_page["issues"])
+        total = first_page.get("total", 0)
+        end = total if limit == -1 else min(total, start_at + limit)
+
+        # Jira may cap "maxResults" -> use the page size it actually returned
+        page_size = len(issues)
+        if page_size == 0:
+            return issues
+
+        offsets = range(start_at + page_size, end, page_size)
+        pages = await asyncio.gather(
+            *(
+                self._request(
+                    method="get",
+                    url=url,
+                    params=page_params(offset, min(page_size, end - offset)),
+                )
+                for offset in offsets
+            )
+        )
+        for page in pages:
+            if page and "issues" in page:
+                issues.extend(page["issues"])
+
+        return issues if limit == -1 else issues[:limit]
+
+    async def get_account_id(self) -> Optional[str]:
+        """
+        Get (and remember) the account ID of the currently authenticated user.
+
+        Returns
+        -------
+        Optional[str]
+            The account ID of the authenticated user.
+        """
+        if self.account_id is None:
+            url = f"{self.base_url}/rest/api/3/myself"
+            response = await self._request(method="get", url=url)
+            if response and "accountId" in response:
+                self._account_id = response["accountId"]
+                self._store_account_id(self._account_id)
+        return self._account_id
+
+    async def get_comments(self, issue_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve all comments for a Jira issue.
+
+        Parameters
+        ----------
+        issue_key : str
+            The key of the issue to retrieve comments from (e.g. "VWNPER-1", "BIO-2", etc).
+
+        Returns
+        -------
+        Optional[Dict[str, Any]]
+            A dictionary containing comments data if successful.
+        """
+        url = f"{self.base_url}/rest/api/2/issue/{issue_key}/comment"
+        return await self._request(method="get", url=url)
+
+    async def add_comment(self, issue: str, comment: str) -> Optional[Dict[str, Any]]:
+        """
+        Add a comment to a specific Jira issue.
+
+        Parameters
+        ----------
+        issue : str
+            The key or ID of the issue to comment on (e.g. "VWNPER-1", "BIO-2", etc).
+        comment : str
+            The content of the comment to add.
+
+        Returns
+        -------
+        Optional[Dict[str, Any]]
+            The API response as a dictionary if successful.
+        """
+        url = f"{self.base_url}/rest/api/2/issue/{issue}/comment"
+        return await self._request(method="post", url=url, json={"body": comment})
+
+    async def attach_file(
+        self, issue_key: str, file_path: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Attach a file to a Jira issue. Attachments are always linked to the issue itself.
+
+        Parameters
+        ----------
+        issue_key : str
+            The key of the issue.
+        file_path : str
+            Path to the file to upload.
+
+        Returns
+        -------
+        Optional[Dict[str, Any]]
+            Attachment metadata if successful.
+        """
+        url = f"{self.base_url}/rest/api/2/issue/{issue_key}/attachments"
+
+        # Remove content-type, httpx sets the multipart boundary itself
+        headers = {k: v for k, v in self.headers.items() if k.lower() != "content-type"}
+        headers["X-Atlassian-Token"] = "no-check"
+
+        content = await asyncio.to_thread(self._read_file, file_path)
+        files = {"file": (file_path, content)}
+        return await self._request(method="post", url=url, headers=headers, files=files)
+
+    def _read_file(self, file_path: str) -> bytes:
+        """Read file content (executed in a worker thread)."""
+        with open(file_path, "rb") as file:
+            return file.read()
+
+    async def get_issue(self, issue: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve details of a specific Jira issue.
+
+        Parameters
+        ----------
+        issue : str
+            The key or ID of the issue to retrieve (e.g. "VWNPER-1", "BIO-2", etc).
+
+        Returns
+        -------
+        Optional[Dict[str, Any]]
+            The issue data as a dictionary if found.
+        """
+        url = f"{self.base_url}/rest/api/2/issue/{issue}"
+        return await self._request(method="get", url=url)
+
+    async def get_active_issues(
+        self,
+        limit: int = -1,
+        start_at: int = 0,
+        batch_size: int = 50,
+        fields: Optional[List[str]] = None,
+        updated_within_minutes: Optional[int] = None,
+        include_keys: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Retrieve issues assigned to the current user that are not marked as 'Done'.
+
+        Parameters
+        ----------
+        limit: int
+            The maximum number of issues to retrieve. If set to -1 (default), retrieves
+            all matching issues using pagination.
+        start_at: int
+            The index of the first issue to return.
+        batch_size: int
+            The maximum number of issues to fetch per request (max allowed by Jira is 100)
+        fields: Optional[List[str]]
+            Issue fields to include in every page (e.g. ["summary", "comment"]).
+        updated_within_minutes: Optional[int]
+            If set, only issues updated within the last N minutes are retrieved.
+        include_keys: Optional[List[str]]
+            Active issues retrieved even if they were not updated recently.
+
+        Returns
+        -------
+            List[Dict[str, Any]]: A list of dictionaries represention the retrieved issues.
+        """
+        url = f"{self.base_url}/rest/api/3/search"
+        return await self._search(
+            url=url,
+            jql=self._get_active_issues_jql(updated_within_minutes, include_keys),
+            # retried tickets may have been deleted since
+            validate_query="warn" if include_keys else None,
+            limit=limit,
+            start_at=start_at,
+            batch_size=batch_size,
+            fields=fields,
+        )
+
+    async def get_available_transitions(self, issue_key: str) -> List[Dict[str, Any]]:
+        """
+        Retrieve all possible transitions for the given issue.
+
+        Parameters
+        ----------
+        issue_key : str
+            The Jira issue key (e.g. "VWNPER-1", "BIO-2", etc).
+
+        Returns
+        -------
+        list[dict]
+            A list of transition objects, each containing 'id' and 'name'.
+        """
+        url = f"{self.base_url}/rest/api/2/issue/{issue_key}/transitions"
+        data = await self._request(method="get", url=url)
+        assert isinstance(data, dict)
+        return data.get("transitions", [])
+
+    async def transition_issue(
+        self,
+        issue_key: str,
+        status_name: str,
+        project_key: Optional[str] = None,
+        issue_type: Optional[str] = None,
+        current_status: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Transition the issue to a new status by name.
+
+        If the issue context (project, issue type and current status) is provided,
+        the transition ID is taken from the cache, so the transition costs a single POST.
+
+        Parameters
+        ----------
+        issue_key : str
+            The Jira issue key (e.g. "VWNPER-1", "BIO-2", etc).
+        status_name : str
+            The desired status to transition to (e.g., "In Progress", "Close Issue", etc).
+        project_key : Optional[str]
+            The key of the issue's project (e.g. "DATA").
+        issue_type : Optional[str]
+            The name of the issue type (e.g. "Task").
+        current_status : Optional[str]
+            The name of the issue's current status.
+
+        Returns
+        -------
+        Optional[Dict[str, Any]]
+            The result of the transition, None when Jira answers 204 No Content.
+        """
+        url = f"{self.base_url}/rest/api/2/issue/{issue_key}/transitions"
+        cache_key = self._get_transition_cache_key(
+            project_key, issue_type, current_status
+        )
+
+        transition_id = self._get_cached_transition_id(cache_key, status_name)
+        if transition_id is not None:
+            try:
+                data = {"transition": {"id": transition_id}}
+                return await self._request(method="post", url=url, json=data)
+            except JiraBadRequestError:
+                # the workflow has changed (400) -> look the transitions up again
+                logger.warning(f"Cached transition rejected for {issue_key}")
+                self._invalidate_transitions(cache_key)
+
+        transitions = await self.get_available_transitions(issue_key=issue_key)
+        self._cache_transitions(cache_key, transitions)
+
+        data = {"transition": {"id": self._find_transition_id(transitions, status_name)}}
+        return await self._request(method="post", url=url, json=data)
+
+    async def run_jql(
+        self, jql: str, max_results: int = 50, fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Search Jira issues using JQL. Jira limits number of results per request to 100.
+
+        Parameters
+        ----------
+        jql : str
+            Jira Query Language string.
+        max_results : int
+            Maximum number of results to return. If -1, fetches all matching issues.
+        fields : Optional[List[str]]
+            Issue fields to include in every page.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The search results.
+        """
+        url = f"{self.base_url}/rest/api/2/search"
+        issues = await self._search(
+            url=url,
+            jql=jql,
+            limit=max_results,
+            start_at=0,
+            batch_size=100,
+            fields=fields,
+        )
+        return {"issues": issues}
@@ -1,22 +1,314 @@
+import json
 import logging
+import os
+import sqlite3
+import threading
 import time
-from typing import Dict, List
+from contextlib import contextmanager
+from typing import Any, Dict, Hashable, Iterator, List, Optional
 
 import pandas as pd
-from sqlalchemy import create_engine, text
+import sqlglot
+from sqlalchemy import bindparam, create_engine, event, text
+from sqlalchemy.engine import Connection, make_url
+from sqlglot import exp
+from sqlglot.errors import SqlglotError
 
-from src.models.schemas import QueryResult
+from src.clients.approximate import (
+    is_sample_stale,
+    read_sample_meta,
+    refresh_sample_table,
+    rewrite_for_sample,
+    scale_sampled_result,
+)
+from src.clients.query_cache import SQLGLOT_DIALECTS, QueryCache, normalize_sql
+from src.clients.query_plan import (
+    analyze_postgres_plan,
+    estimate_sqlite_plan,
+    find_cartesian_products,
+    get_table_aliases,
+)
+from src.clients.schema_catalog import SchemaCatalog, to_schema_dict
+from src.clients.sqlite_reader import (
+    get_declared_types,
+    get_type_affinity,
+    read_sqlite_query,
+)
+from src.models.schemas import QueryPlanEstimate, QueryResult, TableInfo
 
 logger = logging.getLogger(__name__)
 
+# SQLite VM instructions between two checks of the time budget/cancellation
+SQLITE_PROGRESS_STEPS = 10_000
+
+# SQLSTATE of "canceling statement due to statement timeout / user request" (Postgres)
+POSTGRES_QUERY_CANCELED = "57014"
+
+# read-only pragmas usable with arguments (e.g. "PRAGMA table_info(sales)") in read-only mode
+SQLITE_READ_ONLY_PRAGMAS = {
+    "table_info",
+    "table_xinfo",
+    "index_list",
+    "index_info",
+    "index_xinfo",
+    "foreign_key_list",
+}
+
+# most common values of every column collected by ANALYZE (no table scan)
+POSTGRES_COMMON_VALUES_QUERY = """
+SELECT tablename, attname, array_to_json((most_common_vals::text)::text[])::text
+FROM pg_stats
+WHERE schemaname = :schema AND most_common_vals IS NOT NULL
+"""
+
+# rows read per table to sample the values of text columns without pg_stats
+SAMPLE_VALUES_SCAN_ROWS = 1000
+
+
+class QueryTimeoutError(TimeoutError):
+    """The query ran longer than its time budget (the statement was aborted)"""
+
+
+class QueryCancelledError(RuntimeError):
+    """The query was cancelled by the caller (the statement was aborted)"""
+
 
 class DatabaseClient:
-    def __init__(self, connection_string: str):
-        self.engine = create_engine(connection_string)
-        self.connection = None
+    def __init__(
+        self,
+        connection_string: str,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: float = 30.0,
+        pool_recycle: int = 1800,
+        pool_pre_ping: bool = True,
+        stream_results: bool = False,
+        chunk_size: int = 10_000,
+        sample_size: int = 100,
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        query_cache: Optional[QueryCache] = None,
+        schema_catalog: Optional[SchemaCatalog] = None,
+        statement_timeout_seconds: Optional[float] = None,
+        read_only: bool = False,
+        sqlite_fast_path: bool = True,
+    ):
+        """
+        Initialize the client with a pool of database connections.
+
+        Parameters
+        ----------
+        connection_string : str
+            SQLAlchemy connection string (e.g. "sqlite:///data/db.sqlite").
+        pool_size : int
+            The number of connections kept open in the pool.
+        max_overflow : int
+            The number of extra connections opened when the pool is exhausted.
+        pool_timeout : float
+            The number of seconds to wait for a free connection before giving up.
+        pool_recycle : int
+            The number of seconds after which a connection is re-opened.
+        pool_pre_ping : bool
+            Whether to test connections for liveness before handing them out.
+        stream_results : bool
+            Whether queries are executed in streaming mode by default (see "execute_query").
+        chunk_size : int
+            The number of rows fetched from the server-side cursor at once (streaming mode).
+        sample_size : int
+            The number of rows kept in the result (streaming mode).
+        max_rows : Optional[int]
+            Hard cap on the number of rows read (streaming mode). None means no cap.
+        max_bytes : Optional[int]
+            Hard cap on the number of bytes read (streaming mode). None means no cap.
+        query_cache : Optional[QueryCache]
+            Cache of query results keyed by normalized SQL. None disables caching.
+        schema_catalog : Optional[SchemaCatalog]
+            Incrementally refreshed (and optionally persisted) catalog of tables used
+            by "get_database_schema". None scans the schema on every call.
+        statement_timeout_seconds : Optional[float]
+            Default time budget of a query (see "execute_query"). None means no limit.
+        read_only : bool
+            Whether the database rejects every write. SQLite is opened with "mode=ro",
+            "PRAGMA query_only" and an authorizer that only allows reads, Postgres
+            sessions default to read-only transactions.
+        sqlite_fast_path : bool
+            Whether SQLite results are read through the raw sqlite3 cursor into typed
+            column buffers instead of SQLAlchemy and pandas (see "read_sqlite_query").
+        """
         self.is_sqlite = connection_string.startswith(
             "sqlite://"
         )  # detect if we're using SQLite
+        self.read_only = read_only
+        self.sqlite_fast_path = sqlite_fast_path
+        self.database_path = make_url(connection_string).database if self.is_sqlite else None
+        self.engine = create_engine(
+            self._get_read_only_url(connection_string) if read_only else connection_string,
+            **self._get_pool_options(
+                connection_string,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_timeout=pool_timeout,
+                pool_recycle=pool_recycle,
+                pool_pre_ping=pool_pre_ping,
+            ),
+        )
+        self.connection = None
+        if read_only:
+            event.listen(self.engine, "connect", self._set_read_only)
+
+        # streaming execution
+        self.stream_results = stream_results
+        self.chunk_size = chunk_size
+        self.sample_size = sample_size
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+
+        # result cache (may be shared by several clients)
+        self.query_cache = query_cache
+        self.schema_catalog = schema_catalog
+        self.statement_timeout_seconds = statement_timeout_seconds
+
+        # pool statistics
+        self._stats_lock = threading.Lock()
+        self._checkouts = 0
+        self._total_wait_ms = 0.0
+        self._max_wait_ms = 0.0
+
+    def _get_pool_options(self, connection_string: str, **options) -> Dict[str, Any]:
+        """Pool options supported by the database (in-memory SQLite is a single connection)."""
+        if self.is_sqlite and connection_string in ("sqlite://", "sqlite:///:memory:"):
+            return {}
+        return options
+
+    def _get_read_only_url(self, connection_string: str) -> str:
+        """Open SQLite database files in read-only mode (the file can't be written)."""
+        url = make_url(connection_string)
+        if not self.is_sqlite or url.database in (None, "", ":memory:"):
+            return connection_string
+        url = url.set(
+            database=f"file:{url.database}",
+            query={**url.query, "mode": "ro", "uri": "true"},
+        )
+        return url.render_as_string(hide_password=False)
+
+    def _set_read_only(self, dbapi_connection: Any, connection_record: Any) -> None:
+        """Make a new DBAPI connection reject writes (enforced by the database)."""
+        if self.is_sqlite:
+            dbapi_connection.execute("PRAGMA query_only = ON")
+            dbapi_connection.set_authorizer(self._authorize_sqlite)
+            return
+
+        if self.engine.dialect.name != "postgresql":
+            logger.warning(f"Read-only mode is not supported for {self.engine.dialect.name}")
+            return
+
+        cursor = dbapi_connection.cursor()
+        cursor.execute("SET SESSION default_transaction_read_only = on")
+        cursor.close()
+        # SET is transactional, commit so it survives the rollback on pool checkin
+        dbapi_connection.commit()
+
+    def _check_read_only_statement(self, sql_query: str) -> None:
+        """
+        Reject anything but a single query on a read-only server database.
+
+        The session default can be overridden by the statement itself (e.g.
+        "SET TRANSACTION READ WRITE; DELETE ...; COMMIT"), so multiple statements,
+        transaction control and SET are refused before reaching the database.
+        SQLite is left to the authorizer, which also covers these cases.
+
+        Raises
+        ------
+        PermissionError
+            If the statement isn't a single query or can't be parsed.
+        """
+        if not self.read_only or self.is_sqlite:
+            return
+        try:
+            statements = [
+                statement
+                for statement in sqlglot.parse(
+                    sql_query, read=SQLGLOT_DIALECTS.get(self.engine.dialect.name)
+                )
+                if statement is not None
+            ]
+        except SqlglotError as e:
+            raise PermissionError(f"Read-only client can't verify the statement: {e}")
+        if len(statements) != 1:
+            raise PermissionError("Read-only client executes a single statement at a time")
+        if not isinstance(statements[0], exp.Query):
+            raise PermissionError(
+                f"Read-only client only executes queries, got {statements[0].key.upper()}"
+            )
+
+    @staticmethod
+    def _authorize_sqlite(
+        action: int, arg1: Optional[str], arg2: Optional[str], *_
+    ) -> int:
+        """SQLite authorizer: allow reads only."""
+        if action in (
+            sqlite3.SQLITE_SELECT,
+            sqlite3.SQLITE_READ,
+            sqlite3.SQLITE_FUNCTION,
+            sqlite3.SQLITE_RECURSIVE,
+            sqlite3.SQLITE_TRANSACTION,
+            sqlite3.SQLITE_SAVEPOINT,
+        ):
+            return sqlite3.SQLITE_OK
+        # reading a pragma is fine, setting one (e.g. "query_only = OFF") is not
+        if action == sqlite3.SQLITE_PRAGMA and (
+            arg2 is None or arg1.lower() in SQLITE_READ_ONLY_PRAGMAS
+        ):
+            return sqlite3.SQLITE_OK
+        return sqlite3.SQLITE_DENY
+
+    @contextmanager
+    def _checkout(self) -> Iterator[Connection]:
+        """Borrow a connection from the pool and record how long it took to get it."""
+        start_time = time.perf_counter()
+        with self.engine.connect() as conn:
+            wait_ms = (time.perf_counter() - start_time) * 1000
+            with self._stats_lock:
+                self._checkouts += 1
+                self._total_wait_ms += wait_ms
+                self._max_wait_ms = max(self._max_wait_ms, wait_ms)
+            yield conn
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """
+        Get connection pool statistics for monitoring.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Pool size, checked out/in and overflow connections, number of checkouts
+            and the average/maximum time spent waiting for a connection.
+        """
+        pool = self.engine.pool
+        with self._stats_lock:
+            checkouts = self._checkouts
+            total_wait_ms = self._total_wait_ms
+            max_wait_ms = self._max_wait_ms
+
+        return {
+            "pool_size": pool.size() if hasattr(pool, "size") else None,
+            "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else None,
+            "checked_in": pool.checkedin() if hasattr(pool, "checkedin") else None,
+            "overflow": pool.overflow() if hasattr(pool, "overflow") else None,
+            "checkouts": checkouts,
+            "avg_wait_ms": total_wait_ms / checkouts if checkouts else 0.0,
+            "max_wait_ms": max_wait_ms,
+        }
+
+    def ping(self) -> bool:
+        """Check that a pooled connection can run a trivial statement (health check)."""
+        try:
+            with self._checkout() as conn:
+                conn.execute(text("SELECT 1"))
+            return True
+        except Exception as e:
+            logger.warning(f"Database health check failed: {str(e)}")
+            return False
 
     def connect(self):
         if self.connection is None or self.connection.closed:
@@ -26,6 +318,7 @@ class DatabaseClient:
     def close(self):
         if self.connection and not self.connection.closed:
             self.connection.close()
+        self.engine.dispose()  # close pooled connections
 
     def __enter__(self):
         self.connect()
@@ -34,8 +327,30 @@ class DatabaseClient:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
 
+    def get_schema_catalog(self, force: bool = False) -> Dict[str, TableInfo]:
+        """
+        Get the tables with their columns, keys, indexes and row estimates.
+
+        Parameters
+        ----------
+        force : bool
+            Whether to check for schema changes even if the check interval has not elapsed.
+
+        Returns
+        -------
+        Dict[str, TableInfo]
+            The tables by name.
+        """
+        if self.schema_catalog is None:
+            self.schema_catalog = SchemaCatalog()
+        with self._checkout() as conn:
+            return self.schema_catalog.get_tables(conn, force=force)
+
     def get_database_schema(self) -> Dict[str, List[Dict[str, str]]]:
         """Fetch database schema information."""
+        if self.schema_catalog is not None:
+            return to_schema_dict(self.get_schema_catalog())
+
         if self.is_sqlite:
             query = """
             SELECT 
@@ -48,7 +363,8 @@ class DatabaseClient:
                 pragma_table_info(m.name) p
             WHERE 
                 m.type = 'table' AND
-                m.name NOT LIKE 'sqlite_%'
+                m.name NOT LIKE 'sqlite_%' AND
+                m.name NOT LIKE '\\_sample\\_%' ESCAPE '\\'
             """
         else:
             # postgreSQL related
@@ -58,7 +374,8 @@ class DatabaseClient:
             WHERE table_schema = 'public'
             """
 
-        with self.connect() as conn:
+        # separate pooled connection per call -> safe for concurrently processed tickets
+        with self._checkout() as conn:
             result = conn.execute(text(query))
             rows = result.fetchall()
 
@@ -72,25 +389,182 @@ class DatabaseClient:
 
         return schema_dict
 
-    def execute_query(self, sql_query: str) -> QueryResult:
-        """Execute SQL query and return results."""
+    def get_column_values(
+        self,
+        tables: Dict[str, TableInfo],
+        values_per_column: int = 5,
+        scan_rows: int = SAMPLE_VALUES_SCAN_ROWS,
+    ) -> Dict[str, Dict[str, List[str]]]:
+        """
+        Get values of the text columns of every table without scanning the tables.
+
+        Postgres returns the most common values collected by ANALYZE (pg_stats) in a
+        single query. Other databases read distinct values from the first "scan_rows"
+        rows of every table (one bounded query per table with text columns).
+
+        Parameters
+        ----------
+        tables : Dict[str, TableInfo]
+            The tables (see "get_schema_catalog").
+        values_per_column : int
+            The maximum number of values returned per column.
+        scan_rows : int
+            The number of rows read per table when there are no statistics.
+
+        Returns
+        -------
+        Dict[str, Dict[str, List[str]]]
+            The values by table and column.
+        """
+        text_columns = {
+            name: [
+                column.name
+                for column in table.columns
+                if get_type_affinity(column.data_type) == "object"
+            ]
+            for name, table in tables.items()
+        }
+        values: Dict[str, Dict[str, List[str]]] = {}
+
+        with self._checkout() as conn:
+            if self.engine.dialect.name == "postgresql":
+                schema = self.schema_catalog.schema if self.schema_catalog else "public"
+                rows = conn.execute(text(POSTGRES_COMMON_VALUES_QUERY), {"schema": schema})
+                for table, column, common_values in rows:
+                    if column in text_columns.get(table, ()):
+                        common = json.loads(common_values)[:values_per_column]
+                        values.setdefault(table, {})[column] = common
+                return values
+
+            quote = conn.dialect.identifier_preparer.quote
+            for table, columns in text_columns.items():
+                if not columns:
+                    continue
+                rows = conn.execute(
+                    text(
+                        f"SELECT {', '.join(quote(column) for column in columns)} "
+                        f"FROM {quote(table)} LIMIT :scan_rows"
+                    ),
+                    {"scan_rows": scan_rows},
+                ).fetchall()
+                for index, column in enumerate(columns):
+                    distinct = dict.fromkeys(
+                        str(row[index]) for row in rows if row[index] is not None
+                    )
+                    sample = list(distinct)[:values_per_column]
+                    values.setdefault(table, {})[column] = sample
+        return values
+
+    def execute_query(
+        self,
+        sql_query: str,
+        stream: Optional[bool] = None,
+        timeout_seconds: Optional[float] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> QueryResult:
+        """
+        Execute SQL query and return results.
+
+        Parameters
+        ----------
+        sql_query : str
+            The query to execute.
+        stream : Optional[bool]
+            If True, results are read in chunks and only a sample of rows is kept
+            (see "execute_query_streaming"). Defaults to the client's "stream_results".
+        timeout_seconds : Optional[float]
+            Time budget of the query, capped by the client's "statement_timeout_seconds".
+            The statement is aborted by the database once it is exceeded.
+        cancel_event : Optional[threading.Event]
+            Setting the event from another thread aborts the running statement.
+
+        Returns
+        -------
+        QueryResult
+            The query results.
+
+        Raises
+        ------
+        QueryTimeoutError
+            If the query exceeded its time budget.
+        QueryCancelledError
+            If the query was cancelled through "cancel_event".
+        """
+        self._check_read_only_statement(sql_query)
+        if stream is None:
+            stream = self.stream_results
+
+        budgets = [
+            t for t in (timeout_seconds, self.statement_timeout_seconds) if t is not None
+        ]
+        guard = {
+            "timeout_seconds": min(budgets) if budgets else None,
+            "cancel_event": cancel_event,
+        }
+
+        cache_key = self._get_cache_key(sql_query, stream)
+        if cache_key is not None:
+            version = self._get_data_version(sql_query)
+            cached = self.query_cache.get(cache_key, version)
+            if cached is not None:
+                logger.info(f"Query served from cache. Returned {cached.row_count} rows.")
+                return cached
+
+            result = self._execute_query(sql_query, stream, **guard)
+            self.query_cache.put(cache_key, version, result)
+            return result
+
+        return self._execute_query(sql_query, stream, **guard)
+
+    def _execute_query(
+        self,
+        sql_query: str,
+        stream: bool,
+        timeout_seconds: Optional[float] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> QueryResult:
+        """Execute SQL query against the database (no caching)."""
+        if stream:
+            return self.execute_query_streaming(sql_query, timeout_seconds, cancel_event)
+
         start_time = time.time()
         try:
-            with self.connect() as conn:
-                # use pandas to execute the query and get results
-                df = pd.read_sql(sql_query, conn)
+            with self._checkout() as conn:
+                raw_conn = conn.connection.dbapi_connection
+                declared_types = None
+                if self.sqlite_fast_path and isinstance(raw_conn, sqlite3.Connection):
+                    # declared column types for the SQLite reader (catalog checked lazily)
+                    if self.schema_catalog is None:
+                        self.schema_catalog = SchemaCatalog()
+                    declared_types = get_declared_types(
+                        sql_query, self.schema_catalog.get_tables(conn)
+                    )
+
+                with self._guard_statement(conn, timeout_seconds, cancel_event):
+                    if declared_types is not None:
+                        # fast path: raw cursor -> typed column buffers, no pandas
+                        names, columns, row_count = read_sqlite_query(
+                            raw_conn, sql_query, declared_types
+                        )
+                        df = None
+                    else:
+                        # use pandas to execute the query and get results
+                        df = pd.read_sql(sql_query, conn)
 
             execution_time = (
                 time.time() - start_time
             ) * 1000  # convert to milliseconds
 
-            # convert DataFrame to QueryResult
-            result = QueryResult(
-                data=df.to_dict(orient="records"),
-                row_count=df.shape[0],
-                column_names=df.columns.tolist(),
-                execution_time_ms=execution_time,
-            )
+            # columnar QueryResult (no per-row dicts)
+            if df is None:
+                result = QueryResult(
+                    columns=columns,
+                    row_count=row_count,
+                    column_names=names,
+                    execution_time_ms=execution_time,
+                )
+            else:
+                result = QueryResult.from_dataframe(df, execution_time_ms=execution_time)
 
             logger.info(
                 f"Query executed successfully. Returned {result.row_count} rows."
@@ -100,3 +574,488 @@ class DatabaseClient:
         except Exception as e:
             logger.error(f"Error executing query: {str(e)}")
             raise
+
+    def execute_query_streaming(
+        self,
+        sql_query: str,
+        timeout_seconds: Optional[float] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> QueryResult:
+        """
+        Execute SQL query reading results chunk by chunk from a server-side cursor.
+
+        Only the first "sample_size" rows are kept. The row count and per-column
+        aggregates (count, sum, min, max, mean of numeric columns) are computed over
+        all rows read. Reading stops at "max_rows"/"max_bytes" and the result is
+        marked as truncated, so huge results never have to fit in memory.
+
+        Parameters
+        ----------
+        sql_query : str
+            The query to execute.
+        timeout_seconds : Optional[float]
+            Time budget of the query (see "execute_query").
+        cancel_event : Optional[threading.Event]
+            Setting the event from another thread aborts the running statement.
+
+        Returns
+        -------
+        QueryResult
+            The sample of rows with the total row count and column statistics.
+        """
+        self._check_read_only_statement(sql_query)
+        start_time = time.time()
+        row_count, bytes_read, truncated = 0, 0, False
+        samples: List[pd.DataFrame] = []
+        sampled_rows = 0
+        stats: Dict[str, Dict[str, float]] = {}
+
+        try:
+            with self._checkout() as conn, self._guard_statement(
+                conn, timeout_seconds, cancel_event
+            ):
+                conn = conn.execution_options(
+                    stream_results=True, max_row_buffer=self.chunk_size
+                )
+                for chunk in pd.read_sql(sql_query, conn, chunksize=self.chunk_size):
+                    if self.max_rows is not None and row_count + len(chunk) > self.max_rows:
+                        chunk = chunk.iloc[: self.max_rows - row_count]
+                        truncated = True
+
+                    row_count += len(chunk)
+                    bytes_read += int(chunk.memory_usage(deep=True, index=False).sum())
+                    self._update_column_stats(stats, chunk)
+
+                    if sampled_rows < self.sample_size or not samples:
+                        samples.append(chunk.iloc[: self.sample_size - sampled_rows])
+                        sampled_rows += len(samples[-1])
+
+                    if self.max_bytes is not None and bytes_read >= self.max_bytes:
+                        truncated = True
+                    if truncated:
+                        break
+
+            for column_stats in stats.values():
+                count = column_stats["count"]
+                column_stats["mean"] = column_stats["sum"] / count if count else float("nan")
+
+            execution_time = (time.time() - start_time) * 1000
+            sample = pd.concat(samples) if samples else pd.DataFrame()
+            result = QueryResult.from_dataframe(
+                sample, execution_time_ms=execution_time
+            ).model_copy(
+                update={
+                    "row_count": row_count,
+                    "column_stats": stats,
+                    "truncated": truncated,
+                }
+            )
+
+            logger.info(
+                f"Query streamed successfully. Read {row_count} rows "
+                f"({bytes_read} bytes{', truncated' if truncated else ''})."
+            )
+            return result
+
+        except Exception as e:
+            logger.error(f"Error executing query: {str(e)}")
+            raise
+
+    def execute_query_approximate(
+        self,
+        sql_query: str,
+        sample_fraction: float = 0.01,
+        min_table_rows: int = 1_000_000,
+        timeout_seconds: Optional[float] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> QueryResult:
+        """
+        Execute an aggregate query on a uniform sample of its largest table.
+
+        Postgres samples the table on the fly (TABLESAMPLE BERNOULLI), SQLite reads
+        the sample table maintained by "refresh_sample_tables". COUNT/SUM are scaled
+        to the full table and every aggregate gets a 95% error bound. Queries that
+        can't be answered from a sample (see "rewrite_for_sample") and small tables
+        are executed exactly.
+
+        Parameters
+        ----------
+        sql_query : str
+            The query to execute.
+        sample_fraction : float
+            The fraction of rows sampled on the fly (Postgres).
+        min_table_rows : int
+            Smaller tables are never sampled.
+        timeout_seconds : Optional[float]
+            Time budget of the query (see "execute_query").
+        cancel_event : Optional[threading.Event]
+            Setting the event from another thread aborts the running statement.
+
+        Returns
+        -------
+        QueryResult
+            The results, "is_approximate" tells whether they were computed on a sample.
+        """
+        self._check_read_only_statement(sql_query)
+        dialect = SQLGLOT_DIALECTS.get(self.engine.dialect.name)
+        table_rows = {
+            name: table.row_estimate for name, table in self.get_schema_catalog().items()
+        }
+
+        if self.is_sqlite:
+            with self._checkout() as conn:
+                samples = read_sample_meta(conn)
+
+            def get_sample(table: str):
+                meta = samples.get(table)
+                return (meta["sample_table"], meta["fraction"]) if meta else None
+
+        elif self.engine.dialect.name == "postgresql":
+
+            def get_sample(table: str):
+                return None, sample_fraction
+
+        else:
+
+            def get_sample(table: str):
+                return None
+
+        sampled_query = rewrite_for_sample(
+            sql_query, dialect, table_rows, min_table_rows, get_sample
+        )
+        if sampled_query is None:
+            logger.info("Query can't be answered from a sample, executing it exactly")
+            return self.execute_query(
+                sql_query, timeout_seconds=timeout_seconds, cancel_event=cancel_event
+            )
+
+        start_time = time.time()
+        budgets = [
+            t for t in (timeout_seconds, self.statement_timeout_seconds) if t is not None
+        ]
+        try:
+            with self._checkout() as conn, self._guard_statement(
+                conn, min(budgets) if budgets else None, cancel_event
+            ):
+                df = pd.read_sql(sampled_query.sql, conn)
+        except Exception as e:
+            logger.error(f"Error executing query: {str(e)}")
+            raise
+
+        df, error_bounds = scale_sampled_result(df, sampled_query)
+        execution_time = (time.time() - start_time) * 1000
+        result = QueryResult.from_dataframe(df, execution_time_ms=execution_time)
+        result = result.model_copy(
+            update={
+                "is_approximate": True,
+                "sample_fraction": sampled_query.fraction,
+                "error_bounds": error_bounds,
+            }
+        )
+        logger.info(
+            f"Query executed on a {sampled_query.fraction:.2%} sample of "
+            f"{sampled_query.sampled_table}. Returned {result.row_count} rows."
+        )
+        return result
+
+    def refresh_sample_tables(
+        self,
+        fraction: float = 0.01,
+        min_table_rows: int = 1_000_000,
+        max_age_seconds: float = 86400.0,
+        force: bool = False,
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Build or refresh the uniform samples of large SQLite tables.
+
+        A sample is rebuilt when it is older than "max_age_seconds" or its table
+        grew/shrank by more than 10%. Postgres needs no maintenance (TABLESAMPLE).
+
+        Parameters
+        ----------
+        fraction : float
+            The probability of every row to be in the sample.
+        min_table_rows : int
+            Smaller tables are not sampled.
+        max_age_seconds : float
+            The age after which a sample is rebuilt.
+        force : bool
+            Whether to rebuild all samples.
+
+        Returns
+        -------
+        Dict[str, Dict[str, float]]
+            The metadata of the samples that were rebuilt.
+        """
+        if not self.is_sqlite:
+            return {}
+        if self.read_only:
+            raise PermissionError("Sample tables can't be refreshed by a read-only client")
+
+        tables = self.get_schema_catalog(force=True)
+        refreshed = {}
+        with self.engine.begin() as conn:
+            samples = read_sample_meta(conn)
+            for name, table in tables.items():
+                rows = table.row_estimate
+                if rows is None or rows < min_table_rows:
+                    continue
+                if (
+                    not force
+                    and name in samples
+                    and not is_sample_stale(samples[name], rows, max_age_seconds)
+                ):
+                    continue
+                refreshed[name] = refresh_sample_table(conn, name, fraction, rows)
+        return refreshed
+
+    def estimate_query_cost(
+        self,
+        sql_query: str,
+        max_cost: Optional[float] = None,
+        large_table_rows: int = 1_000_000,
+        reject_cartesian: bool = True,
+    ) -> QueryPlanEstimate:
+        """
+        Estimate the cost of a query from its execution plan, without running it.
+
+        SQLite plans ("EXPLAIN QUERY PLAN") are costed as the number of rows visited
+        using the catalog row estimates, Postgres plans ("EXPLAIN (FORMAT JSON)")
+        use the planner total cost. Full scans of large tables and joins without a
+        predicate connecting the tables (cartesian products) are reported.
+
+        Parameters
+        ----------
+        sql_query : str
+            The query to estimate.
+        max_cost : Optional[float]
+            Queries with a higher estimated cost are rejected. None means no limit.
+        large_table_rows : int
+            Tables with at least as many rows are reported when fully scanned.
+        reject_cartesian : bool
+            Whether queries with a cartesian product are rejected.
+
+        Returns
+        -------
+        QueryPlanEstimate
+            The estimate, "is_acceptable" is False for rejected queries.
+        """
+        self._check_read_only_statement(sql_query)
+        dialect = SQLGLOT_DIALECTS.get(self.engine.dialect.name)
+        table_rows = {
+            name: table.row_estimate for name, table in self.get_schema_catalog().items()
+        }
+        estimated_rows = None
+
+        with self._checkout() as conn:
+            if self.is_sqlite:
+                plan_rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql_query}").fetchall()
+                cost, full_scans = estimate_sqlite_plan(
+                    plan_rows,
+                    get_table_aliases(sql_query, dialect),
+                    table_rows,
+                    large_table_rows,
+                )
+                cartesian = find_cartesian_products(sql_query, dialect)
+                plan = "\n".join(row[3] for row in plan_rows)
+            else:
+                raw_plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql_query}").scalar()
+                if isinstance(raw_plan, str):
+                    raw_plan = json.loads(raw_plan)
+                cost, estimated_rows, full_scans, cartesian = analyze_postgres_plan(
+                    raw_plan[0]["Plan"], table_rows, large_table_rows
+                )
+                # fall back to the query text when the plan doesn't show it
+                cartesian = cartesian or find_cartesian_products(sql_query, dialect)
+                plan = json.dumps(raw_plan[0]["Plan"], indent=1)
+
+        reasons = []
+        if max_cost is not None and cost > max_cost:
+            reasons.append(
+                f"Estimated cost {cost:.0f} exceeds the limit of {max_cost:.0f}"
+                + (f" (full scans of {', '.join(full_scans)})" if full_scans else "")
+            )
+        if reject_cartesian and cartesian:
+            reasons.append(
+                "Missing join predicate, cartesian product of "
+                + "; ".join(cartesian)
+            )
+
+        estimate = QueryPlanEstimate(
+            estimated_cost=cost,
+            estimated_rows=estimated_rows,
+            full_scans=full_scans,
+            cartesian_products=cartesian,
+            is_acceptable=not reasons,
+            reasons=reasons,
+            plan=plan,
+        )
+        logger.info(
+            f"Estimated query cost: {cost:.0f}"
+            + (f", rejected: {'; '.join(reasons)}" if reasons else "")
+        )
+        return estimate
+
+    @contextmanager
+    def _guard_statement(
+        self,
+        conn: Connection,
+        timeout_seconds: Optional[float],
+        cancel_event: Optional[threading.Event],
+    ) -> Iterator[None]:
+        """
+        Enforce a time budget and cancellation on the statements run inside the block.
+
+        SQLite checks the budget from a progress handler and is interrupted on
+        cancellation. Postgres uses "SET LOCAL statement_timeout" and cancels the
+        running statement. Errors caused by the guard are re-raised as
+        QueryTimeoutError/QueryCancelledError.
+        """
+        if timeout_seconds is None and cancel_event is None:
+            yield
+            return
+
+        raw_conn = conn.connection.dbapi_connection
+        dialect = conn.dialect.name
+        deadline = time.monotonic() + timeout_seconds if timeout_seconds is not None else None
+        aborted = {"reason": None}
+
+        if dialect == "sqlite":
+
+            def on_progress() -> int:
+                if cancel_event is not None and cancel_event.is_set():
+                    aborted["reason"] = "cancelled"
+                elif deadline is not None and time.monotonic() > deadline:
+                    aborted["reason"] = "timeout"
+                return 1 if aborted["reason"] else 0  # non-zero aborts the statement
+
+            raw_conn.set_progress_handler(on_progress, SQLITE_PROGRESS_STEPS)
+        elif dialect == "postgresql" and timeout_seconds is not None:
+            # reset when the transaction ends (i.e. when the connection is returned)
+            conn.exec_driver_sql(
+                f"SET LOCAL statement_timeout = {max(1, int(timeout_seconds * 1000))}"
+            )
+        elif timeout_seconds is not None:
+            logger.warning(f"Statement timeout is not supported for {dialect}")
+
+        # a cancellation has to interrupt a statement that is blocked in the database
+        done = threading.Event()
+
+        def watch_cancel_event() -> None:
+            while not done.is_set():
+                if cancel_event.wait(0.05):
+                    aborted["reason"] = "cancelled"
+                    if dialect == "sqlite":
+                        raw_conn.interrupt()
+                    elif hasattr(raw_conn, "cancel"):
+                        raw_conn.cancel()
+                    return
+
+        watcher = None
+        if cancel_event is not None:
+            watcher = threading.Thread(target=watch_cancel_event, daemon=True)
+            watcher.start()
+
+        try:
+            yield
+        except Exception as e:
+            if aborted["reason"] == "cancelled":
+                raise QueryCancelledError("Query was cancelled") from e
+            if aborted["reason"] == "timeout" or self._is_statement_timeout(e):
+                raise QueryTimeoutError(
+                    f"Query exceeded its time budget ({timeout_seconds}s)"
+                ) from e
+            raise
+        finally:
+            done.set()
+            if watcher is not None:
+                watcher.join()
+            if dialect == "sqlite":
+                raw_conn.set_progress_handler(None, 0)
+
+    @staticmethod
+    def _is_statement_timeout(error: BaseException) -> bool:
+        """Whether the error (or its cause) is a Postgres statement timeout."""
+        while error is not None:
+            orig = getattr(error, "orig", error)
+            code = getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)
+            if code == POSTGRES_QUERY_CANCELED:
+                return True
+            error = error.__cause__ or error.__context__
+        return False
+
+    def _get_cache_key(self, sql_query: str, stream: bool) -> Optional[Hashable]:
+        """Cache key of a query, None if the query can't be cached."""
+        if self.query_cache is None:
+            return None
+        normalized = normalize_sql(
+            sql_query, SQLGLOT_DIALECTS.get(self.engine.dialect.name)
+        )
+        if normalized is None:
+            return None
+        return (str(self.engine.url), normalized, stream)
+
+    def _get_data_version(self, sql_query: str) -> Hashable:
+        """
+        Get a token that changes whenever the data read by a query may have changed.
+
+        For SQLite it is the modification time of the database file (and its WAL),
+        for Postgres the write counters of the referenced tables. Other databases
+        rely on the cache TTL only.
+
+        Parameters
+        ----------
+        sql_query : str
+            The query whose data is versioned.
+
+        Returns
+        -------
+        Hashable
+            The version token.
+        """
+        if self.is_sqlite:
+            path = self.database_path
+            if not path or path == ":memory:":
+                return None
+            return tuple(
+                os.stat(p).st_mtime_ns if os.path.exists(p) else None
+                for p in (path, f"{path}-wal")
+            )
+
+        if self.engine.dialect.name == "postgresql":
+            try:
+                tree = sqlglot.parse_one(sql_query, read="postgres")
+                tables = sorted({table.name for table in tree.find_all(exp.Table)})
+            except SqlglotError:
+                return time.time()  # never matches, i.e. not cached
+            query = text(
+                "SELECT relname, n_tup_ins, n_tup_upd, n_tup_del, n_tup_hot_upd "
+                "FROM pg_stat_user_tables WHERE relname IN :tables ORDER BY relname"
+            ).bindparams(bindparam("tables", expanding=True))
+            with self._checkout() as conn:
+                return tuple(tuple(row) for row in conn.execute(query, {"tables": tables}))
+
+        return None
+
+    def _update_column_stats(
+        self, stats: Dict[str, Dict[str, float]], chunk: pd.DataFrame
+    ) -> None:
+        """Update running aggregates of numeric columns with a chunk of rows."""
+        for name in chunk.columns:
+            column = chunk[name]
+            if not pd.api.types.is_numeric_dtype(column) or pd.api.types.is_bool_dtype(
+                column
+            ):
+                continue
+
+            column_stats = stats.setdefault(
+                name,
+                {"count": 0, "sum": 0.0, "min": float("inf"), "max": float("-inf")},
+            )
+            count = int(column.count())
+            if count == 0:
+                continue
+            column_stats["count"] += count
+            column_stats["sum"] += float(column.sum())
+            column_stats["min"] = min(column_stats["min"], float(column.min()))
+            column_stats["max"] = max(column_stats["max"], float(column.max()))
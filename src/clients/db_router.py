@@ -0,0 +1,262 @@
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.exc import DBAPIError
+
+from src.clients.approximate import SAMPLE_TABLE_PREFIX
+from src.clients.db_client import DatabaseClient
+from src.models.schemas import JiraTicket
+
+logger = logging.getLogger(__name__)
+
+# seconds between two health checks of a replica
+HEALTH_CHECK_INTERVAL_SECONDS = 30.0
+
+
+class ReplicaSet:
+    """
+    A primary database and its read replicas, used like a single DatabaseClient.
+
+    Queries are load-balanced round robin across the healthy replicas, the primary
+    serves them when no replica is healthy. A replica is health checked at most once
+    per interval and skipped while it is down. Everything else (schema catalog,
+    sample tables, pool statistics...) is delegated to the primary.
+    """
+
+    def __init__(
+        self,
+        primary: DatabaseClient,
+        replicas: Optional[List[DatabaseClient]] = None,
+        health_check_interval_seconds: float = HEALTH_CHECK_INTERVAL_SECONDS,
+    ):
+        self.primary = primary
+        self.replicas = list(replicas or [])
+        self.health_check_interval_seconds = health_check_interval_seconds
+
+        self._lock = threading.Lock()
+        self._next_replica = 0
+        self._healthy = [True] * len(self.replicas)
+        self._checked_at = [time.monotonic()] * len(self.replicas)
+
+    def execute_query(self, *args, **kwargs) -> Any:
+        return self._read("execute_query", *args, **kwargs)
+
+    def execute_query_streaming(self, *args, **kwargs) -> Any:
+        return self._read("execute_query_streaming", *args, **kwargs)
+
+    def execute_query_approximate(self, *args, **kwargs) -> Any:
+        return self._read("execute_query_approximate", *args, **kwargs)
+
+    def estimate_query_cost(self, *args, **kwargs) -> Any:
+        return self._read("estimate_query_cost", *args, **kwargs)
+
+    def _read(self, method: str, *args, **kwargs) -> Any:
+        """Run a read on the next healthy replica, failing over if it went down."""
+        for client in self._get_readers():
+            try:
+                return getattr(client, method)(*args, **kwargs)
+            except DBAPIError:
+                # a broken query fails the same way everywhere, a dead replica doesn't
+                if client is self.primary or client.ping():
+                    raise
+                logger.warning(
+                    f"Replica {self._get_name(client)} is down, failing over"
+                )
+                self._set_health(self.replicas.index(client), False)
+
+    def _get_readers(self) -> List[DatabaseClient]:
+        """Healthy replicas in round robin order, then the primary as a fallback."""
+        with self._lock:
+            start = self._next_replica
+            self._next_replica = (start + 1) % max(1, len(self.replicas))
+
+        readers = []
+        for offset in range(len(self.replicas)):
+            index = (start + offset) % len(self.replicas)
+            if self._is_healthy(index):
+                readers.append(self.replicas[index])
+        return readers + [self.primary]
+
+    def _is_healthy(self, index: int) -> bool:
+        """Health of a replica, checked again once the interval elapsed."""
+        with self._lock:
+            due = (
+                time.monotonic() - self._checked_at[index]
+                >= self.health_check_interval_seconds
+            )
+            if due:
+                # other threads keep the last known health until the check is done
+                self._checked_at[index] = time.monotonic()
+            else:
+                return self._healthy[index]
+        healthy = self.replicas[index].ping()
+        self._set_health(index, healthy)
+        return healthy
+
+    def _set_health(self, index: int, healthy: bool) -> None:
+        with self._lock:
+            if self._healthy[index] != healthy:
+                logger.info(
+                    f"Replica {self._get_name(self.replicas[index])} is "
+                    f"{'up' if healthy else 'down'}"
+                )
+            self._healthy[index] = healthy
+            self._checked_at[index] = time.monotonic()
+
+    def check_health(self) -> Dict[str, bool]:
+        """
+        Health check the primary and all replicas now.
+
+        Returns
+        -------
+        Dict[str, bool]
+            Health by database URL (passwords hidden).
+        """
+        health = {self._get_name(self.primary): self.primary.ping()}
+        for index, replica in enumerate(self.replicas):
+            healthy = replica.ping()
+            self._set_health(index, healthy)
+            health[self._get_name(replica)] = healthy
+        return health
+
+    @staticmethod
+    def _get_name(client: DatabaseClient) -> str:
+        return client.engine.url.render_as_string(hide_password=True)
+
+    def close(self) -> None:
+        for client in [self.primary] + self.replicas:
+            client.close()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.primary, name)
+
+
+@dataclass
+class DatabaseTarget:
+    """A database tickets can be routed to"""
+
+    name: str
+    database: ReplicaSet
+    components: List[str] = field(default_factory=list)  # Jira components routed here
+    labels: List[str] = field(default_factory=list)  # Jira labels routed here
+
+
+class DatabaseRouter:
+    """
+    Picks the database a ticket is answered from.
+
+    A ticket goes to the target listing one of its Jira components, else one of its
+    labels, else to the target whose schema catalog has the most tables named in the
+    ticket summary/description, else to the default target.
+    """
+
+    def __init__(self, targets: List[DatabaseTarget], default: Optional[str] = None):
+        if not targets:
+            raise ValueError("At least one database target is required")
+        self.targets = {target.name: target for target in targets}
+        self.default = default or targets[0].name
+        if self.default not in self.targets:
+            raise ValueError(f"Unknown default database target: {self.default}")
+
+    @classmethod
+    def from_config(
+        cls,
+        config: Dict[str, Any],
+        client_factory: Callable[[str], DatabaseClient] = DatabaseClient,
+    ) -> "DatabaseRouter":
+        """
+        Build the router from the "databases" config section.
+
+        Parameters
+        ----------
+        config : Dict[str, Any]
+            The "databases" section: "default", "health_check_interval_seconds" and
+            "targets" by name, each with a "connection_string" and optional
+            "replicas", "components" and "labels".
+        client_factory : Callable[[str], DatabaseClient]
+            Builds the client of a connection string (pooling, cache, read-only...).
+
+        Returns
+        -------
+        DatabaseRouter
+            The router.
+        """
+        interval = config.get("health_check_interval_seconds", HEALTH_CHECK_INTERVAL_SECONDS)
+        targets = []
+        for name, target in config["targets"].items():
+            targets.append(
+                DatabaseTarget(
+                    name=name,
+                    database=ReplicaSet(
+                        primary=client_factory(target["connection_string"]),
+                        replicas=[
+                            client_factory(replica)
+                            for replica in target.get("replicas") or []
+                        ],
+                        health_check_interval_seconds=interval,
+                    ),
+                    components=target.get("components") or [],
+                    labels=target.get("labels") or [],
+                )
+            )
+        return cls(targets=targets, default=config.get("default"))
+
+    def get_database(self, name: str) -> ReplicaSet:
+        """Database of a target."""
+        return self.targets[name].database
+
+    def route(self, ticket: JiraTicket) -> str:
+        """
+        Pick the target a ticket is answered from.
+
+        Parameters
+        ----------
+        ticket : JiraTicket
+            The ticket to route.
+
+        Returns
+        -------
+        str
+            The name of the target.
+        """
+        components = {component.lower() for component in ticket.components}
+        labels = {label.lower() for label in ticket.labels}
+        for attribute, values in (("components", components), ("labels", labels)):
+            for target in self.targets.values():
+                if values & {value.lower() for value in getattr(target, attribute)}:
+                    return target.name
+
+        if len(self.targets) > 1:
+            scores = self._get_table_scores(f"{ticket.summary} {ticket.description}")
+            best = max(scores.values(), default=0)
+            winners = [name for name, score in scores.items() if score == best]
+            if best > 0 and len(winners) == 1:
+                return winners[0]
+
+        return self.default
+
+    def _get_table_scores(self, text: str) -> Dict[str, int]:
+        """Number of tables of every target named in a text."""
+        words = set(re.findall(r"[a-z0-9_]+", text.lower()))
+        scores = {}
+        for target in self.targets.values():
+            try:
+                tables = target.database.get_schema_catalog()
+            except Exception as e:
+                logger.warning(f"Schema catalog of {target.name} unavailable: {str(e)}")
+                tables = {}
+            names = {
+                name.lower()
+                for name in tables
+                if not name.startswith(SAMPLE_TABLE_PREFIX)
+            }
+            scores[target.name] = len(names & words)
+        return scores
+
+    def close(self) -> None:
+        for target in self.targets.values():
+            target.database.close()
@@ -1,33 +1,232 @@
 import json
 import logging
-from typing import Any, Dict, List, Optional, Union
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# issue fields read by "extract_issue_details" (used as a search projection)
+ISSUE_DETAIL_FIELDS = [
+    "summary",
+    "description",
+    "status",
+    "assignee",
+    "reporter",
+    "priority",
+    "duedate",
+    "created",
+    "updated",
+    "project",
+    "issuetype",
+    "labels",
+    "components",
+]
+
+# (project key, issue type, current status) -> transitions available from that status
+TransitionCacheKey = Tuple[str, str, str]
+
+# issues assigned to the bot that are not resolved yet
+ACTIVE_ISSUES_JQL_FILTER = "assignee = currentUser() AND statusCategory != Done"
+ACTIVE_ISSUES_JQL_ORDER = "ORDER BY created DESC"
+
+# HTTP statuses worth retrying (rate limiting and transient server errors)
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class JiraBadRequestError(ValueError):
+    """Jira rejected the request payload (HTTP 400), e.g. an unavailable transition"""
+
+
+class JiraRetry(Retry):
+    """
+    Retry policy for Jira calls.
+
+    Rate limited requests (429) are rejected before Jira processes them, so they are
+    retried for every HTTP method. Server errors (5xx) are retried only for idempotent
+    methods to avoid e.g. posting the same comment twice.
+    """
+
+    def is_retry(
+        self, method: str, status_code: int, has_retry_after: bool = False
+    ) -> bool:
+        if status_code == 429:
+            return bool(self.total)
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+class BaseJiraClient:
+    """
+    Transport-agnostic helpers shared by the synchronous and asynchronous Jira clients.
+    """
+
+    def _get_active_issues_jql(
+        self,
+        updated_within_minutes: Optional[int],
+        include_keys: Optional[List[str]] = None,
+    ) -> str:
+        """
+        Build JQL for active issues, optionally limited to recently updated ones.
 
-class JiraClient:
-    def __init__(self, *, base_url: str, api_token: str, email: str) -> None:
+        Relative dates (e.g. "-5m") are used, so the watermark doesn't depend on
+        the time zone configured in the Jira profile. Issues of "include_keys" are
+        retrieved even if they were not updated recently (e.g. failed tickets).
         """
-        Initialize the JiraClient with authentication and base URL setup.
+        jql_filter = ACTIVE_ISSUES_JQL_FILTER
+        if updated_within_minutes is not None:
+            updated = f'updated >= "-{updated_within_minutes}m"'
+            if include_keys:
+                updated = f"({updated} OR key in ({', '.join(include_keys)}))"
+            jql_filter += f" AND {updated}"
+        return f"{jql_filter} {ACTIVE_ISSUES_JQL_ORDER}"
+
+    def _init_account_id_cache(self, path: Optional[str], ttl: float) -> None:
+        """
+        Set up the on-disk cache of the account ID.
 
         Parameters
         ----------
-        base_url : str
-            The base URL of the Jira instance.
-        api_token : str
-            The API token for authenticating with Jira.
-        email : str
-            The email address associated with the Jira account.
+        path : Optional[str]
+            JSON file shared by clients (and processes) using the same credentials.
+            If None, the account ID is cached only in memory.
+        ttl : float
+            The number of seconds the persisted account ID stays valid.
         """
-        self.email = email
-        self.api_token = self._fix_api_token(api_token)
-        self.base_url = self._fix_base_url(base_url)
-        self.auth = HTTPBasicAuth(username=self.email, password=self.api_token)
-        self.headers = {"Content-Type": "application/json"}
-        self.account_id = self._get_account_id()
+        self.account_id_cache_path = path
+        self.account_id_cache_ttl = ttl
+
+    def _load_cached_account_id(self) -> Optional[str]:
+        """Read the account ID persisted on disk, None if it is missing or expired."""
+        if not self.account_id_cache_path:
+            return None
+
+        try:
+            with open(self.account_id_cache_path, "r") as file:
+                entry = json.load(file).get(f"{self.base_url}|{self.email}")
+        except (OSError, ValueError):
+            return None
+
+        if not entry or time.time() - entry["fetched_at"] > self.account_id_cache_ttl:
+            return None
+        return entry["account_id"]
+
+    def _store_account_id(self, account_id: Optional[str]) -> None:
+        """Persist the account ID on disk (atomic replace of the cache file)."""
+        if not self.account_id_cache_path or account_id is None:
+            return
+
+        try:
+            with open(self.account_id_cache_path, "r") as file:
+                cache = json.load(file)
+        except (OSError, ValueError):
+            cache = {}
+
+        cache[f"{self.base_url}|{self.email}"] = {
+            "account_id": account_id,
+            "fetched_at": time.time(),
+        }
+        directory = os.path.dirname(self.account_id_cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.account_id_cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(cache, file)
+        os.replace(tmp_path, self.account_id_cache_path)
+
+    def _init_transition_cache(self, ttl: float) -> None:
+        """
+        Set up the cache of transition IDs.
+
+        Jira workflows are defined per project and issue type, so all issues sharing
+        the project, the issue type and the current status have the same transitions.
+
+        Parameters
+        ----------
+        ttl : float
+            The number of seconds a cached set of transitions stays valid.
+        """
+        self.transition_cache_ttl = ttl
+        self._transition_cache: Dict[TransitionCacheKey, Tuple[float, Dict[str, str]]] = {}
+        self._transition_cache_lock = threading.Lock()
+
+    def _get_transition_cache_key(
+        self,
+        project_key: Optional[str],
+        issue_type: Optional[str],
+        current_status: Optional[str],
+    ) -> Optional[TransitionCacheKey]:
+        """Build the transition cache key if the whole issue context is known."""
+        if not (project_key and issue_type and current_status):
+            return None
+        return (project_key, issue_type.lower(), current_status.lower())
+
+    def _get_cached_transition_id(
+        self, key: Optional[TransitionCacheKey], status_name: str
+    ) -> Optional[str]:
+        """Return the cached transition ID or None if it is unknown or expired."""
+        if key is None:
+            return None
+
+        with self._transition_cache_lock:
+            entry = self._transition_cache.get(key)
+            if entry is None:
+                return None
+            expires_at, transitions = entry
+            if time.monotonic() >= expires_at:
+                del self._transition_cache[key]
+                return None
+        return transitions.get(status_name.lower())
+
+    def _cache_transitions(
+        self, key: Optional[TransitionCacheKey], transitions: List[Dict[str, Any]]
+    ) -> None:
+        """Remember transitions (name -> id) available for the given issue context."""
+        if key is None:
+            return
+
+        expires_at = time.monotonic() + self.transition_cache_ttl
+        name_to_id = {t["name"].lower(): t["id"] for t in transitions}
+        with self._transition_cache_lock:
+            self._transition_cache[key] = (expires_at, name_to_id)
+
+    def _invalidate_transitions(self, key: Optional[TransitionCacheKey]) -> None:
+        """Drop cached transitions of the given issue context."""
+        with self._transition_cache_lock:
+            self._transition_cache.pop(key, None)
+
+    def _find_transition_id(
+        self, transitions: List[Dict[str, Any]], status_name: str
+    ) -> str:
+        """
+        Find the transition ID by the status name.
+
+        Parameters
+        ----------
+        transitions : List[Dict[str, Any]]
+            Transitions available for the issue, each containing 'id' and 'name'.
+        status_name : str
+            The desired status to transition to (e.g., "In Progress", "Close Issue", etc).
+
+        Returns
+        -------
+        str
+            The ID of the matching transition.
+        """
+        if not transitions:
+            raise ValueError("No transitions found for this issue.")
+
+        matching = [t for t in transitions if t["name"].lower() == status_name.lower()]
+        if not matching:
+            raise ValueError(f"Transition to '{status_name}' not available.")
+
+        return matching[0]["id"]
 
     def _fix_api_token(self, api_token: str) -> str:
         """
@@ -74,12 +273,13 @@ class JiraClient:
         Parameters
         ----------
         response : requests.Response
-            The response object returned from a requests call.
+            The response object returned from a requests (or httpx) call.
 
         Returns
         -------
         Optional[Dict[str, Any]]
-            The parsed JSON response if successful, otherwise raises an exception.
+            The parsed JSON response if successful, None for responses without content
+            (e.g. 204), otherwise raises an exception.
         """
         if response.status_code in (200, 201):
             return response.json()
@@ -98,11 +298,12 @@ class JiraClient:
         elif response.status_code == 400:
             content = json.loads(response.content.decode("utf-8"))
             error = content.get("errors", content)
-            raise ValueError(
+            raise JiraBadRequestError(
                 f"Bad Request. Please check the request payload! Error: {error}"
             )
-        else:
-            response.raise_for_status()
+        # e.g. 204 No Content of transitions (httpx returns the response itself)
+        response.raise_for_status()
+        return None
 
     def _safe_get(self, d, *keys) -> Optional[Dict[str, Any]]:
         """
@@ -149,29 +350,6 @@ class JiraClient:
                 return self._extract_text_from_adf(adf_content["content"])
         return ""
 
-    def _request(self, method: str, url: str, **kwargs) -> Optional[Dict[str, Any]]:
-        """
-        Send an HTTP request using the specified method and URL, along with optional parameters.
-
-        Parameters
-        ----------
-            method: str
-                The HTTP method to use (e.g., 'GET', 'POST', 'PUT', 'DELETE').
-            url: str
-                The full URL to send the request to.
-            **kwargs:
-                Optional arguments passed directly to `requests.request` (e.g., json, params, data, timeout).
-
-        Returns
-        -------
-            Dict[str, Any]
-                The parsed JSON response or processed output from the server.
-        """
-        response = requests.request(
-            method=method, url=url, headers=self.headers, auth=self.auth, **kwargs
-        )
-        return self._handle_response(response)
-
     def _preprocess_payload(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """
         Aligns the payload structure with Jira API requirements.
@@ -209,6 +387,210 @@ class JiraClient:
 
         return payload
 
+    def extract_issue_details(self, issue: dict) -> Dict[str, Any]:
+        """
+        Extract detailed info from a Jira issue JSON.
+
+        Parameters
+        ----------
+        issue : dict
+            The Jira issue JSON object as returned by get_issue function.
+
+        Returns
+        -------
+        dict
+            Fileds of interest from the issue JSON.
+        """
+        fields = issue.get("fields", {})
+        description_field = fields.get("description")
+        description_text = ""
+
+        if isinstance(description_field, str):
+            description_text = description_field
+        elif isinstance(description_field, dict):
+            description_text = self._extract_text_from_adf(
+                description_field.get("content", [])
+            )
+
+        return {
+            "ticket_id": issue.get("key"),
+            "summary": fields.get("summary"),
+            "description": description_text.strip() if description_text else None,
+            "status": self._safe_get(fields, "status", "name"),
+            "project": self._safe_get(fields, "project", "key"),
+            "issue_type": self._safe_get(fields, "issuetype", "name"),
+            "labels": fields.get("labels") or [],
+            "components": [
+                component.get("name") for component in fields.get("components") or []
+            ],
+            "assignee": {
+                "account_id": self._safe_get(fields, "assignee", "accountId"),
+                "name": self._safe_get(fields, "assignee", "displayName"),
+                "email": self._safe_get(fields, "assignee", "emailAddress"),
+            },
+            "reporter": {
+                "account_id": self._safe_get(fields, "reporter", "accountId"),
+                "name": self._safe_get(fields, "reporter", "displayName"),
+                "email": self._safe_get(fields, "reporter", "emailAddress"),
+            },
+            "priority": self._safe_get(fields, "priority", "name"),
+            "due_date": fields.get("duedate"),
+            "created_date": fields.get("created"),
+            "updated_date": fields.get("updated"),
+        }
+
+
+class JiraClient(BaseJiraClient):
+    def __init__(
+        self,
+        *,
+        base_url: str,
+        api_token: str,
+        email: str,
+        pool_size: int = 10,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        backoff_jitter: float = 0.5,
+        transition_cache_ttl: float = 3600.0,
+        account_id_cache_path: Optional[str] = None,
+        account_id_cache_ttl: float = 86400.0,
+    ) -> None:
+        """
+        Initialize the JiraClient with authentication and base URL setup.
+        No requests are sent to Jira until the client is used.
+
+        Parameters
+        ----------
+        base_url : str
+            The base URL of the Jira instance.
+        api_token : str
+            The API token for authenticating with Jira.
+        email : str
+            The email address associated with the Jira account.
+        pool_size : int
+            The maximum number of keep-alive connections kept open to Jira.
+        max_retries : int
+            The number of retries for rate limited (429) and failed (5xx) requests.
+        backoff_factor : float
+            The base of the exponential backoff between retries (in seconds).
+            "Retry-After" header sent by Jira takes precedence over it.
+        backoff_jitter : float
+            The maximum random delay (in seconds) added to every backoff.
+        transition_cache_ttl : float
+            The number of seconds transition IDs are cached for "transition_issue".
+        account_id_cache_path : Optional[str]
+            JSON file to persist the account ID in (e.g. "./data/.jira_account.json").
+        account_id_cache_ttl : float
+            The number of seconds the persisted account ID stays valid.
+        """
+        self.email = email
+        self.api_token = self._fix_api_token(api_token)
+        self.base_url = self._fix_base_url(base_url)
+        self.auth = HTTPBasicAuth(username=self.email, password=self.api_token)
+        self.headers = {"Content-Type": "application/json"}
+        self.session = self._create_session(
+            pool_size=pool_size,
+            max_retries=max_retries,
+            backoff_factor=backoff_factor,
+            backoff_jitter=backoff_jitter,
+        )
+        self._init_transition_cache(ttl=transition_cache_ttl)
+        self._init_account_id_cache(
+            path=account_id_cache_path, ttl=account_id_cache_ttl
+        )
+        self.request_count = 0  # number of HTTP calls made to Jira
+        self._request_count_lock = threading.Lock()  # searches count from worker threads
+        self._account_id: Optional[str] = None  # resolved on first use
+        self._account_id_lock = threading.Lock()
+
+    def _count_request(self) -> None:
+        """Count an HTTP call made to Jira (thread-safe)."""
+        with self._request_count_lock:
+            self.request_count += 1
+
+    @property
+    def account_id(self) -> Optional[str]:
+        """The account ID of the authenticated user (resolved lazily and cached)."""
+        if self._account_id is None:
+            with self._account_id_lock:
+                if self._account_id is None:
+                    account_id = self._load_cached_account_id()
+                    if account_id is None:
+                        account_id = self._get_account_id()
+                        self._store_account_id(account_id)
+                    self._account_id = account_id
+        return self._account_id
+
+    def _create_session(
+        self,
+        pool_size: int,
+        max_retries: int,
+        backoff_factor: float,
+        backoff_jitter: float,
+    ) -> requests.Session:
+        """
+        Create a persistent HTTP session with connection pooling and retries.
+
+        Parameters
+        ----------
+        pool_size : int
+            The maximum number of connections kept alive per host.
+        max_retries : int
+            The number of retries for statuses from RETRY_STATUS_CODES.
+        backoff_factor : float
+            The base of the exponential backoff between retries (in seconds).
+        backoff_jitter : float
+            The maximum random delay (in seconds) added to every backoff.
+
+        Returns
+        -------
+        requests.Session
+            The session that reuses TCP/TLS connections between Jira calls.
+        """
+        retry = JiraRetry(
+            total=max_retries,
+            status_forcelist=RETRY_STATUS_CODES,
+            backoff_factor=backoff_factor,
+            backoff_jitter=backoff_jitter,
+            respect_retry_after_header=True,
+            raise_on_status=False,  # the last response is handled by "_handle_response"
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def close(self) -> None:
+        """Close all pooled connections of the client."""
+        self.session.close()
+
+    def _request(self, method: str, url: str, **kwargs) -> Optional[Dict[str, Any]]:
+        """
+        Send an HTTP request using the specified method and URL, along with optional parameters.
+
+        Parameters
+        ----------
+            method: str
+                The HTTP method to use (e.g., 'GET', 'POST', 'PUT', 'DELETE').
+            url: str
+                The full URL to send the request to.
+            **kwargs:
+                Optional arguments passed directly to `requests.Session.request` (e.g., json, params, data, timeout).
+
+        Returns
+        -------
+            Dict[str, Any]
+                The parsed JSON response or processed output from the server.
+        """
+        self._count_request()
+        response = self.session.request(
+            method=method, url=url, headers=self.headers, auth=self.auth, **kwargs
+        )
+        return self._handle_response(response)
+
     def _get_account_id(self) -> str | None:
         """
         Get the account ID of the currently authenticated user.
@@ -333,7 +715,8 @@ class JiraClient:
 
         with open(file_path, "rb") as file:
             files = {"file": (file_path, file)}
-            response = requests.post(url, headers=headers, auth=self.auth, files=files)
+            self._count_request()
+            response = self.session.post(url, headers=headers, auth=self.auth, files=files)
         return self._handle_response(response)
 
     def get_issue(self, issue: str) -> Optional[Dict[str, Any]]:
@@ -377,38 +760,62 @@ class JiraClient:
 
         return self._request(method="post", url=url, json={"fields": fields})
 
-    def get_active_issues(
-        self, limit: int = -1, start_at: int = 0, batch_size: int = 50
+    def _search(
+        self,
+        url: str,
+        jql: str,
+        limit: int,
+        start_at: int,
+        batch_size: int,
+        fields: Optional[List[str]] = None,
+        max_workers: int = 1,
+        validate_query: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """
-        Retrieve issues assigned to the current user that are not marked as 'Done'.
+        Run a paginated JQL search.
+
+        With max_workers > 1 the first page is used to learn the total number of issues
+        and the remaining pages are fetched concurrently (results keep the Jira order).
 
         Parameters
         ----------
-        limit: int
-            The maximum number of issues to retrieve. If set to -1 (default), retrieves
-            all matching issues using pagination.
-        start_at: int
-            The index of the first issue to return. This is useful to keep track of
-            retrieved issues. So that we don't retreieve the same issues again.
-        batch_size: int
-            The maximum number of issues to fetch per request (max allowed by Jira is 100)
+        url : str
+            The search endpoint.
+        jql : str
+            Jira Query Language string.
+        limit : int
+            The maximum number of issues to retrieve. If -1, retrieves all matching issues.
+        start_at : int
+            The index of the first issue to return.
+        batch_size : int
+            The maximum number of issues to fetch per request.
+        fields : Optional[List[str]]
+            Issue fields to include in every page. If None, Jira returns its default set.
+        max_workers : int
+            The number of pages fetched at the same time.
+        validate_query : Optional[str]
+            The JQL validation mode ("warn" tolerates keys of deleted issues), None
+            uses the Jira default ("strict").
 
         Returns
         -------
-            List[Dict[str, Any]]: A list of dictionaries represention the retrieved issues.
+        List[Dict[str, Any]]
+            The retrieved issues.
         """
-        api_endpoint = "rest/api/3/search"
-        url = f"{self.base_url}/{api_endpoint}"
-        jql = (
-            "assignee = currentUser() AND statusCategory != Done ORDER BY created DESC"
-        )
+
+        def fetch_page(offset: int, size: int) -> Optional[Dict[str, Any]]:
+            params = {"jql": jql, "maxResults": size, "startAt": offset}
+            if fields:
+                params["fields"] = ",".join(fields)
+            if validate_query:
+                params["validateQuery"] = validate_query
+            return self._request(method="get", url=url, params=params)
 
         # container for accumulated issues
         all_issues = []
 
         while True:
-            # determine how many issues to fetch for the first iteration
+            # determine how many issues to fetch for the current iteration
             if limit == -1:
                 current_max = batch_size
             else:
@@ -417,14 +824,8 @@ class JiraClient:
             if current_max <= 0:
                 break
 
-            params = {
-                "jql": jql,
-                "maxResults": current_max,
-                "startAt": start_at,
-            }
-
             # request a batch of issues
-            result = self._request(method="get", url=url, params=params)
+            result = fetch_page(start_at, current_max)
 
             if not result or "issues" not in result:
                 break
@@ -440,8 +841,78 @@ class JiraClient:
 
             start_at += len(issues)
 
+            if max_workers > 1 and issues:
+                # the total is known -> request the remaining pages concurrently
+                total = result["total"]
+                end = total if limit == -1 else min(total, start_at + limit - len(all_issues))
+                page_size = len(issues)  # Jira may cap "maxResults"
+                offsets = range(start_at, end, page_size)
+
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    pages = executor.map(
+                        lambda offset: fetch_page(offset, min(page_size, end - offset)),
+                        offsets,
+                    )
+                    for page in pages:
+                        if page and "issues" in page:
+                            all_issues.extend(page["issues"])
+                break
+
         return all_issues
 
+    def get_active_issues(
+        self,
+        limit: int = -1,
+        start_at: int = 0,
+        batch_size: int = 50,
+        fields: Optional[List[str]] = None,
+        max_workers: int = 1,
+        updated_within_minutes: Optional[int] = None,
+        include_keys: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Retrieve issues assigned to the current user that are not marked as 'Done'.
+
+        Parameters
+        ----------
+        limit: int
+            The maximum number of issues to retrieve. If set to -1 (default), retrieves
+            all matching issues using pagination.
+        start_at: int
+            The index of the first issue to return. This is useful to keep track of
+            retrieved issues. So that we don't retreieve the same issues again.
+        batch_size: int
+            The maximum number of issues to fetch per request (max allowed by Jira is 100)
+        fields: Optional[List[str]]
+            Issue fields to include in every page (e.g. ["summary", "comment"]).
+            If None, Jira returns its default field set.
+        max_workers: int
+            The number of pages fetched concurrently after the first one.
+        updated_within_minutes: Optional[int]
+            If set, only issues updated within the last N minutes are retrieved
+            (incremental polling). If None, all active issues are retrieved.
+        include_keys: Optional[List[str]]
+            Active issues retrieved even if they were not updated within the last
+            "updated_within_minutes" (e.g. tickets whose processing failed).
+
+        Returns
+        -------
+            List[Dict[str, Any]]: A list of dictionaries represention the retrieved issues.
+        """
+        api_endpoint = "rest/api/3/search"
+        url = f"{self.base_url}/{api_endpoint}"
+        return self._search(
+            url=url,
+            jql=self._get_active_issues_jql(updated_within_minutes, include_keys),
+            # retried tickets may have been deleted since
+            validate_query="warn" if include_keys else None,
+            limit=limit,
+            start_at=start_at,
+            batch_size=batch_size,
+            fields=fields,
+            max_workers=max_workers,
+        )
+
     def update_issue(
         self, issue_key: str, fields: Dict[str, Any]
     ) -> Optional[Dict[str, Any]]:
@@ -482,9 +953,6 @@ class JiraClient:
         """
         url = f"{self.base_url}/rest/api/2/issue/{issue_key}"
         return self._request(method="put", url=url, json={"fields": fields})
-    
-
-
 
     def get_available_transitions(self, issue_key: str) -> List[Dict[str, Any]]:
         """
@@ -506,42 +974,70 @@ class JiraClient:
         return data.get("transitions", [])
 
     def transition_issue(
-        self, issue_key: str, status_name: str
+        self,
+        issue_key: str,
+        status_name: str,
+        project_key: Optional[str] = None,
+        issue_type: Optional[str] = None,
+        current_status: Optional[str] = None,
     ) -> Optional[Dict[str, Any]]:
         """
         Transition the issue to a new status by name.
 
+        If the issue context (project, issue type and current status) is provided,
+        the transition ID is taken from the cache, so the transition costs a single POST.
+
         Parameters
         ----------
         issue_key : str
             The Jira issue key (e.g. "VWNPER-1", "BIO-2", etc).
         status_name : str
             The desired status to transition to (e.g., "In Progress", "Close Issue", etc).
+        project_key : Optional[str]
+            The key of the issue's project (e.g. "DATA").
+        issue_type : Optional[str]
+            The name of the issue type (e.g. "Task").
+        current_status : Optional[str]
+            The name of the issue's current status.
 
         Returns
         -------
         Optional[Dict[str, Any]]
-            The result of the transition if successful.
+            The result of the transition, None when Jira answers 204 No Content.
         """
+        transition_url = f"{self.base_url}/rest/api/2/issue/{issue_key}/transitions"
+        cache_key = self._get_transition_cache_key(
+            project_key, issue_type, current_status
+        )
+
+        transition_id = self._get_cached_transition_id(cache_key, status_name)
+        if transition_id is not None:
+            try:
+                data = {"transition": {"id": transition_id}}
+                return self._request(method="post", url=transition_url, json=data)
+            except JiraBadRequestError:
+                # the workflow has changed (400) -> look the transitions up again
+                logger.warning(f"Cached transition rejected for {issue_key}")
+                self._invalidate_transitions(cache_key)
+
         # get available transitions
         transitions = self.get_available_transitions(issue_key=issue_key)
-
-        if not transitions:
-            raise ValueError("No transitions found for this issue.")
+        self._cache_transitions(cache_key, transitions)
 
         # find the transition ID for the given status name
-        matching = [t for t in transitions if t["name"].lower() == status_name.lower()]
-        if not matching:
-            raise ValueError(f"Transition to '{status_name}' not available.")
-
-        transition_id = matching[0]["id"]
+        transition_id = self._find_transition_id(transitions, status_name)
 
         # perform the transition
-        transition_url = f"{self.base_url}/rest/api/2/issue/{issue_key}/transitions"
         data = {"transition": {"id": transition_id}}
         return self._request(method="post", url=transition_url, json=data)
 
-    def run_jql(self, jql: str, max_results: int = 50) -> Dict[str, Any]:
+    def run_jql(
+        self,
+        jql: str,
+        max_results: int = 50,
+        fields: Optional[List[str]] = None,
+        max_workers: int = 1,
+    ) -> Dict[str, Any]:
         """
         Search Jira issues using JQL. Jira limits number of results per request to 100.
 
@@ -551,94 +1047,34 @@ class JiraClient:
             Jira Query Language string.
         max_results : int
             Maximum number of results to return. If -1, fetches all matching issues.
+        fields : Optional[List[str]]
+            Issue fields to include in every page. If None, Jira returns its default set.
+        max_workers : int
+            The number of pages fetched concurrently after the first one.
 
         Returns
         -------
         Optional[Dict[str, Any]]
             The search results.
         """
-        all_issues = []
-        start_at = 0
-        batch_size = 100
-
         # "pagination logic" to be able to retrieve more than 100 issues
-        while True:
-            if max_results == -1:
-                batch_limit = batch_size
-            else:
-                batch_limit = min(batch_size, max_results - len(all_issues))
-                if batch_limit <= 0:
-                    break
-
-            url = f"{self.base_url}/rest/api/2/search"
-            params = {"jql": jql, "maxResults": batch_limit, "startAt": start_at}
-
-            result = self._request(method="get", url=url, params=params)
-
-            if not result or "issues" not in result:
-                break
-
-            issues = result["issues"]
-            all_issues.extend(issues)
-
-            if max_results != -1 and len(all_issues) >= max_results:
-                break
-
-            if start_at + len(issues) >= result.get("total", 0):
-                break
-
-            start_at += len(issues)
-
-        return {"issues": all_issues}
-
-    def extract_issue_details(self, issue: dict) -> Dict[str, Any]:
-        """
-        Extract detailed info from a Jira issue JSON.
-
-        Parameters
-        ----------
-        issue : dict
-            The Jira issue JSON object as returned by get_issue function.
-
-        Returns
-        -------
-        dict
-            Fileds of interest from the issue JSON.
-        """
-        fields = issue.get("fields", {})
-        description_field = fields.get("description")
-        description_text = ""
-
-        if isinstance(description_field, str):
-            description_text = description_field
-        elif isinstance(description_field, dict):
-            description_text = self._extract_text_from_adf(
-                description_field.get("content", [])
-            )
+        url = f"{self.base_url}/rest/api/2/search"
+        issues = self._search(
+            url=url,
+            jql=jql,
+            limit=max_results,
+            start_at=0,
+            batch_size=100,
+            fields=fields,
+            max_workers=max_workers,
+        )
+        return {"issues": issues}
 
-        return {
-            "ticket_id": issue.get("key"),
-            "summary": fields.get("summary"),
-            "description": description_text.strip() if description_text else None,
-            "status": self._safe_get(fields, "status", "name"),
-            "assignee": {
-                "account_id": self._safe_get(fields, "assignee", "accountId"),
-                "name": self._safe_get(fields, "assignee", "displayName"),
-                "email": self._safe_get(fields, "assignee", "emailAddress"),
-            },
-            "reporter": {
-                "account_id": self._safe_get(fields, "reporter", "accountId"),
-                "name": self._safe_get(fields, "reporter", "displayName"),
-                "email": self._safe_get(fields, "reporter", "emailAddress"),
-            },
-            "priority": self._safe_get(fields, "priority", "name"),
-            "due_date": fields.get("duedate"),
-            "created_date": fields.get("created"),
-            "updated_date": fields.get("updated"),
-        }
-    
     def delete_issues(
-        self, project_key: str, issue_key: str, max_results: int = 50
+        self,
+        project_key: str,
+        issue_key: str,
+        max_results: int = 50,
     ) -> None:
         """
         Delete either:
@@ -674,9 +1110,7 @@ class JiraClient:
         
         # many issues deletion logic
         jql = f"project = {project_key} ORDER BY created ASC"
-        issues = self.run_jql(
-            jql=jql, max_results=max_results
-        )
+        issues = self.run_jql(jql=jql, max_results=max_results, fields=["key"])
 
         for issue in issues['issues']:
             issue_id = issue["key"]
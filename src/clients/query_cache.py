@@ -0,0 +1,208 @@
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Optional
+
+import numpy as np
+import sqlglot
+from sqlglot import exp
+from sqlglot.errors import SqlglotError
+from sqlglot.optimizer.normalize_identifiers import normalize_identifiers
+
+from src.models.schemas import QueryResult
+
+logger = logging.getLogger(__name__)
+
+# SQLAlchemy dialect name -> sqlglot dialect name
+SQLGLOT_DIALECTS = {"postgresql": "postgres", "sqlite": "sqlite", "mysql": "mysql"}
+
+
+def normalize_sql(sql_query: str, dialect: Optional[str] = None) -> Optional[str]:
+    """
+    Canonicalize a read-only query so that equivalent spellings share a cache key.
+
+    Whitespace, keyword/identifier case and table aliases are normalized. Output
+    column names are kept as written since they define the result columns.
+
+    Parameters
+    ----------
+    sql_query : str
+        The query to normalize.
+    dialect : Optional[str]
+        The sqlglot dialect used to parse and render the query.
+
+    Returns
+    -------
+    Optional[str]
+        The canonical form, or None if the query can't be parsed or isn't a SELECT.
+    """
+    try:
+        statements = sqlglot.parse(sql_query, read=dialect)
+    except SqlglotError:
+        return None
+    if len(statements) != 1 or not isinstance(statements[0], exp.Query):
+        return None
+
+    output_columns = ",".join(statements[0].named_selects)
+    tree = normalize_identifiers(statements[0], dialect=dialect)
+
+    # rename table aliases to positional names ("a"/"s" -> "_t0"/"_t1")
+    aliases = [table.alias for table in tree.find_all(exp.Table) if table.alias]
+    if aliases and len(set(aliases)) == len(aliases):
+        mapping = {alias: f"_t{i}" for i, alias in enumerate(aliases)}
+        for table in tree.find_all(exp.Table):
+            if table.alias in mapping:
+                table.set("alias", exp.TableAlias(this=exp.to_identifier(mapping[table.alias])))
+        for column in tree.find_all(exp.Column):
+            if column.table in mapping:
+                column.set("table", exp.to_identifier(mapping[column.table]))
+
+    return f"{tree.sql(dialect=dialect)}|{output_columns}"
+
+
+def _estimate_size(result: QueryResult) -> int:
+    """Approximate memory footprint of a query result in bytes."""
+    size = 0
+    for column in result.columns.values():
+        size += column.nbytes
+        if column.dtype == np.dtype(object):
+            size += sum(sys.getsizeof(value) for value in column)
+    return size
+
+
+@dataclass
+class _CacheEntry:
+    result: QueryResult
+    version: Hashable
+    expires_at: float
+    size: int
+
+
+class QueryCache:
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl_seconds: float = 300.0,
+        max_bytes: int = 64 * 1024 * 1024,
+    ):
+        """
+        Initialize an in-memory LRU cache of query results.
+
+        Parameters
+        ----------
+        max_entries : int
+            The maximum number of cached results.
+        ttl_seconds : float
+            The number of seconds a result stays valid.
+        max_bytes : int
+            The memory budget for all cached results. Larger results are never cached.
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+
+        self._entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, version: Hashable = None) -> Optional[QueryResult]:
+        """
+        Get a cached result.
+
+        Parameters
+        ----------
+        key : Hashable
+            The cache key (see "normalize_sql").
+        version : Hashable
+            The current version of the underlying data. Entries cached for another
+            version are stale and dropped.
+
+        Returns
+        -------
+        Optional[QueryResult]
+            The cached result or None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (
+                entry.version != version or entry.expires_at <= time.monotonic()
+            ):
+                self._remove(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.result.model_copy()
+
+    def put(self, key: Hashable, version: Hashable, result: QueryResult) -> None:
+        """
+        Store a result, evicting the least recently used entries to stay in budget.
+
+        Parameters
+        ----------
+        key : Hashable
+            The cache key (see "normalize_sql").
+        version : Hashable
+            The version of the underlying data the result was read from.
+        result : QueryResult
+            The result to cache.
+        """
+        size = _estimate_size(result)
+        if size > self.max_bytes:
+            logger.debug(f"Result of {size} bytes is over the cache budget, not cached")
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _CacheEntry(
+                result=result.model_copy(),
+                version=version,
+                expires_at=time.monotonic() + self.ttl_seconds,
+                size=size,
+            )
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics for monitoring.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Hits, misses, hit rate, evictions, number of entries and bytes used.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
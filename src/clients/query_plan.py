@@ -0,0 +1,223 @@
+import logging
+import math
+import re
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import sqlglot
+from sqlglot import exp
+from sqlglot.errors import SqlglotError
+
+logger = logging.getLogger(__name__)
+
+# "SCAN s", "SCAN sales USING COVERING INDEX idx", "SEARCH c USING INDEX idx (id=?)",
+# SQLite < 3.36 names the table first: "SCAN TABLE sales AS s", "SEARCH TABLE c USING ..."
+SQLITE_PLAN_STEP = re.compile(r"^(SCAN|SEARCH) (?:TABLE )?(\S+)(?: AS \S+)?(.*)$")
+
+# rows assumed for a loop over something that isn't a table (subquery, CTE...)
+UNKNOWN_LOOP_ROWS = 1000.0
+
+
+def get_table_aliases(sql_query: str, dialect: Optional[str] = None) -> Dict[str, str]:
+    """Map every table alias (and table name) used in a query to the table name."""
+    try:
+        tree = sqlglot.parse_one(sql_query, read=dialect)
+    except SqlglotError:
+        return {}
+    aliases = {}
+    for table in tree.find_all(exp.Table):
+        aliases[table.name] = table.name
+        if table.alias:
+            aliases[table.alias] = table.name
+    return aliases
+
+
+def find_cartesian_products(sql_query: str, dialect: Optional[str] = None) -> List[str]:
+    """
+    Find SELECTs joining tables without any predicate connecting them.
+
+    Parameters
+    ----------
+    sql_query : str
+        The query to analyze.
+    dialect : Optional[str]
+        The sqlglot dialect used to parse the query.
+
+    Returns
+    -------
+    List[str]
+        One description per cartesian product, e.g. "sales x customers".
+    """
+    try:
+        tree = sqlglot.parse_one(sql_query, read=dialect)
+    except SqlglotError:
+        return []
+
+    products = []
+    for select in tree.find_all(exp.Select):
+        sources = _get_sources(select)
+        if len(sources) < 2:
+            continue
+
+        # union-find over sources connected by a predicate
+        parent = {source: source for source in sources}
+
+        def find(source: str) -> str:
+            while parent[source] != source:
+                source = parent[source]
+            return source
+
+        predicates = [join.args.get("on") for join in select.args.get("joins") or []]
+        predicates.append(select.args.get("where"))
+        for join in select.args.get("joins") or []:
+            if join.args.get("using"):
+                # USING connects the joined table with the tables before it
+                names = list(sources)
+                joined = join.this.alias_or_name
+                for name in names[: names.index(joined)]:
+                    parent[find(name)] = find(joined)
+
+        unresolved = False
+        for predicate in filter(None, predicates):
+            for condition in predicate.find_all(exp.Binary):
+                if isinstance(condition, exp.Connector):
+                    continue
+                columns = list(condition.find_all(exp.Column))
+                if len(columns) > 1 and any(not column.table for column in columns):
+                    unresolved = True  # unqualified columns can't be attributed to a table
+                referenced = [
+                    name for name in {column.table for column in columns} if name in parent
+                ]
+                for name in referenced[1:]:
+                    parent[find(name)] = find(referenced[0])
+        if unresolved:
+            continue
+
+        groups: Dict[str, List[str]] = defaultdict(list)
+        for source in sources:
+            groups[find(source)].append(source)
+        if len(groups) > 1:
+            products.append(" x ".join(sorted(", ".join(g) for g in groups.values())))
+
+    return products
+
+
+def _get_sources(select: exp.Select) -> List[str]:
+    """Aliases (or names) of the tables/subqueries a SELECT reads from, in order."""
+    sources = []
+    from_ = select.args.get("from_") or select.args.get("from")
+    if from_ is not None:
+        expressions = from_.expressions or [from_.this]
+        sources.extend(expression.alias_or_name for expression in expressions)
+    for join in select.args.get("joins") or []:
+        sources.append(join.this.alias_or_name)
+    return [source for source in sources if source]
+
+
+def estimate_sqlite_plan(
+    plan_rows: List[Tuple[int, int, Any, str]],
+    aliases: Dict[str, str],
+    table_rows: Dict[str, Optional[int]],
+    large_table_rows: int,
+) -> Tuple[float, List[str]]:
+    """
+    Estimate the cost of a SQLite plan as the number of rows visited.
+
+    SQLite doesn't expose planner costs. Loops sharing a parent are nested, so
+    their row counts multiply: a full scan visits all rows of the table, an index
+    lookup by equality about log2(rows) and a range search a third of the table.
+
+    Parameters
+    ----------
+    plan_rows : List[Tuple[int, int, Any, str]]
+        Rows of "EXPLAIN QUERY PLAN" (id, parent, notused, detail).
+    aliases : Dict[str, str]
+        Table aliases used by the query (see "get_table_aliases").
+    table_rows : Dict[str, Optional[int]]
+        Row estimates of the tables.
+    large_table_rows : int
+        Tables with at least as many rows are reported when fully scanned.
+
+    Returns
+    -------
+    Tuple[float, List[str]]
+        The estimated cost and the large tables that are fully scanned.
+    """
+    loops: Dict[int, List[float]] = defaultdict(list)
+    full_scans = []
+
+    for _, parent, _, detail in plan_rows:
+        match = SQLITE_PLAN_STEP.match(detail)
+        if not match:
+            continue
+        operation, name, rest = match.groups()
+        table = aliases.get(name, name)
+        rows = table_rows.get(table)
+        rows = float(rows) if rows is not None else UNKNOWN_LOOP_ROWS
+
+        if operation == "SCAN":
+            if rows >= large_table_rows:
+                full_scans.append(table)
+            loops[parent].append(rows)
+        elif re.search(r"[<>]", rest):
+            loops[parent].append(max(1.0, rows / 3))
+        else:
+            loops[parent].append(max(1.0, math.log2(rows + 1)))
+
+    cost = sum(math.prod(rows) for rows in loops.values())
+    return cost, full_scans
+
+
+def analyze_postgres_plan(
+    plan: Dict[str, Any],
+    table_rows: Dict[str, Optional[int]],
+    large_table_rows: int,
+) -> Tuple[float, Optional[float], List[str], List[str]]:
+    """
+    Read cost, rows, large sequential scans and unconstrained nested loops of a plan.
+
+    Parameters
+    ----------
+    plan : Dict[str, Any]
+        The "Plan" node of "EXPLAIN (FORMAT JSON)".
+    table_rows : Dict[str, Optional[int]]
+        Row estimates of the tables.
+    large_table_rows : int
+        Tables with at least as many rows are reported when fully scanned.
+
+    Returns
+    -------
+    Tuple[float, Optional[float], List[str], List[str]]
+        Total cost, estimated rows, large tables fully scanned, cartesian joins.
+    """
+    full_scans: List[str] = []
+    cartesian: List[str] = []
+
+    def visit(node: Dict[str, Any]) -> Set[str]:
+        children = node.get("Plans", [])
+        relations = set()
+        for child in children:
+            relations |= visit(child)
+        if node.get("Relation Name"):
+            relations.add(node["Relation Name"])
+
+        if node.get("Node Type") == "Seq Scan":
+            # "Plan Rows" are the rows left after filtering, not the rows scanned
+            rows = table_rows.get(node.get("Relation Name")) or node.get("Plan Rows", 0)
+            if rows >= large_table_rows:
+                full_scans.append(node.get("Relation Name", "?"))
+        if node.get("Node Type") == "Nested Loop" and not node.get("Join Filter"):
+            # the inner side isn't parameterized by the outer one -> every pair is produced
+            if not any(_has_condition(child) for child in children):
+                cartesian.append(" x ".join(sorted(relations)))
+        return relations
+
+    visit(plan)
+    return plan.get("Total Cost", 0.0), plan.get("Plan Rows"), full_scans, cartesian
+
+
+def _has_condition(node: Dict[str, Any]) -> bool:
+    """Whether a plan node (or its descendants) filters rows by a condition."""
+    if any(key in node for key in ("Index Cond", "Recheck Cond", "Hash Cond", "Merge Cond")):
+        return True
+    return any(_has_condition(child) for child in node.get("Plans", []))
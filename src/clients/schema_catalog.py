@@ -0,0 +1,343 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.models.schemas import ColumnInfo, ForeignKeyInfo, IndexInfo, TableInfo
+
+logger = logging.getLogger(__name__)
+
+# one row per table: name, definition (table + index DDL), without sample tables
+SQLITE_SIGNATURE_QUERY = r"""
+SELECT t.name, t.sql || coalesce(
+    (SELECT group_concat(coalesce(i.sql, i.name), ';')
+     FROM sqlite_master i WHERE i.type = 'index' AND i.tbl_name = t.name), '')
+FROM sqlite_master t
+WHERE t.type = 'table' AND t.name NOT LIKE 'sqlite_%' AND t.name NOT LIKE '\_sample\_%' ESCAPE '\'
+"""
+
+# one row per table: name, catalog row identity/version, indexes, constraints, row estimate
+POSTGRES_SIGNATURE_QUERY = """
+SELECT
+    c.relname,
+    c.oid::text || ':' || c.xmin::text || ':'
+        || coalesce((SELECT string_agg(i.indexrelid::text, ',' ORDER BY i.indexrelid)
+                     FROM pg_index i WHERE i.indrelid = c.oid), '') || ':'
+        || coalesce((SELECT string_agg(con.oid::text, ',' ORDER BY con.oid)
+                     FROM pg_constraint con WHERE con.conrelid = c.oid), ''),
+    c.reltuples
+FROM pg_class c
+JOIN pg_namespace n ON n.oid = c.relnamespace
+WHERE n.nspname = :schema AND c.relkind IN ('r', 'p', 'v', 'm')
+"""
+
+
+class SchemaCatalog:
+    def __init__(
+        self,
+        cache_path: Optional[str] = None,
+        check_interval_seconds: float = 10.0,
+        schema: str = "public",
+    ):
+        """
+        Initialize a catalog of database tables (columns, keys, indexes, row estimates).
+
+        The catalog is refreshed incrementally: a cheap change check runs at most once
+        per "check_interval_seconds" and only tables whose definition changed are
+        introspected again. With "cache_path" the catalog is persisted on disk and
+        shared with other processes using the same file.
+
+        Parameters
+        ----------
+        cache_path : Optional[str]
+            Path of the JSON file the catalog is persisted to. None keeps it in memory.
+        check_interval_seconds : float
+            The minimum number of seconds between two change checks.
+        schema : str
+            The Postgres schema to read tables from.
+        """
+        self.cache_path = cache_path
+        self.check_interval_seconds = check_interval_seconds
+        self.schema = schema
+
+        self._lock = threading.Lock()
+        self._database: Optional[str] = None
+        self._tables: Dict[str, TableInfo] = {}
+        self._version: Optional[str] = None
+        self._change_token: Optional[int] = None
+        self._checked_at = float("-inf")
+        self._file_mtime: Optional[float] = None
+
+    @property
+    def version(self) -> Optional[str]:
+        """Hash of all table definitions, changes whenever the schema changes."""
+        return self._version
+
+    def get_tables(self, conn: Connection, force: bool = False) -> Dict[str, TableInfo]:
+        """
+        Get the catalog, refreshing the tables that changed since the last check.
+
+        Parameters
+        ----------
+        conn : Connection
+            The connection used to check for changes and introspect tables.
+        force : bool
+            Whether to check for changes even if the check interval has not elapsed.
+
+        Returns
+        -------
+        Dict[str, TableInfo]
+            The tables by name.
+        """
+        with self._lock:
+            database = conn.engine.url.render_as_string(hide_password=True)
+            if database != self._database:
+                self._database, self._tables, self._version = database, {}, None
+                self._change_token, self._file_mtime = None, None
+                self._checked_at = float("-inf")
+
+            if not force and time.monotonic() - self._checked_at < self.check_interval_seconds:
+                return dict(self._tables)
+
+            self._load()
+            self._refresh(conn)
+            self._checked_at = time.monotonic()
+            return dict(self._tables)
+
+    def _refresh(self, conn: Connection) -> None:
+        """Re-introspect the tables whose signature changed and drop removed tables."""
+        change_token = None
+        if conn.dialect.name == "sqlite":
+            # incremented by SQLite on every schema change
+            change_token = conn.execute(text("PRAGMA schema_version")).scalar()
+            if self._version is not None and change_token == self._change_token:
+                # tables grow without schema changes
+                self._update_row_estimates(conn, {})
+                return
+
+        signatures, row_estimates = self._get_signatures(conn)
+
+        changed = [
+            name
+            for name, signature in signatures.items()
+            if name not in self._tables or self._tables[name].signature != signature
+        ]
+        removed = set(self._tables) - set(signatures)
+        self._change_token = change_token
+        if self._version is not None and not changed and not removed:
+            self._update_row_estimates(conn, row_estimates)
+            return
+
+        inspector = inspect(conn)
+        for name in changed:
+            self._tables[name] = self._introspect_table(
+                conn, inspector, name, signatures[name]
+            )
+        for name in removed:
+            del self._tables[name]
+        self._update_row_estimates(conn, row_estimates)
+
+        self._tables = dict(sorted(self._tables.items()))
+        self._version = hashlib.sha1(
+            "\n".join(f"{t.name}={t.signature}" for t in self._tables.values()).encode()
+        ).hexdigest()
+        logger.info(
+            f"Schema catalog refreshed: {len(changed)} table(s) introspected, "
+            f"{len(removed)} removed, {len(self._tables)} in total."
+        )
+        self._store()
+
+    def _update_row_estimates(
+        self, conn: Connection, row_estimates: Dict[str, Optional[int]]
+    ) -> None:
+        """
+        Set the row estimates of all tables, re-read on every check.
+
+        The estimates aren't persisted on their own (the cache file is rewritten on
+        schema changes only), every process keeps them current in memory.
+
+        Parameters
+        ----------
+        conn : Connection
+            The connection used to estimate the rows of SQLite tables.
+        row_estimates : Dict[str, Optional[int]]
+            The estimates read with the signatures (Postgres).
+        """
+        for name, table in self._tables.items():
+            if name in row_estimates:
+                table.row_estimate = row_estimates[name]
+            elif conn.dialect.name == "sqlite":
+                table.row_estimate = self._estimate_rows(conn, name)
+
+    def _get_signatures(
+        self, conn: Connection
+    ) -> Tuple[Dict[str, str], Dict[str, Optional[int]]]:
+        """Get the definition signature of every table, plus row estimates if cheap."""
+        dialect = conn.dialect.name
+        row_estimates: Dict[str, Optional[int]] = {}
+
+        if dialect == "sqlite":
+            rows = conn.execute(text(SQLITE_SIGNATURE_QUERY)).fetchall()
+        elif dialect == "postgresql":
+            rows = []
+            for name, signature, reltuples in conn.execute(
+                text(POSTGRES_SIGNATURE_QUERY), {"schema": self.schema}
+            ):
+                rows.append((name, signature))
+                # -1 means the table was never vacuumed/analyzed
+                row_estimates[name] = int(reltuples) if reltuples >= 0 else None
+        else:
+            # no cheap change detection, a table is re-introspected only when renamed
+            rows = [(name, "") for name in inspect(conn).get_table_names()]
+
+        signatures = {
+            name: hashlib.sha1((definition or "").encode()).hexdigest()
+            for name, definition in rows
+        }
+        return signatures, row_estimates
+
+    def _introspect_table(
+        self, conn: Connection, inspector, name: str, signature: str
+    ) -> TableInfo:
+        """Read the columns, keys and indexes of a table."""
+        schema = self.schema if conn.dialect.name == "postgresql" else None
+
+        columns = [
+            ColumnInfo(
+                name=column["name"],
+                data_type=self._format_type(column["type"]),
+                nullable=column.get("nullable", True),
+            )
+            for column in inspector.get_columns(name, schema=schema)
+        ]
+        primary_key = inspector.get_pk_constraint(name, schema=schema).get(
+            "constrained_columns"
+        ) or []
+        foreign_keys = [
+            ForeignKeyInfo(
+                columns=fk["constrained_columns"],
+                referred_table=fk["referred_table"],
+                referred_columns=fk["referred_columns"],
+            )
+            for fk in inspector.get_foreign_keys(name, schema=schema)
+        ]
+        indexes = [
+            IndexInfo(
+                name=index.get("name"),
+                columns=[column for column in index["column_names"] if column],
+                unique=bool(index.get("unique")),
+            )
+            for index in inspector.get_indexes(name, schema=schema)
+        ]
+
+        return TableInfo(
+            name=name,
+            columns=columns,
+            primary_key=primary_key,
+            foreign_keys=foreign_keys,
+            indexes=indexes,
+            signature=signature,
+        )
+
+    @staticmethod
+    def _format_type(column_type) -> str:
+        """Type of a column as declared (empty if the column has no type)."""
+        try:
+            declared = str(column_type)
+        except Exception:
+            return ""
+        return "" if declared == "NULL" else declared
+
+    def _estimate_rows(self, conn: Connection, name: str) -> Optional[int]:
+        """Cheap row count estimate (SQLite only, Postgres uses pg_class.reltuples)."""
+        if conn.dialect.name != "sqlite":
+            return None
+
+        quoted = conn.dialect.identifier_preparer.quote(name)
+        try:
+            # sqlite_stat1 is filled by ANALYZE, the first number is the row count
+            stat = conn.execute(
+                text("SELECT stat FROM sqlite_stat1 WHERE tbl = :name"), {"name": name}
+            ).scalar()
+            if stat:
+                return int(stat.split()[0])
+        except SQLAlchemyError:
+            pass  # no ANALYZE run yet
+
+        try:
+            # max(rowid) is read from the end of the b-tree, no table scan
+            return conn.execute(text(f"SELECT max(rowid) FROM {quoted}")).scalar() or 0
+        except SQLAlchemyError:
+            return None  # WITHOUT ROWID table or view
+
+    def _load(self) -> None:
+        """Load the catalog persisted by another process if the file changed."""
+        if not self.cache_path:
+            return
+
+        try:
+            mtime = os.stat(self.cache_path).st_mtime
+            if mtime == self._file_mtime:
+                return
+            with open(self.cache_path, "r") as file:
+                entry = json.load(file).get(self._database)
+        except (OSError, ValueError):
+            return
+
+        self._file_mtime = mtime
+        if not entry:
+            return
+        try:
+            self._tables = {
+                name: TableInfo.model_validate(table)
+                for name, table in entry["tables"].items()
+            }
+            self._version = entry["version"]
+            self._change_token = entry.get("change_token")
+        except (KeyError, ValueError) as e:
+            logger.warning(f"Ignoring invalid schema catalog cache: {str(e)}")
+
+    def _store(self) -> None:
+        """Persist the catalog on disk (atomic replace of the cache file)."""
+        if not self.cache_path:
+            return
+
+        try:
+            with open(self.cache_path, "r") as file:
+                cache = json.load(file)
+        except (OSError, ValueError):
+            cache = {}
+
+        cache[self._database] = {
+            "version": self._version,
+            "change_token": self._change_token,
+            "tables": {
+                name: table.model_dump() for name, table in self._tables.items()
+            },
+        }
+        directory = os.path.dirname(self.cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(cache, file)
+        os.replace(tmp_path, self.cache_path)
+        self._file_mtime = os.stat(self.cache_path).st_mtime
+
+
+def to_schema_dict(tables: Dict[str, TableInfo]) -> Dict[str, List[Dict[str, str]]]:
+    """Convert catalog tables to the {table: [{column_name, data_type}]} schema shape."""
+    return {
+        name: [
+            {"column_name": column.name, "data_type": column.data_type}
+            for column in table.columns
+        ]
+        for name, table in tables.items()
+    }
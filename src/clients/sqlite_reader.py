@@ -0,0 +1,215 @@
+import logging
+import math
+import sqlite3
+from array import array
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import sqlglot
+from sqlglot import exp
+from sqlglot.errors import SqlglotError
+
+from src.clients.query_plan import get_table_aliases
+from src.models.schemas import TableInfo
+
+logger = logging.getLogger(__name__)
+
+# rows fetched from the cursor at once
+FETCH_SIZE = 10_000
+
+
+def get_type_affinity(declared_type: Optional[str]) -> Optional[str]:
+    """
+    Map a declared SQLite column type to a buffer kind (SQLite type affinity rules).
+
+    Parameters
+    ----------
+    declared_type : Optional[str]
+        The declared type, e.g. "INTEGER", "VARCHAR(50)", "DOUBLE PRECISION".
+
+    Returns
+    -------
+    Optional[str]
+        "int", "float", "object", or None if the type is unknown (inferred from data).
+    """
+    if not declared_type:
+        return None
+    declared_type = declared_type.upper()
+    if "INT" in declared_type:
+        return "int"
+    if any(name in declared_type for name in ("CHAR", "CLOB", "TEXT", "BLOB")):
+        return "object"
+    if any(name in declared_type for name in ("REAL", "FLOA", "DOUB")):
+        return "float"
+    return None  # NUMERIC affinity can hold anything
+
+
+def get_declared_types(
+    sql_query: str, tables: Dict[str, TableInfo], dialect: str = "sqlite"
+) -> Dict[str, str]:
+    """
+    Find the declared type of the result columns that are plain table columns.
+
+    Parameters
+    ----------
+    sql_query : str
+        The query whose result columns are typed.
+    tables : Dict[str, TableInfo]
+        The schema catalog.
+    dialect : str
+        The sqlglot dialect of the query.
+
+    Returns
+    -------
+    Dict[str, str]
+        Declared type by result column name (ambiguous names are left out).
+    """
+    try:
+        tree = sqlglot.parse_one(sql_query, read=dialect)
+    except SqlglotError:
+        return {}
+
+    referenced = {name for name in get_table_aliases(sql_query, dialect).values()}
+    types_by_name = defaultdict(set)
+    for name in referenced & set(tables):
+        for column in tables[name].columns:
+            types_by_name[column.name].add(column.data_type)
+
+    declared = {
+        name: next(iter(types)) for name, types in types_by_name.items() if len(types) == 1
+    }
+    # "s.price AS revenue" keeps the type of "price"
+    for projection in getattr(tree, "expressions", []):
+        if isinstance(projection, exp.Alias) and isinstance(projection.this, exp.Column):
+            source_type = declared.get(projection.this.name)
+            if source_type:
+                declared[projection.alias] = source_type
+    return declared
+
+
+class _ColumnBuffer:
+    """Growable typed buffer of a result column (array-backed for numbers)"""
+
+    def __init__(self, kind: Optional[str]):
+        self.kind = kind
+        self.values: Any = self._new_buffer(kind)
+
+    @staticmethod
+    def _new_buffer(kind: Optional[str]) -> Any:
+        if kind == "int":
+            return array("q")
+        if kind == "float":
+            return array("d")
+        return []
+
+    def extend(self, values: Sequence[Any]) -> None:
+        if self.kind is None:
+            self.kind = self._infer_kind(values)
+            self.values = self._new_buffer(self.kind)
+        size = len(self.values)
+        try:
+            self.values.extend(values)  # C loop over the batch, no per-value Python code
+        except (TypeError, OverflowError):
+            del self.values[size:]  # values before the failing one were appended
+            self._extend_slow(values)
+
+    @staticmethod
+    def _infer_kind(values: Sequence[Any]) -> Optional[str]:
+        """Kind of the first non-NULL value (None keeps the column untyped)."""
+        for value in values:
+            if value is None:
+                continue
+            if isinstance(value, int):
+                return "int"
+            if isinstance(value, float):
+                return "float"
+            return "object"
+        return None
+
+    def _extend_slow(self, values: Sequence[Any]) -> None:
+        """Handle NULLs and values that don't fit the column kind (demote the column)."""
+        if self.kind is None:
+            self.values.extend(values)  # all NULL so far
+            return
+
+        numeric = all(value is None or isinstance(value, (int, float)) for value in values)
+        if self.kind == "int" and numeric and all(
+            value is None or isinstance(value, float) or -(2**63) <= value < 2**63
+            for value in values
+        ):
+            # NULLs/reals in an integer column -> float64 with NaN (like pandas)
+            self.kind, self.values = "float", array("d", self.values)
+        if self.kind == "float" and numeric:
+            self.values.extend(math.nan if value is None else value for value in values)
+            return
+
+        # mixed types (SQLite is dynamically typed) -> Python objects
+        if self.kind != "object":
+            self.values = list(self.values)
+            self.kind = "object"
+        self.values.extend(values)
+
+    def to_numpy(self, row_count: int) -> np.ndarray:
+        if self.kind == "int":
+            return np.frombuffer(self.values, dtype=np.int64)  # zero-copy view
+        if self.kind == "float":
+            return np.frombuffer(self.values, dtype=np.float64)
+        column = np.empty(row_count, dtype=object)
+        column[:] = self.values if self.values else [None] * row_count
+        return column
+
+
+def read_sqlite_query(
+    connection: sqlite3.Connection,
+    sql_query: str,
+    declared_types: Optional[Dict[str, str]] = None,
+    fetch_size: int = FETCH_SIZE,
+) -> Tuple[List[str], Dict[str, np.ndarray], int]:
+    """
+    Execute a query on a raw sqlite3 connection and read the result column by column.
+
+    Rows are fetched in batches with "fetchmany" and appended to typed buffers:
+    integer and real columns go to "array" buffers exposed to NumPy without a copy,
+    other columns are kept as Python objects. Columns holding NULLs or mixed
+    types are demoted (integer -> float64 with NaN -> object).
+
+    Parameters
+    ----------
+    connection : sqlite3.Connection
+        The raw DBAPI connection.
+    sql_query : str
+        The query to execute.
+    declared_types : Optional[Dict[str, str]]
+        Declared type by result column name (see "get_declared_types"). Other
+        columns are typed from their first non-NULL value.
+    fetch_size : int
+        The number of rows fetched at once.
+
+    Returns
+    -------
+    Tuple[List[str], Dict[str, np.ndarray], int]
+        The column names, the columns and the number of rows.
+    """
+    declared_types = declared_types or {}
+    cursor = connection.cursor()
+    try:
+        cursor.execute(sql_query)
+        if cursor.description is None:
+            return [], {}, 0
+
+        names = [description[0] for description in cursor.description]
+        buffers = [_ColumnBuffer(get_type_affinity(declared_types.get(name))) for name in names]
+        row_count = 0
+        while True:
+            rows = cursor.fetchmany(fetch_size)
+            if not rows:
+                break
+            row_count += len(rows)
+            for buffer, values in zip(buffers, zip(*rows)):
+                buffer.extend(values)
+    finally:
+        cursor.close()
+
+    columns = {name: buffer.to_numpy(row_count) for name, buffer in zip(names, buffers)}
+    return names, columns, row_count
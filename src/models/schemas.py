@@ -1,6 +1,8 @@
+from collections.abc import Sequence
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 
 class ValidationResult(BaseModel):
@@ -10,11 +12,137 @@ class ValidationResult(BaseModel):
     suggestion: Optional[str]
 
 
+def _to_python(value: Any) -> Any:
+    """Convert NumPy scalars into plain Python values."""
+    if isinstance(value, np.datetime64):
+        return None if np.isnat(value) else value.astype("datetime64[us]").item()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+class RowView(Sequence):
+    """Read-only list of row dicts built lazily from columnar data."""
+
+    def __init__(self, columns: Dict[str, np.ndarray], row_count: int):
+        self._columns = columns
+        self._row_count = row_count
+
+    def __len__(self) -> int:
+        return self._row_count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(self._row_count))]
+        if index < 0:
+            index += self._row_count
+        if not 0 <= index < self._row_count:
+            raise IndexError("row index out of range")
+        return self._row(index)
+
+    def _row(self, index: int) -> Dict[str, Any]:
+        return {name: _to_python(col[index]) for name, col in self._columns.items()}
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Sequence):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"RowView(rows={self._row_count}, columns={list(self._columns)})"
+
+
 class QueryResult(BaseModel):
-    data: List[Dict[str, Any]]
+    """Query results stored column by column (one NumPy array per column)"""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    columns: Dict[str, np.ndarray] = Field(default_factory=dict)
     row_count: int
     column_names: List[str]
     execution_time_ms: float
+    # streamed results keep only a sample of rows in "columns", plus aggregates over all rows
+    column_stats: Dict[str, Dict[str, float]] = Field(default_factory=dict)
+    truncated: bool = False  # result was cut at the configured row/byte cap
+    # approximate results are computed on a uniform sample of the largest table
+    is_approximate: bool = False
+    sample_fraction: Optional[float] = None
+    error_bounds: Dict[str, np.ndarray] = Field(default_factory=dict)  # 95% CI half-widths
+
+    @model_validator(mode="before")
+    @classmethod
+    def _records_to_columns(cls, values: Any) -> Any:
+        """Accept row records (data=[{...}, ...]) and store them column by column."""
+        if isinstance(values, dict) and "data" in values:
+            values = dict(values)
+            records = values.pop("data")
+            names = values.get("column_names") or (list(records[0]) if records else [])
+            columns = {}
+            for name in names:
+                column = np.empty(len(records), dtype=object)
+                column[:] = [record.get(name) for record in records]
+                columns[name] = column
+            values.setdefault("columns", columns)
+        return values
+
+    @classmethod
+    def from_dataframe(cls, df: Any, execution_time_ms: float) -> "QueryResult":
+        """Build the result from a DataFrame without copying numeric columns."""
+        return cls(
+            columns={name: df.iloc[:, i].to_numpy() for i, name in enumerate(df.columns)},
+            row_count=df.shape[0],
+            column_names=df.columns.tolist(),
+            execution_time_ms=execution_time_ms,
+        )
+
+    @property
+    def data(self) -> RowView:
+        """Rows (or the sample of rows) as dicts, materialized only when accessed."""
+        stored_rows = len(next(iter(self.columns.values()), ()))
+        return RowView(self.columns, min(stored_rows, self.row_count))
+
+
+class ColumnInfo(BaseModel):
+    name: str
+    data_type: str
+    nullable: bool = True
+
+
+class ForeignKeyInfo(BaseModel):
+    columns: List[str]
+    referred_table: str
+    referred_columns: List[str]
+
+
+class IndexInfo(BaseModel):
+    name: Optional[str] = None
+    columns: List[str]
+    unique: bool = False
+
+
+class TableInfo(BaseModel):
+    """Catalog entry of a database table"""
+
+    name: str
+    columns: List[ColumnInfo] = Field(default_factory=list)
+    primary_key: List[str] = Field(default_factory=list)
+    foreign_keys: List[ForeignKeyInfo] = Field(default_factory=list)
+    indexes: List[IndexInfo] = Field(default_factory=list)
+    row_estimate: Optional[int] = None
+    signature: str = ""  # changes whenever the table definition changes
+
+
+class QueryPlanEstimate(BaseModel):
+    """Estimated cost of a query read from the database execution plan"""
+
+    # planner cost units on Postgres, rows visited on SQLite
+    estimated_cost: float
+    estimated_rows: Optional[float] = None
+    full_scans: List[str] = Field(default_factory=list)  # large tables scanned entirely
+    cartesian_products: List[str] = Field(default_factory=list)
+    is_acceptable: bool = True
+    reasons: List[str] = Field(default_factory=list)  # why the query was rejected
+    plan: str = ""
 
 
 class BusinessInsight(BaseModel):
@@ -29,6 +157,19 @@ class JiraTicket(BaseModel):
     description: str
     status: str
     assignee: Optional[str] = None
+    project_key: Optional[str] = None
+    issue_type: Optional[str] = None
+    labels: List[str] = Field(default_factory=list)
+    components: List[str] = Field(default_factory=list)
+
+
+class TicketRunSummary(BaseModel):
+    """Outcome of processing a single ticket"""
+
+    ticket_id: str
+    succeeded: bool
+    wall_time_ms: float
+    error: Optional[str] = None
 
 
 class AgentState(BaseModel):
@@ -41,4 +182,7 @@ class AgentState(BaseModel):
     query_result: Optional[QueryResult] = None
     business_insight: Optional[str] = None
     error_message: Optional[str] = None
+    error_type: Optional[str] = None  # "timeout", "cancelled", "execution" or "cost"
+    deadline: Optional[float] = None  # time.monotonic() after which the ticket is abandoned
+    query_plan: Optional[QueryPlanEstimate] = None
     retry_count: int = 0
@@ -23,12 +23,36 @@ class InsightTool:
         summary = f"Total rows: {query_result.row_count}\n"
         summary += f"Columns: {', '.join(query_result.column_names)}\n\n"
 
+        if query_result.is_approximate:
+            summary += (
+                f"Note: the results are approximate, computed on a "
+                f"{query_result.sample_fraction:.2%} uniform sample. Error bounds are "
+                f"half-widths of 95% confidence intervals.\n\n"
+            )
+
+        if query_result.truncated:
+            summary += "Note: the result was truncated at the configured row/byte limit.\n\n"
+
+        # Include aggregates over all rows (available for streamed results)
+        if query_result.column_stats:
+            summary += "Column statistics (all rows):\n"
+            for name, stats in query_result.column_stats.items():
+                summary += (
+                    f"{name}: count={stats['count']:.0f}, sum={stats['sum']:.4g}, "
+                    f"min={stats['min']:.4g}, max={stats['max']:.4g}, mean={stats['mean']:.4g}\n"
+                )
+            summary += "\n"
+
         # Include sample data (up to 10 rows)
         data_sample = query_result.data[:10]
         if data_sample:
             summary += "Data sample:\n"
-            for row in data_sample:
-                summary += str(row) + "\n"
+            for i, row in enumerate(data_sample):
+                bounds = {
+                    name: f"±{float(bound[i]):.4g}"
+                    for name, bound in query_result.error_bounds.items()
+                }
+                summary += str(row) + (f" error bounds: {bounds}" if bounds else "") + "\n"
 
         return summary
 
@@ -48,7 +72,15 @@ class InsightTool:
             response = self.llm.invoke(prompt_value)
 
             if hasattr(response, "content"):
-                return response.content.strip()
+                insight = response.content.strip()
+                if query_result.is_approximate:
+                    insight += (
+                        f"\n\nNote: this answer is approximate. It was computed on a "
+                        f"{query_result.sample_fraction:.2%} random sample of the data, "
+                        f"figures may deviate from the exact values within the stated "
+                        f"95% error bounds."
+                    )
+                return insight
             else:
                 logger.error(f"Empty response from LLM")
 
@@ -0,0 +1,267 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Optional
+
+from langchain_core.messages import AIMessage
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(
+    model: Any, temperature: Any, max_tokens: Any, prompt: str, **kwargs
+) -> str:
+    """Hash of everything that determines an LLM response."""
+    payload = json.dumps(
+        {
+            "model": model,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "prompt": prompt,
+            **kwargs,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def get_prompt_text(prompt: Any) -> str:
+    """Text of a prompt passed to "invoke" (string, prompt value or messages)."""
+    if isinstance(prompt, str):
+        return prompt
+    if hasattr(prompt, "to_string"):
+        return prompt.to_string()
+    if isinstance(prompt, (list, tuple)):
+        return "\n".join(
+            f"{getattr(message, 'type', '')}: {getattr(message, 'content', message)}"
+            for message in prompt
+        )
+    return str(prompt)
+
+
+class LLMResponseCache:
+    """
+    Exact-match cache of LLM responses by model, sampling parameters and prompt.
+
+    Responses are kept in an in-memory LRU of "max_entries" and, if a path is given,
+    in a SQLite file shared between runs and processes, evicted least recently used
+    beyond "max_persistent_entries". Hits and misses are counted by tool.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: int = 1024,
+        max_persistent_entries: int = 100_000,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_persistent_entries = max_persistent_entries
+
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+        # hits/misses by tool, hits served by the persistent tier
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"hits": 0, "misses": 0}
+        )
+        self.persistent_hits = 0
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """Connection to the persistent tier (created on first use)."""
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_responses ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+                "last_used_at REAL NOT NULL)"
+            )
+            conn.commit()
+            self._connection = conn
+        return self._connection
+
+    def get(self, key: str, tool: str = "default") -> Optional[str]:
+        """
+        Get a cached response.
+
+        Parameters
+        ----------
+        key : str
+            The cache key (see "make_cache_key").
+        tool : str
+            The tool asking, for the hit rate statistics.
+
+        Returns
+        -------
+        Optional[str]
+            The cached response or None.
+        """
+        with self._lock:
+            response = self._entries.get(key)
+            if response is not None:
+                self._entries.move_to_end(key)
+            elif self.path:
+                row = self._conn.execute(
+                    "SELECT response FROM llm_responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    response = row[0]
+                    self._conn.execute(
+                        "UPDATE llm_responses SET last_used_at = ? WHERE key = ?",
+                        (time.time(), key),
+                    )
+                    self._conn.commit()
+                    self._remember(key, response)
+                    self.persistent_hits += 1
+
+            self._stats[tool]["hits" if response is not None else "misses"] += 1
+            return response
+
+    def put(self, key: str, response: str) -> None:
+        """
+        Store a response in memory and in the persistent tier.
+
+        Parameters
+        ----------
+        key : str
+            The cache key (see "make_cache_key").
+        response : str
+            The response text.
+        """
+        with self._lock:
+            self._remember(key, response)
+            if not self.path:
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses VALUES (?, ?, ?)",
+                (key, response, time.time()),
+            )
+            # least recently used entries beyond the size bound
+            self._conn.execute(
+                "DELETE FROM llm_responses WHERE key IN (SELECT key FROM llm_responses "
+                "ORDER BY last_used_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_persistent_entries,),
+            )
+            self._conn.commit()
+
+    def invalidate_response(self, response: str) -> int:
+        """
+        Remove the entries answering a response that turned out to be wrong.
+
+        Parameters
+        ----------
+        response : str
+            The response (surrounding whitespace is ignored).
+
+        Returns
+        -------
+        int
+            The number of entries removed.
+        """
+        response = response.strip()
+        with self._lock:
+            keys = [
+                key for key, cached in self._entries.items() if cached.strip() == response
+            ]
+            for key in keys:
+                del self._entries[key]
+            if not self.path:
+                return len(keys)
+            # whitespace as stripped by Python (space, tab, newlines)
+            removed = self._conn.execute(
+                "DELETE FROM llm_responses "
+                "WHERE trim(response, ' ' || char(9, 10, 13)) = ?",
+                (response,),
+            ).rowcount
+            self._conn.commit()
+            return max(len(keys), removed)
+
+    def _remember(self, key: str, response: str) -> None:
+        """Add a response to the in-memory LRU (called with the lock held)."""
+        self._entries[key] = response
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics for monitoring.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Hits, misses and hit rate overall and by tool, hits served by the
+            persistent tier and number of responses in memory.
+        """
+        with self._lock:
+            tools = {}
+            for tool, stats in self._stats.items():
+                lookups = stats["hits"] + stats["misses"]
+                tools[tool] = {
+                    **stats,
+                    "hit_rate": stats["hits"] / lookups if lookups else 0.0,
+                }
+            hits = sum(stats["hits"] for stats in tools.values())
+            lookups = hits + sum(stats["misses"] for stats in tools.values())
+            return {
+                "hits": hits,
+                "misses": lookups - hits,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "persistent_hits": self.persistent_hits,
+                "entries": len(self._entries),
+                "tools": tools,
+            }
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+class CachedLLM:
+    """LLM wrapper answering identical prompts from an LLMResponseCache."""
+
+    def __init__(self, llm: Any, cache: LLMResponseCache, tool: str):
+        self.llm = llm
+        self.cache = cache
+        self.tool = tool
+
+    def forget_response(self, response: str) -> None:
+        """Stop answering prompts with a response that failed (e.g. rejected SQL)."""
+        if self.cache.invalidate_response(response):
+            logger.info(f"Invalidated cached LLM response of {self.tool}")
+
+    def invoke(self, prompt: Any, *args, **kwargs) -> Any:
+        model = getattr(self.llm, "model_name", None) or getattr(self.llm, "model", None)
+        key = make_cache_key(
+            model=model,
+            temperature=getattr(self.llm, "temperature", None),
+            max_tokens=getattr(self.llm, "max_tokens", None),
+            prompt=get_prompt_text(prompt),
+            args=args,
+            **kwargs,
+        )
+        cached = self.cache.get(key, tool=self.tool)
+        if cached is not None:
+            logger.info(f"LLM response of {self.tool} served from cache")
+            return AIMessage(content=cached)
+
+        response = self.llm.invoke(prompt, *args, **kwargs)
+        content = getattr(response, "content", None)
+        if isinstance(content, str) and content:
+            self.cache.put(key, content)
+        return response
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.llm, name)
@@ -37,15 +37,11 @@ Recommendations:
 - ...
 """
 
+# instructions and schema come first: they form a prefix shared by all tickets that
+# the provider can cache, only the request changes between calls
 SQL_GENERATION_TEMPLATE = """
 You are an expert SQL writer who helps generate safe and efficient SQL queries.
 
-DATABASE SCHEMA:
-{schema}
-
-USER REQUEST: 
-{task_description}
-
 Write a SQL query that fulfills the user's request. The query should be:
 1. Safe and well-formed
 2. Efficient
@@ -53,6 +49,31 @@ Write a SQL query that fulfills the user's request. The query should be:
 4. Include appropriate JOINs, WHERE clauses, and aggregations as needed
 
 Return ONLY the executable SQL query without any explanations, comments, or markdown formatting.
+
+DATABASE SCHEMA:
+{schema}
+"""
+
+SQL_TASK_TEMPLATE = """USER REQUEST:
+{task_description}
+"""
+
+# tables selected for the request, after the shared prefix so it stays cacheable
+SQL_TABLES_HINT_TEMPLATE = """RELEVANT TABLES (most likely needed, join others only if required):
+{tables}
+"""
+
+# appended to the request when regenerating a query that failed, the errors make the
+# retry differ from the attempt that produced the failing query
+SQL_REPAIR_TEMPLATE = """
+PREVIOUS QUERY:
+{previous_sql}
+
+The previous query failed with the following errors:
+{error_feedback}
+
+Fix the previous query so that it fulfills the user's request and avoids these errors.
+Return ONLY the corrected executable SQL query without any explanations, comments, or markdown formatting.
 """
 
 VALIDATION_PROMPT = """
@@ -0,0 +1,235 @@
+import logging
+import math
+import re
+from collections import Counter, deque
+from typing import Any, Dict, List, Optional
+
+from src.models.schemas import TableInfo
+
+logger = logging.getLogger(__name__)
+
+# BM25 parameters (term frequency saturation, document length normalization)
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# characters of a sample value kept in the index
+MAX_SAMPLE_VALUE_LENGTH = 50
+
+# the table name counts as many times in its document (foreign key columns of the
+# tables joined to it repeat the name too)
+TABLE_NAME_BOOST = 3
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase words of a text with plurals reduced ("sales_records" -> sale, record)."""
+    tokens = []
+    for word in re.findall(r"[a-z0-9]+", text.lower()):
+        if len(word) > 3 and word.endswith("ies"):
+            word = word[:-3] + "y"
+        elif len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        tokens.append(word)
+    return tokens
+
+
+class SchemaRetriever:
+    """
+    Selects the tables relevant to a task with a BM25 index over the schema.
+
+    Every table is a document made of its name, its column names and types, sample
+    values of its text columns and the names of the tables it is joined to by
+    foreign keys. The top-k tables are completed with the tables on the foreign key
+    paths joining them, so the pruned schema can still express the joins.
+    """
+
+    def __init__(
+        self,
+        tables: Dict[str, TableInfo],
+        sample_values: Optional[Dict[str, List[str]]] = None,
+        top_k: int = 5,
+    ):
+        self.tables = tables
+        self.top_k = top_k
+
+        # undirected foreign key graph
+        self.neighbours: Dict[str, set] = {name: set() for name in tables}
+        for name, table in tables.items():
+            for foreign_key in table.foreign_keys:
+                if foreign_key.referred_table in self.neighbours:
+                    self.neighbours[name].add(foreign_key.referred_table)
+                    self.neighbours[foreign_key.referred_table].add(name)
+
+        sample_values = sample_values or {}
+        self.documents: Dict[str, Counter] = {}
+        for name, table in tables.items():
+            text = " ".join(
+                [name] * TABLE_NAME_BOOST
+                + [f"{column.name} {column.data_type}" for column in table.columns]
+                + sample_values.get(name, [])
+                + sorted(self.neighbours[name])
+            )
+            self.documents[name] = Counter(tokenize(text))
+
+        self.average_length = (
+            sum(sum(document.values()) for document in self.documents.values())
+            / max(1, len(self.documents))
+        )
+        document_frequency = Counter(
+            token for document in self.documents.values() for token in document
+        )
+        self.idf = {
+            token: math.log(1 + (len(self.documents) - count + 0.5) / (count + 0.5))
+            for token, count in document_frequency.items()
+        }
+
+    @classmethod
+    def from_database(
+        cls, db_client: Any, top_k: int = 5, sample_values_per_column: int = 5
+    ) -> "SchemaRetriever":
+        """
+        Build the index from the schema catalog and sample values of a database.
+
+        Parameters
+        ----------
+        db_client : Any
+            The database client (see "DatabaseClient.get_schema_catalog").
+        top_k : int
+            The number of tables selected by relevance.
+        sample_values_per_column : int
+            Distinct values of every text column added to the index (0 disables it).
+
+        Returns
+        -------
+        SchemaRetriever
+            The retriever.
+        """
+        tables = db_client.get_schema_catalog()
+        sample_values: Dict[str, List[str]] = {}
+        if sample_values_per_column > 0:
+            try:
+                # statistics or a bounded read per table, never a full scan
+                column_values = db_client.get_column_values(
+                    tables, values_per_column=sample_values_per_column
+                )
+            except Exception as e:
+                logger.warning(f"Unable to sample column values: {str(e)}")
+                column_values = {}
+            sample_values = {
+                name: [
+                    str(value)[:MAX_SAMPLE_VALUE_LENGTH]
+                    for values in columns.values()
+                    for value in values
+                ]
+                for name, columns in column_values.items()
+            }
+        return cls(tables=tables, sample_values=sample_values, top_k=top_k)
+
+    def score(self, task_description: str) -> Dict[str, float]:
+        """BM25 score of every table for a task."""
+        query = set(tokenize(task_description))
+        scores = {}
+        for name, document in self.documents.items():
+            length = sum(document.values())
+            score = 0.0
+            for token in query & document.keys():
+                frequency = document[token]
+                score += self.idf[token] * (
+                    frequency
+                    * (BM25_K1 + 1)
+                    / (
+                        frequency
+                        + BM25_K1
+                        * (1 - BM25_B + BM25_B * length / self.average_length)
+                    )
+                )
+            scores[name] = score
+        return scores
+
+    def retrieve(self, task_description: str) -> List[str]:
+        """
+        Select the tables relevant to a task.
+
+        Parameters
+        ----------
+        task_description : str
+            The task (ticket description).
+
+        Returns
+        -------
+        List[str]
+            The top-k tables by relevance followed by the tables joining them, empty
+            if no table is relevant.
+        """
+        scores = self.score(task_description)
+        ranked = sorted(
+            (name for name, score in scores.items() if score > 0),
+            key=lambda name: -scores[name],
+        )[: self.top_k]
+        if not ranked:
+            return []
+
+        # connect every table to the ones selected before it (shortest FK path)
+        selected = [ranked[0]]
+        for name in ranked[1:]:
+            for table in self._get_join_path(name, set(selected)):
+                if table not in selected:
+                    selected.append(table)
+        return selected
+
+    def _get_join_path(self, source: str, targets: set) -> List[str]:
+        """Tables on the shortest foreign key path from a table to any of the targets."""
+        previous: Dict[str, Optional[str]] = {source: None}
+        queue = deque([source])
+        while queue:
+            table = queue.popleft()
+            if table in targets:
+                path = []
+                while table is not None:
+                    path.append(table)
+                    table = previous[table]
+                return path
+            for neighbour in sorted(self.neighbours[table]):
+                if neighbour not in previous:
+                    previous[neighbour] = table
+                    queue.append(neighbour)
+        return [source]  # not joinable, the table is kept on its own
+
+    def get_schema(
+        self, task_description: str
+    ) -> Optional[Dict[str, List[Dict[str, str]]]]:
+        """
+        Get the pruned schema of a task.
+
+        Parameters
+        ----------
+        task_description : str
+            The task (ticket description).
+
+        Returns
+        -------
+        Optional[Dict[str, List[Dict[str, str]]]]
+            The schema of the relevant tables as {table: [{column_name, data_type,
+            references}]}, None if the full schema has to be used.
+        """
+        selected = self.retrieve(task_description)
+        if not selected or len(selected) >= len(self.tables):
+            return None
+
+        schema = {}
+        for name in selected:
+            references = {
+                column: f"{foreign_key.referred_table}.{referred}"
+                for foreign_key in self.tables[name].foreign_keys
+                if foreign_key.referred_table in selected
+                for column, referred in zip(
+                    foreign_key.columns, foreign_key.referred_columns
+                )
+            }
+            schema[name] = []
+            for column in self.tables[name].columns:
+                column_info = {"column_name": column.name, "data_type": column.data_type}
+                if column.name in references:
+                    column_info["references"] = references[column.name]
+                schema[name].append(column_info)
+        logger.info(f"Schema pruned to {len(schema)} of {len(self.tables)} tables")
+        return schema
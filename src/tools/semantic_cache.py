@@ -0,0 +1,267 @@
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.tools.schema_retriever import tokenize
+
+logger = logging.getLogger(__name__)
+
+# dimensions of the local hashed embeddings
+HASHING_DIMENSIONS = 1024
+
+# literals that change the meaning of a request but hardly its embedding: quoted
+# values, numbers and dates ("2023", "Q2", "2024-01-31", "0.5") and month names
+LITERAL_PATTERN = re.compile(
+    r"'[^']*'|\"[^\"]*\"|\d+(?:[.,:/-]\d+)*|\b(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|"
+    r"apr(?:il)?|may|june?|july?|aug(?:ust)?|sept?(?:ember)?|oct(?:ober)?|nov(?:ember)?|"
+    r"dec(?:ember)?)\b",
+    re.IGNORECASE,
+)
+
+
+# words that don't change what a task asks for, as tokenized ("does" -> "doe")
+STOPWORDS = set(
+    "a an and are as at be by can could do doe for from give i in is it list me of "
+    "on our please show that the their thi to us we what which with would you".split()
+)
+
+
+def extract_literals(text: str) -> List[str]:
+    """Sorted literals of a task, SQL is reused only for tasks with the same ones."""
+    return sorted(literal.lower() for literal in LITERAL_PATTERN.findall(text))
+
+
+def extract_terms(text: str) -> Set[str]:
+    """Words of a task except stopwords ("highest" vs "lowest" needs other SQL)."""
+    return set(tokenize(text)) - STOPWORDS
+
+
+class HashingEmbeddings:
+    """
+    Local embeddings: hashed bag of words and word bigrams (no model, no network).
+
+    Implements "embed_query" of the LangChain Embeddings interface, any LangChain
+    embeddings (e.g. OpenAIEmbeddings) can be used instead for better paraphrase
+    matching.
+    """
+
+    def __init__(self, dimensions: int = HASHING_DIMENSIONS):
+        self.dimensions = dimensions
+
+    def embed_query(self, text: str) -> List[float]:
+        tokens = tokenize(text)
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        vector = np.zeros(self.dimensions)
+        for feature in features:
+            hashed = zlib.crc32(feature.encode())
+            # the sign bit limits the bias of colliding features
+            vector[hashed % self.dimensions] += 1.0 if hashed & (1 << 31) else -1.0
+        return vector.tolist()
+
+
+class SemanticCache:
+    """
+    Cache of validated and successfully executed SQL by task description.
+
+    A task is embedded and compared (cosine similarity) with the tasks answered
+    before on the same schema version, the SQL of the most similar one is reused if
+    the similarity reaches the threshold and both tasks name the same literals
+    (numbers, dates, quoted values). Entries are stored in a SQLite file shared
+    between runs and evicted least recently used beyond "max_entries".
+
+    The hashed embeddings used without an embedding model score tasks differing by
+    a single word (e.g. "highest" vs "lowest") above any usable threshold, so they
+    only find tasks with the same words apart from stopwords, case, plurals, word
+    order and punctuation. Paraphrases need a real embedding model.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        embeddings: Optional[Any] = None,
+        similarity_threshold: float = 0.95,
+        max_entries: int = 5000,
+    ):
+        self.path = path
+        self.embeddings = embeddings or HashingEmbeddings()
+        # hashed embeddings can't tell meaning-changing words apart
+        self.require_same_terms = embeddings is None
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+        # embeddings by schema version loaded in memory (reloaded after writes)
+        self._index: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._data_version: Optional[int] = None
+
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """Connection to the cache file (created on first use)."""
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS semantic_cache ("
+                "id INTEGER PRIMARY KEY, schema_version TEXT NOT NULL, "
+                "task TEXT NOT NULL, sql TEXT NOT NULL, embedding BLOB NOT NULL, "
+                "last_used_at REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0, "
+                "UNIQUE (schema_version, task))"
+            )
+            conn.commit()
+            self._connection = conn
+        return self._connection
+
+    def _embed(self, task: str) -> np.ndarray:
+        vector = np.asarray(self.embeddings.embed_query(task), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _get_index(self, schema_version: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Ids and normalized embeddings of the entries of a schema version."""
+        # changes when another connection (process) commits to the file
+        data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version != self._data_version:
+            self._index, self._data_version = {}, data_version
+
+        if schema_version not in self._index:
+            rows = self._conn.execute(
+                "SELECT id, embedding FROM semantic_cache WHERE schema_version = ?",
+                (schema_version,),
+            ).fetchall()
+            ids = np.array([row[0] for row in rows], dtype=np.int64)
+            vectors = (
+                np.stack([np.frombuffer(row[1], dtype=np.float32) for row in rows])
+                if rows
+                else np.empty((0, 0), dtype=np.float32)
+            )
+            self._index[schema_version] = (ids, vectors)
+        return self._index[schema_version]
+
+    def get(self, task: str, schema_version: str) -> Optional[str]:
+        """
+        Get the SQL of the most similar task answered on the schema version.
+
+        Parameters
+        ----------
+        task : str
+            The task description.
+        schema_version : str
+            The version of the schema the SQL has to run on.
+
+        Returns
+        -------
+        Optional[str]
+            The SQL, None if no task is similar enough.
+        """
+        vector = self._embed(task)
+        with self._lock:
+            ids, vectors = self._get_index(schema_version)
+            if len(ids) == 0 or vectors.shape[1] != len(vector):
+                self.misses += 1
+                return None
+
+            similarities = vectors @ vector
+            literals = extract_literals(task)
+            terms = extract_terms(task) if self.require_same_terms else None
+            # most similar first, a task with other literals needs other SQL
+            match = None
+            for best in np.argsort(-similarities):
+                if similarities[best] < self.similarity_threshold:
+                    break
+                entry_id = int(ids[best])
+                entry = self._conn.execute(
+                    "SELECT sql, task FROM semantic_cache WHERE id = ?", (entry_id,)
+                ).fetchone()
+                if entry is None:  # evicted in the meantime
+                    self._index.pop(schema_version, None)
+                    continue
+                if extract_literals(entry[1]) != literals:
+                    continue
+                if terms is not None and extract_terms(entry[1]) != terms:
+                    continue
+                match = entry
+                break
+            if match is None:
+                self.misses += 1
+                return None
+
+            sql, cached_task = match
+            self._conn.execute(
+                "UPDATE semantic_cache SET last_used_at = ?, hits = hits + 1 "
+                "WHERE id = ?",
+                (time.time(), entry_id),
+            )
+            self._conn.commit()
+            self.hits += 1
+
+        logger.info(
+            f"Semantic cache hit ({similarities[best]:.3f}) for a task similar to: "
+            f"{cached_task[:80]}"
+        )
+        return sql
+
+    def put(self, task: str, sql: str, schema_version: str) -> None:
+        """
+        Store the validated and successfully executed SQL of a task.
+
+        Parameters
+        ----------
+        task : str
+            The task description.
+        sql : str
+            The SQL answering the task.
+        schema_version : str
+            The version of the schema the SQL ran on.
+        """
+        embedding = self._embed(task).tobytes()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO semantic_cache "
+                "(schema_version, task, sql, embedding, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT (schema_version, task) "
+                "DO UPDATE SET sql = excluded.sql, embedding = excluded.embedding, "
+                "last_used_at = excluded.last_used_at",
+                (schema_version, task, sql, embedding, time.time()),
+            )
+            # least recently used entries beyond the size bound
+            self._conn.execute(
+                "DELETE FROM semantic_cache WHERE id IN (SELECT id FROM semantic_cache "
+                "ORDER BY last_used_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+            # the eviction may have removed entries of any schema version
+            self._index = {}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Number of entries, hits, misses and hit rate."""
+        with self._lock:
+            entries = self._conn.execute(
+                "SELECT count(*) FROM semantic_cache"
+            ).fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -1,42 +1,203 @@
+import hashlib
+import json
 import logging
+from typing import Any, Dict, Optional
 
 from langchain_core.language_models import BaseLanguageModel
 from langchain_core.prompts import PromptTemplate
 
-from src.tools.prompt_templates import SQL_GENERATION_TEMPLATE
+from src.tools.prompt_templates import (
+    SQL_GENERATION_TEMPLATE,
+    SQL_REPAIR_TEMPLATE,
+    SQL_TABLES_HINT_TEMPLATE,
+    SQL_TASK_TEMPLATE,
+)
 
 logger = logging.getLogger(__name__)
 
 
 class SQLTool:
-    def __init__(self, llm: BaseLanguageModel, db_schema: dict = None):
+    def __init__(
+        self,
+        llm: BaseLanguageModel,
+        db_schema: dict = None,
+        schema_version: Optional[str] = None,
+        schema_retriever: Optional[Any] = None,
+        semantic_cache: Optional[Any] = None,
+        prune_schema: bool = False,
+    ):
         self.llm = llm
         self.prompt = PromptTemplate(
-            input_variables=["schema", "task_description"],
+            input_variables=["schema"],
             template=SQL_GENERATION_TEMPLATE,
         )
+        self.task_prompt = PromptTemplate(
+            input_variables=["task_description"],
+            template=SQL_TASK_TEMPLATE,
+        )
+        self.tables_hint_prompt = PromptTemplate(
+            input_variables=["tables"],
+            template=SQL_TABLES_HINT_TEMPLATE,
+        )
+        self.repair_prompt = PromptTemplate(
+            input_variables=["previous_sql", "error_feedback"],
+            template=SQL_REPAIR_TEMPLATE,
+        )
+        self.db_schema = db_schema
+
+        # selects the tables relevant to a task (None sends the full schema). They are
+        # named after the full schema prefix, which stays identical for every prompt
+        # (provider-side prompt caching), or replace it with "prune_schema" (fewer
+        # tokens, but every table set has its own prefix)
+        self.schema_retriever = schema_retriever
+        self.prune_schema = prune_schema
+        self._pruned_prefixes: Dict[tuple, str] = {}
+
+        # validated SQL of similar tasks answered before (None disables it)
+        self.semantic_cache = semantic_cache
+
+        # prompt prefix (instructions + schema) rendered once per schema version
+        self.schema_version: Optional[str] = None
+        self.prompt_prefix: Optional[str] = None
+        self.prefix_token_count: Optional[int] = None
+        if db_schema is not None:
+            self.set_schema(db_schema, schema_version)
+
+    def set_schema(self, db_schema: dict, schema_version: Optional[str] = None) -> None:
+        """
+        Set the schema and render the prompt prefix if the schema changed.
+
+        Parameters
+        ----------
+        db_schema : dict
+            The schema as {table: [{column_name, data_type}]}.
+        schema_version : Optional[str]
+            The version of the schema (e.g. of the schema catalog). Defaults to a
+            hash of the schema.
+        """
+        if schema_version is None:
+            schema_version = hashlib.sha1(
+                json.dumps(db_schema, sort_keys=True, default=str).encode()
+            ).hexdigest()
         self.db_schema = db_schema
+        if schema_version == self.schema_version:
+            return
+
+        self.prompt_prefix = self.prompt.format(schema=self._format_schema(db_schema))
+        self.schema_version = schema_version
+        self._pruned_prefixes = {}
+        self.prefix_token_count = self._count_tokens(self.prompt_prefix)
+        logger.info(
+            f"SQL prompt prefix rendered for schema {schema_version[:12]}: "
+            f"{len(db_schema)} tables, {len(self.prompt_prefix)} characters, "
+            f"{self.prefix_token_count} tokens"
+        )
+
+    def _count_tokens(self, text: str) -> Optional[int]:
+        """Number of tokens of a text for the LLM, None if the LLM can't count them."""
+        try:
+            return self.llm.get_num_tokens(text)
+        except Exception as e:
+            logger.warning(f"Unable to count prompt tokens: {str(e)}")
+            return None
 
     def _format_schema(self, schema_dict: dict) -> str:
         """Format the schema dictionary into a readable string for the prompt."""
-        schema_text = ""
-        for table, columns in schema_dict.items():
-            schema_text += f"Table: {table}\n"
-            schema_text += "Columns:\n"
-            for col in columns:
-                schema_text += f"  - {col['column_name']} ({col['data_type']})\n"
-            schema_text += "\n"
-        return schema_text
-
-    def generate_query(self, task_description: str) -> str:
-        """Generate SQL query based on task description and schema."""
-        schema_text = self._format_schema(self.db_schema)
-
-        prompt_value = self.prompt.format(
-            schema=schema_text, task_description=task_description
+        return "\n".join(
+            f"Table: {table}\nColumns:\n"
+            + "".join(
+                f"  - {col['column_name']} ({col['data_type']})"
+                + (f" -> {col['references']}" if col.get("references") else "")
+                + "\n"
+                for col in columns
+            )
+            for table, columns in schema_dict.items()
         )
 
-        logger.info(f"Generating SQL query for task: {task_description}")
+    def _get_prompt_prefix(self, task_description: str, full_schema: bool) -> str:
+        """Prompt prefix with the full schema or the tables relevant to the task."""
+        if self.prompt_prefix is None:
+            self.set_schema(self.db_schema or {})
+        if self.schema_retriever is None or full_schema or not self.prune_schema:
+            return self.prompt_prefix
+
+        pruned_schema = self.schema_retriever.get_schema(task_description)
+        if pruned_schema is None:
+            return self.prompt_prefix
+        # tickets about the same tables share the prefix
+        key = tuple(pruned_schema)
+        if key not in self._pruned_prefixes:
+            self._pruned_prefixes[key] = self.prompt.format(
+                schema=self._format_schema(pruned_schema)
+            )
+        return self._pruned_prefixes[key]
+
+    def _get_tables_hint(self, task_description: str, full_schema: bool) -> str:
+        """Names of the tables relevant to the task (empty if the schema is pruned)."""
+        if self.schema_retriever is None or full_schema or self.prune_schema:
+            return ""
+        tables = self.schema_retriever.retrieve(task_description)
+        if not tables:
+            return ""
+        return self.tables_hint_prompt.format(tables=", ".join(tables))
+
+    def generate_query(
+        self,
+        task_description: str,
+        full_schema: bool = False,
+        use_cache: bool = True,
+        previous_sql: Optional[str] = None,
+        error_feedback: Optional[str] = None,
+    ) -> str:
+        """
+        Generate SQL query based on task description and schema.
+
+        Parameters
+        ----------
+        task_description : str
+            The task to answer.
+        full_schema : bool
+            Whether to send the full schema without relevant tables even if a schema
+            retriever is set (e.g. after the query generated with them failed).
+        use_cache : bool
+            Whether SQL cached for a similar task can be returned without calling
+            the LLM (a retry must not get the failing SQL back).
+        previous_sql : Optional[str]
+            The query that failed, to be repaired (requires "error_feedback").
+        error_feedback : Optional[str]
+            Why the previous query failed (validation errors, database error or
+            rejected execution plan).
+
+        Returns
+        -------
+        str
+            The generated SQL query.
+        """
+        prompt_prefix = self._get_prompt_prefix(task_description, full_schema)
+
+        repair = bool(previous_sql and error_feedback)
+        if self.semantic_cache is not None and use_cache and not repair:
+            try:
+                cached_sql = self.semantic_cache.get(
+                    task_description, self.schema_version
+                )
+                if cached_sql is not None:
+                    return cached_sql
+            except Exception as e:
+                logger.warning(f"Semantic cache lookup failed: {str(e)}")
+
+        prompt_value = (
+            prompt_prefix
+            + self.task_prompt.format(task_description=task_description)
+            + self._get_tables_hint(task_description, full_schema)
+        )
+        if repair:
+            prompt_value += self.repair_prompt.format(
+                previous_sql=previous_sql, error_feedback=error_feedback
+            )
+            logger.info(f"Repairing SQL query for task: {task_description}")
+        else:
+            logger.info(f"Generating SQL query for task: {task_description}")
 
         try:
             response = self.llm.invoke(prompt_value)
@@ -49,4 +210,25 @@ class SQLTool:
         except Exception as e:
             logger.error(f"Error generating SQL query: {str(e)}")
 
+    def remember_query(self, task_description: str, sql_query: str) -> None:
+        """Cache SQL that was validated and executed successfully for a task."""
+        if self.semantic_cache is None:
+            return
+        if self.prompt_prefix is None:
+            self.set_schema(self.db_schema or {})
+        try:
+            self.semantic_cache.put(task_description, sql_query, self.schema_version)
+        except Exception as e:
+            logger.warning(f"Unable to store the query in the semantic cache: {str(e)}")
+
+    def forget_query(self, sql_query: str) -> None:
+        """Drop rejected SQL from the LLM response cache (a retry gets a new answer)."""
+        forget_response = getattr(self.llm, "forget_response", None)
+        if forget_response is None or not sql_query:
+            return
+        try:
+            forget_response(sql_query)
+        except Exception as e:
+            logger.warning(f"Unable to drop the query from the LLM cache: {str(e)}")
+
     # TODO: add execute_query method
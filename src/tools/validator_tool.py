@@ -50,9 +50,12 @@ class ValidatorTool:
         self,
         llm: Optional[BaseLanguageModel] = None,
         schema_dict: Optional[dict] = None,
+        check_dangerous: bool = True,
     ):
         self.llm = llm
         self.schema_dict = schema_dict
+        # the regex pass is redundant when the database itself rejects writes
+        self.check_dangerous = check_dangerous
         self.schema_columns = (
             self._get_columns_from_schema(schema_dict) if schema_dict else set()
         )
@@ -132,9 +135,10 @@ class ValidatorTool:
             errors.append(syntax_error)
 
         # dangerous patterns validation
-        safe, safety_error = self.check_dangerous_patterns(sql_query)
-        if not safe:
-            errors.append(safety_error)
+        if self.check_dangerous:
+            safe, safety_error = self.check_dangerous_patterns(sql_query)
+            if not safe:
+                errors.append(safety_error)
 
         # schema compatibility validation
         schema_valid, schema_error = self.check_schema_compatibility(sql_query)
@@ -8,6 +8,12 @@ def mock_jira_client() -> MagicMock:
     client.account_id = "bot_account_id"
     return client
 
+@pytest.fixture
+def mock_db_client() -> MagicMock:
+    client = MagicMock()
+    client.get_database_schema.return_value = {"table1": []}
+    return client
+
 @pytest.fixture
 def sample_issue_comments_empty() -> dict:
     return {"comments": []}
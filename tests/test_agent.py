@@ -6,8 +6,18 @@ from src.models.schemas import JiraTicket
 
 import pytest
 from unittest.mock import MagicMock, patch
-from src.agent.agent import DataAnalysisAgent
-from src.models.schemas import JiraTicket, AgentState
+from src.agent.agent import DataAnalysisAgent, DatabaseRoutingAgent, get_feature_config
+from src.agent.workflow import create_workflow
+from src.clients.db_client import QueryCancelledError, QueryTimeoutError
+from src.models.schemas import (
+    AgentState,
+    JiraTicket,
+    QueryPlanEstimate,
+    QueryResult,
+    ValidationResult,
+)
+from src.tools.llm_cache import CachedLLM, LLMResponseCache
+from src.tools.sql_tool import SQLTool
 
 
 @pytest.fixture
@@ -52,6 +62,33 @@ def test_agent_initialization(
     mock_jira_client.assert_called_once()
 
 
+@patch("src.agent.agent.create_workflow")
+@patch("src.agent.agent.SQLTool")
+@patch("src.agent.agent.ValidatorTool")
+@patch("src.agent.agent.InsightTool")
+@patch("src.agent.agent.ChatOpenAI")
+@patch("src.agent.agent.JiraClient")
+def test_agent_uses_injected_jira_client(
+    mock_jira_client,
+    mock_chat_openai,
+    mock_insight_tool,
+    mock_validator_tool,
+    mock_sql_tool,
+    mock_create_workflow,
+    mock_db_client,
+):
+    injected_client = MagicMock()
+
+    agent = DataAnalysisAgent(
+        agent_config="./config/config.yaml",
+        db_client=mock_db_client,
+        jira_client=injected_client,
+    )
+
+    assert agent.jira_client is injected_client
+    mock_jira_client.assert_not_called()
+
+
 @patch("src.agent.agent.create_workflow")
 @patch("src.agent.agent.SQLTool")
 @patch("src.agent.agent.ValidatorTool")
@@ -85,3 +122,298 @@ def test_process_ticket(
     args, _ = mock_workflow.invoke.call_args
     passed_state = args[0]
     assert passed_state.ticket == sample_jira_ticket
+
+
+
+@patch("src.agent.agent.create_workflow")
+@patch("src.agent.agent.SQLTool")
+@patch("src.agent.agent.ValidatorTool")
+@patch("src.agent.agent.InsightTool")
+@patch("src.agent.agent.ChatOpenAI")
+@patch("src.agent.agent.JiraClient")
+def test_process_tickets_isolates_errors(
+    mock_jira_client,
+    mock_chat_openai,
+    mock_insight_tool,
+    mock_validator_tool,
+    mock_sql_tool,
+    mock_create_workflow,
+    mock_db_client,
+):
+    """One failing ticket doesn't affect the others processed concurrently."""
+    tickets = [
+        JiraTicket(ticket_id=f"ABC-{i}", summary="s", description="d", status="Open")
+        for i in range(3)
+    ]
+
+    def invoke(state):
+        if state.ticket.ticket_id == "ABC-1":
+            raise RuntimeError("LLM is down")
+        return AgentState(ticket=state.ticket, business_insight="Some insight")
+
+    mock_workflow = MagicMock()
+    mock_workflow.invoke.side_effect = invoke
+    mock_create_workflow.return_value = mock_workflow
+
+    agent = DataAnalysisAgent(
+        agent_config="./config/config.yaml", db_client=mock_db_client
+    )
+    summaries = agent.process_tickets(tickets, max_concurrency=2)
+
+    assert [s.ticket_id for s in summaries] == ["ABC-0", "ABC-1", "ABC-2"]
+    assert [s.succeeded for s in summaries] == [True, False, True]
+    assert summaries[1].error == "LLM is down"
+    assert all(s.wall_time_ms >= 0 for s in summaries)
+    assert mock_workflow.invoke.call_count == 3
+
+
+@patch("src.agent.agent.create_workflow")
+@patch("src.agent.agent.SQLTool")
+@patch("src.agent.agent.ValidatorTool")
+@patch("src.agent.agent.InsightTool")
+@patch("src.agent.agent.ChatOpenAI")
+@patch("src.agent.agent.JiraClient")
+def test_routing_agent_dispatches_tickets(
+    mock_jira_client,
+    mock_chat_openai,
+    mock_insight_tool,
+    mock_validator_tool,
+    mock_sql_tool,
+    mock_create_workflow,
+):
+    """Every ticket is processed by the agent of its database, the LLM is shared."""
+    databases = {"porsche": MagicMock(), "finance": MagicMock()}
+    router = MagicMock()
+    router.targets = databases
+    router.get_database.side_effect = databases.get
+    router.route.side_effect = lambda ticket: ticket.labels[0]
+
+    def create_workflow(agent, max_retries):
+        # the insight names the database the ticket was processed on
+        name = "finance" if agent.db_client is databases["finance"] else "porsche"
+        return MagicMock(
+            invoke=lambda state: AgentState(ticket=state.ticket, business_insight=name)
+        )
+
+    mock_create_workflow.side_effect = create_workflow
+
+    agent = DatabaseRoutingAgent(agent_config="./config/config.yaml", router=router)
+    tickets = [
+        JiraTicket(
+            ticket_id=f"ABC-{i}", summary="s", description="d", status="Open", labels=[label]
+        )
+        for i, label in enumerate(["porsche", "finance"])
+    ]
+    summaries = agent.process_tickets(tickets, max_concurrency=2)
+
+    assert [s.succeeded for s in summaries] == [True, True]
+    assert agent.agents["porsche"].db_client is databases["porsche"]
+    assert agent.agents["finance"].db_client is databases["finance"]
+    assert agent.process_ticket(tickets[1]).business_insight == "finance"
+    assert agent.agents["porsche"].llm is agent.agents["finance"].llm
+    assert agent.agents["porsche"].llm_cache is agent.agents["finance"].llm_cache
+    mock_chat_openai.assert_called_once()
+    mock_jira_client.assert_called_once()
+
+
+def test_routing_agent_without_targets():
+    """Without databases every ticket fails to route, the agent still runs them."""
+    router = MagicMock()
+    router.targets = {}
+    router.route.side_effect = ValueError("No database for ticket")
+
+    agent = DatabaseRoutingAgent(agent_config="./config/config.yaml", router=router)
+    summaries = agent.process_tickets(
+        [JiraTicket(ticket_id="ABC-1", summary="s", description="d", status="Open")]
+    )
+
+    assert agent.config["agent"]["max_retries"] == 3
+    assert [s.error for s in summaries] == ["No database for ticket"]
+
+
+def _workflow_agent(execute_query_side_effect):
+    """Agent double whose only failing step is the query execution."""
+    agent = MagicMock()
+    agent.query_timeout_seconds = 30
+    agent.cost_gate = None
+    agent.approximate = None
+    agent.repair_failed_sql = True
+    agent.sql_generation_tool.generate_query.return_value = "SELECT 1"
+    agent.sql_validation_tool.validate_sql.return_value = ValidationResult(
+        is_valid=True, errors=[], warnings=[], suggestion=None
+    )
+    agent.sql_insight_tool.generate_insights.return_value = "Some insight"
+    agent.db_client.execute_query.side_effect = execute_query_side_effect
+    return agent
+
+
+def test_workflow_regenerates_sql_after_timeout(sample_jira_ticket):
+    """A timed out query is regenerated, the retry succeeds."""
+    query_result = QueryResult(
+        data=[{"one": 1}], row_count=1, column_names=["one"], execution_time_ms=1.0
+    )
+    agent = _workflow_agent([QueryTimeoutError("too slow"), query_result])
+
+    final_state = AgentState.model_validate(
+        create_workflow(agent, max_retries=2).invoke(AgentState(ticket=sample_jira_ticket))
+    )
+
+    assert final_state.business_insight == "Some insight"
+    assert final_state.retry_count == 1
+    assert agent.sql_generation_tool.generate_query.call_count == 2
+    assert agent.db_client.execute_query.call_args.kwargs["timeout_seconds"] == 30
+
+
+def test_workflow_gives_up_on_cancelled_query(sample_jira_ticket):
+    """A cancelled query fails the ticket without retrying."""
+    agent = _workflow_agent(QueryCancelledError("cancelled"))
+
+    final_state = AgentState.model_validate(
+        create_workflow(agent, max_retries=2).invoke(AgentState(ticket=sample_jira_ticket))
+    )
+
+    assert final_state.error_type == "cancelled"
+    assert final_state.retry_count == 0
+    assert agent.db_client.execute_query.call_count == 1
+
+
+def test_workflow_regenerates_expensive_sql(sample_jira_ticket):
+    """A query rejected by the cost gate is regenerated with the plan as feedback."""
+    query_result = QueryResult(
+        data=[{"one": 1}], row_count=1, column_names=["one"], execution_time_ms=1.0
+    )
+    agent = _workflow_agent([query_result])
+    agent.cost_gate = {"max_cost": 1000}
+    agent.db_client.estimate_query_cost.side_effect = [
+        QueryPlanEstimate(
+            estimated_cost=1e6,
+            is_acceptable=False,
+            reasons=["Estimated cost 1000000 exceeds the limit of 1000"],
+            plan="SCAN sales",
+        ),
+        QueryPlanEstimate(estimated_cost=10, plan="SEARCH sales"),
+    ]
+
+    final_state = AgentState.model_validate(
+        create_workflow(agent, max_retries=2).invoke(AgentState(ticket=sample_jira_ticket))
+    )
+
+    assert final_state.business_insight == "Some insight"
+    assert final_state.retry_count == 1
+    assert final_state.query_plan.estimated_cost == 10
+    assert agent.db_client.execute_query.call_count == 1
+    agent.db_client.estimate_query_cost.assert_called_with("SELECT 1", max_cost=1000)
+
+
+def test_workflow_caches_executed_sql_only(sample_jira_ticket):
+    """Only SQL that executed is remembered, the retry doesn't use the cache."""
+    query_result = QueryResult(
+        data=[{"one": 1}], row_count=1, column_names=["one"], execution_time_ms=1.0
+    )
+    agent = _workflow_agent([RuntimeError("no such column"), query_result])
+
+    create_workflow(agent, max_retries=2).invoke(AgentState(ticket=sample_jira_ticket))
+
+    calls = agent.sql_generation_tool.generate_query.call_args_list
+    assert [call.kwargs["use_cache"] for call in calls] == [True, False]
+    assert [call.kwargs["full_schema"] for call in calls] == [False, True]
+    agent.sql_generation_tool.remember_query.assert_called_once_with(
+        sample_jira_ticket.description, "SELECT 1"
+    )
+
+
+def test_workflow_repairs_sql_with_errors(sample_jira_ticket):
+    """Retries get the failing query with its validation or database errors."""
+    query_result = QueryResult(
+        data=[{"one": 1}], row_count=1, column_names=["one"], execution_time_ms=1.0
+    )
+    agent = _workflow_agent([RuntimeError("no such column: col2"), query_result])
+    agent.sql_generation_tool.generate_query.side_effect = [
+        "SELECT col3", "SELECT col2", "SELECT 1"
+    ]
+    agent.sql_validation_tool.validate_sql.side_effect = [
+        ValidationResult(
+            is_valid=False,
+            errors=["Column 'col3' doesn't exist in the schema"],
+            warnings=[],
+            suggestion=None,
+        ),
+        ValidationResult(is_valid=True, errors=[], warnings=[], suggestion=None),
+        ValidationResult(is_valid=True, errors=[], warnings=[], suggestion=None),
+    ]
+
+    final_state = AgentState.model_validate(
+        create_workflow(agent, max_retries=3).invoke(AgentState(ticket=sample_jira_ticket))
+    )
+
+    calls = agent.sql_generation_tool.generate_query.call_args_list
+    assert [call.kwargs["previous_sql"] for call in calls] == [
+        None, "SELECT col3", "SELECT col2"
+    ]
+    assert calls[0].kwargs["error_feedback"] is None
+    assert calls[1].kwargs["error_feedback"] == (
+        "- Column 'col3' doesn't exist in the schema"
+    )
+    assert calls[2].kwargs["error_feedback"] == "Database error: no such column: col2"
+    assert final_state.business_insight == "Some insight"
+
+
+def test_workflow_regenerates_without_feedback_if_disabled(sample_jira_ticket):
+    query_result = QueryResult(
+        data=[{"one": 1}], row_count=1, column_names=["one"], execution_time_ms=1.0
+    )
+    agent = _workflow_agent([RuntimeError("no such column"), query_result])
+    agent.repair_failed_sql = False
+
+    create_workflow(agent, max_retries=2).invoke(AgentState(ticket=sample_jira_ticket))
+
+    calls = agent.sql_generation_tool.generate_query.call_args_list
+    assert [call.kwargs["error_feedback"] for call in calls] == [None, None]
+
+
+def test_workflow_retry_reaches_llm_with_cached_responses(sample_jira_ticket):
+    """A retry repeating the prompt of a failed attempt doesn't get its cached SQL."""
+    query_result = QueryResult(
+        data=[{"one": 1}], row_count=1, column_names=["one"], execution_time_ms=1.0
+    )
+    agent = _workflow_agent([RuntimeError("no such column"), query_result])
+    agent.repair_failed_sql = False
+    mock_llm = MagicMock()
+    mock_llm.invoke.side_effect = [
+        MagicMock(content="SELECT bad"),
+        MagicMock(content="SELECT bad"),
+        MagicMock(content="SELECT 1"),
+    ]
+    agent.sql_generation_tool = SQLTool(
+        llm=CachedLLM(mock_llm, LLMResponseCache(), tool="sql_generation"),
+        db_schema={"models": [{"column_name": "model_id", "data_type": "INTEGER"}]},
+    )
+    agent.db_client.execute_query.side_effect = [
+        RuntimeError("no such column"),
+        RuntimeError("no such column"),
+        query_result,
+    ]
+
+    final_state = AgentState.model_validate(
+        create_workflow(agent, max_retries=3).invoke(AgentState(ticket=sample_jira_ticket))
+    )
+
+    # retries 1 and 2 send the same full schema prompt
+    assert mock_llm.invoke.call_count == 3
+    assert final_state.sql_query == "SELECT 1"
+    assert final_state.business_insight == "Some insight"
+
+
+def test_get_feature_config() -> None:
+    """Optional features are off when missing or disabled, "enabled" isn't an option."""
+    config = {
+        "agent": {
+            "semantic_cache": {"enabled": False, "path": "cache.db"},
+            "cost_gate": {"enabled": True, "max_cost": 10},
+            "approximate": {"label": "approximate"},
+        }
+    }
+    assert get_feature_config(config, "semantic_cache") is None
+    assert get_feature_config(config, "cost_gate") == {"max_cost": 10}
+    assert get_feature_config(config, "approximate") == {"label": "approximate"}
+    assert get_feature_config(config, "llm_cache") is None
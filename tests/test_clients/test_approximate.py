@@ -0,0 +1,81 @@
+import pytest
+
+from src.clients.approximate import rewrite_for_sample
+from src.clients.db_client import DatabaseClient
+
+TABLE_ROWS = {"sales": 5_000_000, "models": 50}
+
+
+def _tablesample(table):
+    return None, 0.01
+
+
+def test_rewrite_for_sample_tablesample() -> None:
+    """The largest table is sampled and helper columns are added for the bounds."""
+    sampled = rewrite_for_sample(
+        "SELECT m.segment, SUM(s.price) AS revenue, COUNT(*) AS sales "
+        "FROM sales s JOIN models m ON m.model_id = s.model_id GROUP BY m.segment",
+        "postgres",
+        TABLE_ROWS,
+        1_000_000,
+        _tablesample,
+    )
+
+    assert sampled.sampled_table == "sales"
+    assert "FROM sales AS s TABLESAMPLE BERNOULLI (1.0)" in sampled.sql
+    assert "SUM((s.price) * (s.price)) AS __approx_sq_1" in sampled.sql
+    assert [a.kind for a in sampled.aggregates] == ["sum", "count"]
+
+
+@pytest.mark.parametrize(
+    "sql_query",
+    [
+        "SELECT * FROM sales",  # no aggregate
+        "SELECT MAX(price) FROM sales",  # can't be scaled
+        "SELECT COUNT(DISTINCT model_id) FROM sales",
+        "SELECT model_id, COUNT(*) FROM sales GROUP BY model_id HAVING COUNT(*) > 10",
+        "SELECT ROUND(AVG(price), 2) FROM sales",
+        "SELECT COUNT(*) FROM models",  # small table
+        "SELECT COUNT(*) FROM (SELECT * FROM sales) t",
+    ],
+)
+def test_rewrite_for_sample_falls_back(sql_query) -> None:
+    """Queries that can't be answered from a sample are executed exactly."""
+    assert rewrite_for_sample(sql_query, "postgres", TABLE_ROWS, 1_000_000, _tablesample) is None
+
+
+def test_execute_query_approximate(tmp_path) -> None:
+    """Aggregates over the SQLite sample table are scaled and carry error bounds."""
+    db_path = tmp_path / "test.db"
+    client = DatabaseClient(f"sqlite:///{db_path}")
+    with client.engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE sales (id INTEGER PRIMARY KEY, region TEXT, price REAL)")
+        conn.exec_driver_sql(
+            "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n LIMIT 50000) "
+            "INSERT INTO sales SELECT i, CASE i % 2 WHEN 0 THEN 'EU' ELSE 'US' END, i % 100 FROM n"
+        )
+
+    refreshed = client.refresh_sample_tables(fraction=0.2, min_table_rows=10_000)
+    assert list(refreshed) == ["sales"]
+    assert client.refresh_sample_tables(fraction=0.2, min_table_rows=10_000) == {}
+    assert list(client.get_database_schema()) == ["sales"]  # samples stay hidden
+
+    sql_query = (
+        "SELECT region, COUNT(*) AS n, SUM(price) AS revenue, AVG(price) AS avg_price "
+        "FROM sales GROUP BY region ORDER BY region"
+    )
+    exact = client.execute_query(sql_query)
+    reader = DatabaseClient(f"sqlite:///{db_path}", read_only=True)
+    approximate = reader.execute_query_approximate(sql_query, min_table_rows=10_000)
+
+    assert approximate.is_approximate and not exact.is_approximate
+    assert approximate.sample_fraction == 0.2
+    assert list(approximate.columns) == ["region", "n", "revenue", "avg_price"]
+    for name in ("n", "revenue", "avg_price"):
+        error = abs(approximate.columns[name] - exact.columns[name])
+        assert (error <= 3 * approximate.error_bounds[name]).all()
+
+    with pytest.raises(PermissionError):
+        reader.refresh_sample_tables()
+    reader.close()
+    client.close()
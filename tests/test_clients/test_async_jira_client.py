@@ -0,0 +1,174 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.clients.async_jira_client import AsyncJiraClient
+
+
+def make_client(handler, **kwargs) -> AsyncJiraClient:
+    return AsyncJiraClient(
+        base_url="https://example.atlassian.net",
+        email="test@example.com",
+        api_token="test-token",
+        transport=httpx.MockTransport(handler),
+        backoff_factor=0,
+        backoff_jitter=0,
+        **kwargs,
+    )
+
+
+def test_get_active_issues_concurrent_pages() -> None:
+    """Pages after the first one are fetched concurrently and merged in order."""
+    requested_offsets = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        start_at = int(request.url.params["startAt"])
+        max_results = int(request.url.params["maxResults"])
+        requested_offsets.append(start_at)
+        issues = [{"id": str(i)} for i in range(start_at, min(start_at + max_results, 120))]
+        return httpx.Response(200, json={"issues": issues, "total": 120})
+
+    async def run():
+        async with make_client(handler) as client:
+            return await client.get_active_issues(fields=["summary"])
+
+    result = asyncio.run(run())
+
+    assert [issue["id"] for issue in result] == [str(i) for i in range(120)]
+    assert sorted(requested_offsets) == [0, 50, 100]
+
+
+def test_add_comment_concurrency_is_bounded() -> None:
+    in_flight = 0
+    max_seen = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, max_seen
+        in_flight += 1
+        max_seen = max(max_seen, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(201, json=json.loads(request.content))
+
+    async def run():
+        async with make_client(handler, max_in_flight=3) as client:
+            return await asyncio.gather(
+                *(client.add_comment(issue=f"DATA-{i}", comment="done") for i in range(10))
+            )
+
+    results = asyncio.run(run())
+
+    assert results == [{"body": "done"}] * 10
+    assert max_seen <= 3
+
+
+def test_request_retries_rate_limited_post() -> None:
+    responses = [
+        httpx.Response(429, headers={"Retry-After": "0"}),
+        httpx.Response(201, json={"id": "1"}),
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return responses.pop(0)
+
+    async def run():
+        async with make_client(handler) as client:
+            result = await client.add_comment(issue="DATA-1", comment="done")
+            return result, client.request_count
+
+    result, request_count = asyncio.run(run())
+
+    assert result == {"id": "1"}
+    assert request_count == 2
+
+
+def test_transition_issue() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            return httpx.Response(
+                200, json={"transitions": [{"id": "11", "name": "To Do"}, {"id": "21", "name": "In Progress"}]}
+            )
+        assert json.loads(request.content) == {"transition": {"id": "21"}}
+        return httpx.Response(200, json={"transitioned": True})
+
+    async def run():
+        async with make_client(handler) as client:
+            return await client.transition_issue("DATA-1", "in progress")
+
+    assert asyncio.run(run()) == {"transitioned": True}
+
+
+def test_transition_issue_retries_only_rejected_transitions() -> None:
+    """A 400 on the cached transition id refreshes the transitions, a 404 is raised."""
+    requests = []
+    post_status = 400
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.method)
+        if request.method == "GET":
+            return httpx.Response(200, json={"transitions": [{"id": "21", "name": "In Progress"}]})
+        if json.loads(request.content) == {"transition": {"id": "99"}}:
+            return httpx.Response(post_status, json={"errors": {"transition": "invalid"}})
+        return httpx.Response(204)
+
+    context = {"project_key": "DATA", "issue_type": "Task", "current_status": "To Do"}
+
+    async def run():
+        async with make_client(handler) as client:
+            key = client._get_transition_cache_key("DATA", "Task", "To Do")
+            client._cache_transitions(key, [{"id": "99", "name": "In Progress"}])
+            await client.transition_issue("DATA-1", "In Progress", **context)
+            return client._get_cached_transition_id(key, "In Progress")
+
+    assert asyncio.run(run()) == "21"
+    assert requests == ["POST", "GET", "POST"]
+
+    requests.clear()
+    post_status = 404
+    with pytest.raises(ValueError, match="not found"):
+        asyncio.run(run())
+    assert requests == ["POST"]
+
+
+def test_account_id_is_resolved_by_get_account_id(tmp_path) -> None:
+    """account_id never calls Jira, it is None until "get_account_id" resolved it."""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        return httpx.Response(200, json={"accountId": "bot-id"})
+
+    cache_path = str(tmp_path / "account_id.json")
+
+    async def run():
+        async with make_client(handler, account_id_cache_path=cache_path) as client:
+            before = client.account_id
+            return before, await client.get_account_id(), client.account_id
+
+    assert asyncio.run(run()) == (None, "bot-id", "bot-id")
+    assert requests == ["/rest/api/3/myself"]
+
+    # the persisted account ID is available without a request
+    async def run_cached():
+        async with make_client(handler, account_id_cache_path=cache_path) as client:
+            return client.account_id
+
+    assert asyncio.run(run_cached()) == "bot-id"
+    assert len(requests) == 1
+
+
+def test_transition_issue_returns_none_without_content() -> None:
+    """Like JiraClient, a 204 No Content transition returns None."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            return httpx.Response(200, json={"transitions": [{"id": "21", "name": "Done"}]})
+        return httpx.Response(204)
+
+    async def run():
+        async with make_client(handler) as client:
+            return await client.transition_issue("DATA-1", "Done")
+
+    assert asyncio.run(run()) is None
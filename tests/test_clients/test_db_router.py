@@ -0,0 +1,129 @@
+import sqlite3
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.clients.db_client import DatabaseClient
+from src.clients.db_router import DatabaseRouter, DatabaseTarget, ReplicaSet
+from src.models.schemas import JiraTicket, TableInfo
+
+
+def _create_database(path, value: int) -> str:
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE sales (id INTEGER)")
+    conn.execute("INSERT INTO sales VALUES (?)", (value,))
+    conn.commit()
+    conn.close()
+    return f"sqlite:///{path}"
+
+
+def _ticket(**fields) -> JiraTicket:
+    return JiraTicket(
+        ticket_id="DATA-1",
+        summary=fields.pop("summary", "Report"),
+        description=fields.pop("description", ""),
+        status="To Do",
+        **fields,
+    )
+
+
+def _target(name: str, tables=(), **fields) -> DatabaseTarget:
+    database = MagicMock()
+    database.get_schema_catalog.return_value = {
+        table: TableInfo(name=table, columns=[]) for table in tables
+    }
+    return DatabaseTarget(name=name, database=database, **fields)
+
+
+def test_replica_set_round_robin(tmp_path) -> None:
+    """Reads alternate between the replicas, the primary isn't used."""
+    primary = DatabaseClient(_create_database(tmp_path / "primary.db", 0))
+    replicas = [
+        DatabaseClient(_create_database(tmp_path / f"replica_{i}.db", i))
+        for i in (1, 2)
+    ]
+    replica_set = ReplicaSet(primary, replicas)
+
+    values = [
+        replica_set.execute_query("SELECT id FROM sales").data[0]["id"] for _ in range(4)
+    ]
+
+    assert values == [1, 2, 1, 2]
+    assert replica_set.is_sqlite  # other attributes come from the primary
+    replica_set.close()
+
+
+def test_replica_set_fails_over_to_primary(tmp_path) -> None:
+    """A replica that can't be reached is marked down and skipped."""
+    primary = DatabaseClient(_create_database(tmp_path / "primary.db", 0))
+    replica = DatabaseClient(f"sqlite:///{tmp_path / 'missing.db'}", read_only=True)
+    replica_set = ReplicaSet(primary, [replica], health_check_interval_seconds=3600)
+
+    assert replica_set.execute_query("SELECT id FROM sales").data == [{"id": 0}]
+    assert replica_set._healthy == [False]
+    assert list(replica_set.check_health().values()) == [True, False]
+
+
+def test_replica_set_query_errors_are_not_failed_over(tmp_path) -> None:
+    """A broken query is raised, the healthy replica stays in the rotation."""
+    primary = DatabaseClient(_create_database(tmp_path / "primary.db", 0))
+    replica = DatabaseClient(_create_database(tmp_path / "replica.db", 1))
+    replica_set = ReplicaSet(primary, [replica])
+
+    with pytest.raises(Exception, match="no such table"):
+        replica_set.execute_query("SELECT * FROM missing")
+    assert replica_set._healthy == [True]
+
+
+@pytest.mark.parametrize(
+    "ticket_fields, expected",
+    [
+        ({"components": ["Finance"]}, "finance"),
+        ({"labels": ["FINANCE"]}, "finance"),
+        ({"description": "Total revenue per invoices and payments"}, "finance"),
+        ({"description": "Sales per dealer"}, "porsche"),
+        ({"description": "Weather forecast"}, "porsche"),  # default
+    ],
+)
+def test_router_route(ticket_fields, expected) -> None:
+    """Tickets are routed by component, label, then tables named in the ticket."""
+    router = DatabaseRouter(
+        targets=[
+            _target("porsche", tables=["sales", "dealers"]),
+            _target(
+                "finance",
+                tables=["invoices", "payments", "sales"],
+                components=["finance"],
+                labels=["finance"],
+            ),
+        ],
+        default="porsche",
+    )
+
+    assert router.route(_ticket(**ticket_fields)) == expected
+
+
+def test_router_from_config(tmp_path) -> None:
+    """Targets and their replicas are built from the "databases" config section."""
+    config = {
+        "default": "porsche",
+        "targets": {
+            "porsche": {
+                "connection_string": _create_database(tmp_path / "porsche.db", 0),
+                "replicas": [_create_database(tmp_path / "replica.db", 1)],
+                "labels": ["porsche"],
+            },
+        },
+    }
+
+    router = DatabaseRouter.from_config(config)
+
+    database = router.get_database("porsche")
+    assert len(database.replicas) == 1
+    assert router.targets["porsche"].labels == ["porsche"]
+    router.close()
+
+
+def test_router_unknown_default() -> None:
+    with pytest.raises(ValueError, match="Unknown default"):
+        DatabaseRouter(targets=[_target("porsche")], default="finance")
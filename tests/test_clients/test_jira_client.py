@@ -1,7 +1,9 @@
 from unittest.mock import MagicMock, patch, mock_open, call
-from src.clients.jira_client import JiraClient
+import pytest
 
-@patch("src.clients.jira_client.requests.request")
+from src.clients.jira_client import JiraBadRequestError, JiraClient, JiraRetry
+
+@patch("src.clients.jira_client.requests.Session.request")
 def test_jira_client_initialization(mock_request: MagicMock):
     """Test JiraClient initialization and account ID retrieval."""
     # Mock the response from /myself
@@ -18,10 +20,67 @@ def test_jira_client_initialization(mock_request: MagicMock):
 
     assert client.account_id == "test-account-id"
     mock_request.assert_called_once()
+    assert client.request_count == 1
     assert client.base_url == "https://example.atlassian.net"
     assert client.auth.username == "test@example.com"
 
 
+@patch.object(JiraClient, "_request", return_value={"accountId": "dummy-id"})
+def test_session_pooling_and_retries(mock_request: MagicMock) -> None:
+    client = JiraClient(
+        base_url="https://example.atlassian.net",
+        email="test@example.com",
+        api_token="test-token",
+        pool_size=4,
+        max_retries=5,
+    )
+
+    adapter = client.session.get_adapter("https://example.atlassian.net/rest/api/2/issue")
+    assert adapter._pool_maxsize == 4
+    assert isinstance(adapter.max_retries, JiraRetry)
+    assert adapter.max_retries.total == 5
+    assert adapter.max_retries.respect_retry_after_header
+
+
+def test_jira_retry_policy() -> None:
+    retry = JiraRetry(total=3, status_forcelist=(429, 500, 502, 503, 504))
+
+    # rate limiting is retried for all methods
+    assert retry.is_retry("POST", 429)
+    assert retry.is_retry("GET", 429)
+    # server errors are retried only for idempotent methods
+    assert retry.is_retry("GET", 503)
+    assert not retry.is_retry("POST", 503)
+    assert not retry.is_retry("GET", 404)
+
+
+@patch.object(JiraClient, "_request", return_value={"accountId": "test-account-id"})
+def test_account_id_is_lazy_and_persisted(mock_request: MagicMock, tmp_path) -> None:
+    cache_path = str(tmp_path / "jira_account.json")
+    params = dict(
+        base_url="https://example.atlassian.net",
+        email="test@example.com",
+        api_token="test-token",
+        account_id_cache_path=cache_path,
+    )
+
+    client = JiraClient(**params)
+    mock_request.assert_not_called()  # cold start -> no Jira calls
+
+    assert client.account_id == "test-account-id"
+    assert client.account_id == "test-account-id"
+    mock_request.assert_called_once()
+
+    # another client (e.g. another process) reads the persisted account id
+    assert JiraClient(**params).account_id == "test-account-id"
+    mock_request.assert_called_once()
+
+    # expired entry -> resolved again
+    expired_client = JiraClient(**params, account_id_cache_ttl=-1)
+    assert expired_client.account_id == "test-account-id"
+    assert mock_request.call_count == 2
+
+
 @patch.object(JiraClient, "_request")
 def test_get_comments(mock_request: MagicMock) -> None:
     # Arrange
@@ -32,7 +91,7 @@ def test_get_comments(mock_request: MagicMock) -> None:
         ]
     }
 
-    mock_request.side_effect = [{"accountId": "dummy-id"}, mock_comments_data]
+    mock_request.return_value = mock_comments_data
 
     client = JiraClient(
         base_url="https://example.atlassian.net",
@@ -58,7 +117,7 @@ def test_get_issue(mock_request: MagicMock) -> None:
         }
     }
 
-    mock_request.side_effect = [{"accountId": "dummy-id"}, mock_issue_data]
+    mock_request.return_value = mock_issue_data
 
     client = JiraClient(
         base_url="https://example.atlassian.net",
@@ -79,9 +138,8 @@ def test_update_comment(mock_request: MagicMock) -> None:
         "id": "12345",
         "body": "Updated comment text",
     }
-    # First call to _request is from __init__ for account_id
-    # Second call is the update_comment call
-    mock_request.side_effect = [{"accountId": "dummy-id"}, updated_comment_response]
+    # account_id is resolved lazily -> the only call is the update_comment call
+    mock_request.return_value = updated_comment_response
 
     client = JiraClient(
         base_url="https://example.atlassian.net",
@@ -110,8 +168,8 @@ def test_add_comment(mock_request: MagicMock) -> None:
         "id": "67890",
         "body": "This is a test comment"
     }
-    # First call in __init__ to get account_id, second call is add_comment
-    mock_request.side_effect = [{"accountId": "dummy-id"}, mock_response]
+    # account_id is resolved lazily -> the only call is add_comment
+    mock_request.return_value = mock_response
 
     client = JiraClient(
         base_url="https://example.atlassian.net",
@@ -136,8 +194,8 @@ def test_add_comment(mock_request: MagicMock) -> None:
 @patch.object(JiraClient, "_request")
 def test_delete_comment(mock_request: MagicMock) -> None:
     # Arrange
-    # Mock response for __init__ (account ID fetch) and delete_comment call
-    mock_request.side_effect = [{"accountId": "dummy-id"}, True]
+    # account_id is resolved lazily -> the only call is delete_comment
+    mock_request.return_value = True
 
     client = JiraClient(
         base_url="https://example.atlassian.net",
@@ -157,7 +215,7 @@ def test_delete_comment(mock_request: MagicMock) -> None:
     assert result is True
 
 
-@patch("requests.post")
+@patch("requests.Session.post")
 @patch("builtins.open", new_callable=mock_open, read_data=b"dummy file content")
 @patch.object(JiraClient, "_handle_response")
 @patch.object(JiraClient, "_request")
@@ -215,11 +273,10 @@ def test_get_issue_success(mock_request):
     }
 
     # Setup side effects for calls to _request:
-    # First call during init returns account info
-    # Second call returns issue data
+    # First call returns issue data, second call (lazy account_id) returns account info
     mock_request.side_effect = [
-        {"accountId": "some-account-id"},  # for __init__ call
-        expected_response  # for get_issue call
+        expected_response,  # for get_issue call
+        {"accountId": "some-account-id"},  # for account_id access
     ]
 
     client = JiraClient(
@@ -230,14 +287,16 @@ def test_get_issue_success(mock_request):
 
     # Act
     result = client.get_issue(issue_key)
+    account_id = client.account_id
 
-    # Assert the calls happened as expected
+    # Assert the calls happened as expected (no Jira calls during __init__)
     mock_request.assert_has_calls([
-        call(method="get", url="https://example.atlassian.net/rest/api/3/myself"),
         call(method="get", url=expected_url),
+        call(method="get", url="https://example.atlassian.net/rest/api/3/myself"),
     ])
 
     assert result == expected_response
+    assert account_id == "some-account-id"
 
 
 
@@ -325,6 +384,138 @@ def test_get_active_issues_pagination(mock_request):
     assert result[-1]["id"] == "119"
 
 
+@patch.object(JiraClient, "_request")
+def test_get_active_issues_parallel_pages(mock_request):
+    client = JiraClient(
+        base_url="https://example.atlassian.net",
+        email="test@example.com",
+        api_token="test-token"
+    )
+
+    def side_effect(method, url, params=None, **kwargs):
+        start_at = params["startAt"]
+        end = min(start_at + params["maxResults"], 230)
+        return {"issues": [{"id": str(i)} for i in range(start_at, end)], "total": 230}
+
+    mock_request.reset_mock()
+    mock_request.side_effect = side_effect
+
+    result = client.get_active_issues(fields=["summary"], max_workers=4)
+
+    # deterministic order regardless of the completion order of pages
+    assert [issue["id"] for issue in result] == [str(i) for i in range(230)]
+    offsets = sorted(c.kwargs["params"]["startAt"] for c in mock_request.call_args_list)
+    assert offsets == [0, 50, 100, 150, 200]
+    assert all(c.kwargs["params"]["fields"] == "summary" for c in mock_request.call_args_list)
+
+
+@patch.object(JiraClient, "_request")
+def test_run_jql_parallel_pages_respects_max_results(mock_request):
+    client = JiraClient(
+        base_url="https://example.atlassian.net",
+        email="test@example.com",
+        api_token="test-token"
+    )
+
+    def side_effect(method, url, params=None, **kwargs):
+        start_at = params["startAt"]
+        end = min(start_at + params["maxResults"], 1000)
+        return {"issues": [{"id": str(i)} for i in range(start_at, end)], "total": 1000}
+
+    mock_request.reset_mock()
+    mock_request.side_effect = side_effect
+
+    result = client.run_jql("project = DATA", max_results=250, max_workers=3)
+
+    assert [issue["id"] for issue in result["issues"]] == [str(i) for i in range(250)]
+    assert mock_request.call_count == 3
+
+
+@patch("src.clients.jira_client.requests.Session.request")
+def test_request_count_with_parallel_pages(mock_request):
+    """Pages fetched by worker threads are all counted."""
+    client = JiraClient(
+        base_url="https://example.atlassian.net",
+        email="test@example.com",
+        api_token="test-token"
+    )
+
+    def side_effect(method, url, params=None, **kwargs):
+        start_at = params["startAt"]
+        end = min(start_at + params["maxResults"], 2000)
+        response = MagicMock(status_code=200)
+        response.json.return_value = {
+            "issues": [{"id": str(i)} for i in range(start_at, end)],
+            "total": 2000,
+        }
+        return response
+
+    mock_request.side_effect = side_effect
+
+    result = client.run_jql("project = DATA", max_results=-1, max_workers=8)
+
+    assert len(result["issues"]) == 2000
+    assert client.request_count == mock_request.call_count == 20
+
+
+@patch.object(JiraClient, "_request")
+def test_get_active_issues_with_fields(mock_request):
+    client = JiraClient(
+        base_url="https://example.atlassian.net",
+        email="test@example.com",
+        api_token="test-token"
+    )
+    mock_request.reset_mock()
+    mock_request.side_effect = None
+    mock_request.return_value = {"issues": [{"key": "DATA-1"}], "total": 1}
+
+    result = client.get_active_issues(fields=["summary", "comment"])
+
+    assert result == [{"key": "DATA-1"}]
+    mock_request.assert_called_once()
+    assert mock_request.call_args.kwargs["params"]["fields"] == "summary,comment"
+
+
+@patch.object(JiraClient, "_request")
+def test_get_active_issues_updated_within(mock_request):
+    client = JiraClient(
+        base_url="https://example.atlassian.net",
+        email="test@example.com",
+        api_token="test-token"
+    )
+    mock_request.reset_mock()
+    mock_request.side_effect = None
+    mock_request.return_value = {"issues": [], "total": 0}
+
+    client.get_active_issues(updated_within_minutes=5)
+
+    jql = mock_request.call_args.kwargs["params"]["jql"]
+    assert jql == (
+        'assignee = currentUser() AND statusCategory != Done '
+        'AND updated >= "-5m" ORDER BY created DESC'
+    )
+
+
+@patch.object(JiraClient, "_request")
+def test_get_active_issues_include_keys(mock_request):
+    client = JiraClient(
+        base_url="https://example.atlassian.net",
+        email="test@example.com",
+        api_token="test-token",
+    )
+    mock_request.reset_mock()
+    mock_request.return_value = {"issues": [], "total": 0}
+
+    client.get_active_issues(updated_within_minutes=5, include_keys=["DATA-1", "DATA-2"])
+
+    params = mock_request.call_args.kwargs["params"]
+    assert params["jql"] == (
+        'assignee = currentUser() AND statusCategory != Done AND '
+        '(updated >= "-5m" OR key in (DATA-1, DATA-2)) ORDER BY created DESC'
+    )
+    assert params["validateQuery"] == "warn"
+
+
 @patch.object(JiraClient, "_request")
 def test_update_issue_success(mock_request):
     # Mock the init call (to avoid actual requests)
@@ -421,6 +612,99 @@ def test_transition_issue_success(mock_get_transitions, mock_request):
 
     assert result == expected_response
 
+@patch.object(JiraClient, "_request")
+@patch.object(JiraClient, "get_available_transitions")
+def test_transition_issue_uses_cached_transition_id(mock_get_transitions, mock_request):
+    client = JiraClient(
+        base_url="https://example.atlassian.net",
+        email="test@example.com",
+        api_token="test-token"
+    )
+    mock_get_transitions.return_value = [
+        {"id": "11", "name": "To Do"},
+        {"id": "21", "name": "In Progress"},
+    ]
+    mock_request.reset_mock()
+    mock_request.return_value = {}
+    context = {"project_key": "DATA", "issue_type": "Task", "current_status": "To Do"}
+
+    client.transition_issue("DATA-1", "In Progress", **context)
+    client.transition_issue("DATA-2", "In Progress", **context)
+
+    # transitions are looked up only for the first issue
+    mock_get_transitions.assert_called_once_with(issue_key="DATA-1")
+    mock_request.assert_called_with(
+        method="post",
+        url="https://example.atlassian.net/rest/api/2/issue/DATA-2/transitions",
+        json={"transition": {"id": "21"}},
+    )
+    assert mock_request.call_count == 2
+
+
+@patch.object(JiraClient, "_request")
+@patch.object(JiraClient, "get_available_transitions")
+def test_transition_issue_invalidates_rejected_cache(mock_get_transitions, mock_request):
+    client = JiraClient(
+        base_url="https://example.atlassian.net",
+        email="test@example.com",
+        api_token="test-token"
+    )
+    context = {"project_key": "DATA", "issue_type": "Task", "current_status": "To Do"}
+    client._cache_transitions(
+        client._get_transition_cache_key("DATA", "Task", "To Do"),
+        [{"id": "99", "name": "In Progress"}],
+    )
+    mock_get_transitions.return_value = [{"id": "21", "name": "In Progress"}]
+    mock_request.reset_mock()
+    mock_request.side_effect = [JiraBadRequestError("Bad Request"), {"transitioned": True}]
+
+    result = client.transition_issue("DATA-1", "In Progress", **context)
+
+    assert result == {"transitioned": True}
+    mock_get_transitions.assert_called_once_with(issue_key="DATA-1")
+    assert mock_request.call_args.kwargs["json"] == {"transition": {"id": "21"}}
+    assert client._get_cached_transition_id(
+        client._get_transition_cache_key("DATA", "Task", "To Do"), "In Progress"
+    ) == "21"
+
+
+@patch.object(JiraClient, "_request")
+@patch.object(JiraClient, "get_available_transitions")
+def test_transition_issue_keeps_cache_on_other_errors(mock_get_transitions, mock_request):
+    client = JiraClient(
+        base_url="https://example.atlassian.net",
+        email="test@example.com",
+        api_token="test-token"
+    )
+    context = {"project_key": "DATA", "issue_type": "Task", "current_status": "To Do"}
+    key = client._get_transition_cache_key("DATA", "Task", "To Do")
+    client._cache_transitions(key, [{"id": "21", "name": "In Progress"}])
+    mock_request.reset_mock()
+
+    # a missing issue (404) or a missing permission isn't a stale transition id
+    for error in (ValueError("Resource not found"), PermissionError("Forbidden")):
+        mock_request.side_effect = error
+        with pytest.raises(type(error)):
+            client.transition_issue("DATA-1", "In Progress", **context)
+
+    mock_get_transitions.assert_not_called()
+    assert client._get_cached_transition_id(key, "In Progress") == "21"
+
+
+@patch.object(JiraClient, "_request", return_value={"accountId": "dummy-id"})
+def test_transition_cache_expires(mock_request):
+    client = JiraClient(
+        base_url="https://example.atlassian.net",
+        email="test@example.com",
+        api_token="test-token",
+        transition_cache_ttl=0,
+    )
+    key = client._get_transition_cache_key("DATA", "Task", "To Do")
+    client._cache_transitions(key, [{"id": "21", "name": "In Progress"}])
+
+    assert client._get_cached_transition_id(key, "In Progress") is None
+
+
 @patch.object(JiraClient, "_request")
 def test_search_issues_pagination(mock_request):
     client = JiraClient(
@@ -504,6 +788,8 @@ def test_extract_issue_details_with_string_description(mock_request):
     assert details["summary"] == "Test issue summary"
     assert details["description"] == "Simple description string"
     assert details["status"] == "Open"
+    assert details["project"] is None
+    assert details["issue_type"] is None
     assert details["assignee"]["account_id"] == "acc-1"
     assert details["assignee"]["name"] == "John Doe"
     assert details["assignee"]["email"] == "john@example.com"
@@ -513,4 +799,17 @@ def test_extract_issue_details_with_string_description(mock_request):
     assert details["priority"] == "High"
     assert details["due_date"] == "2025-06-30"
     assert details["created_date"] == "2025-01-01T12:00:00.000+0000"
-    assert details["updated_date"] == "2025-01-02T15:00:00.000+0000"
\ No newline at end of file
+    assert details["updated_date"] == "2025-01-02T15:00:00.000+0000"
+
+@patch("src.clients.jira_client.requests.Session.request")
+def test_handle_response_without_content(mock_request):
+    client = JiraClient(
+        base_url="https://example.atlassian.net",
+        email="test@example.com",
+        api_token="test-token"
+    )
+    response = MagicMock(status_code=204)
+    response.raise_for_status.return_value = response
+    mock_request.return_value = response
+
+    assert client._request(method="post", url="https://example.atlassian.net/x") is None
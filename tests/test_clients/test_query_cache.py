@@ -0,0 +1,64 @@
+import numpy as np
+
+from src.clients.db_client import DatabaseClient
+from src.clients.query_cache import QueryCache, normalize_sql
+from src.models.schemas import QueryResult
+
+
+def test_normalize_sql() -> None:
+    """Whitespace, case and table aliases don't change the cache key."""
+    key = normalize_sql("SELECT s.price FROM sales s WHERE s.id = 1", "sqlite")
+    assert key == normalize_sql(
+        "select   X.price\nFROM Sales AS x where x.id=1", "sqlite"
+    )
+    # output column names define the result, so they are part of the key
+    assert key != normalize_sql("SELECT s.price AS p FROM sales s WHERE s.id = 1", "sqlite")
+    # only single read-only statements are cacheable
+    assert normalize_sql("DELETE FROM sales", "sqlite") is None
+    assert normalize_sql("SELECT 1; SELECT 2", "sqlite") is None
+
+
+def test_query_cache_lru_and_budget() -> None:
+    """Least recently used entries are evicted to stay within the limits."""
+    result = QueryResult(
+        columns={"n": np.arange(100, dtype=np.int64)}, row_count=100,
+        column_names=["n"], execution_time_ms=1.0,
+    )
+    cache = QueryCache(max_entries=2, max_bytes=2000)
+
+    cache.put("a", None, result)
+    cache.put("b", None, result)
+    assert cache.get("a") is not None  # "b" is now the least recently used
+    cache.put("c", None, result)
+
+    assert cache.get("b") is None
+    assert cache.get("a", version="new") is None  # stale version
+    stats = cache.get_stats()
+    assert stats["evictions"] == 1
+    assert stats["entries"] == 1
+    assert stats["hits"] == 1 and stats["misses"] == 2
+
+    cache.put("big", None, result.model_copy(update={"columns": {"n": np.zeros(1000)}}))
+    assert cache.get("big") is None
+
+
+def test_execute_query_cache_invalidation(tmp_path) -> None:
+    """Cached results are reused until the SQLite file changes."""
+    client = DatabaseClient(f"sqlite:///{tmp_path / 'test.db'}", query_cache=QueryCache())
+    with client.engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE sales (price REAL)")
+        conn.exec_driver_sql("INSERT INTO sales VALUES (10)")
+
+    first = client.execute_query("SELECT SUM(price) AS total FROM sales")
+    second = client.execute_query("select sum(price) as total\nfrom sales")
+    assert second.data[0] == first.data[0] == {"total": 10.0}
+    assert client.query_cache.get_stats()["hits"] == 1
+
+    with client.engine.begin() as conn:
+        conn.exec_driver_sql("INSERT INTO sales VALUES (5)")
+
+    assert client.execute_query("SELECT SUM(price) AS total FROM sales").data[0] == {
+        "total": 15.0
+    }
+    assert client.query_cache.get_stats()["hits"] == 1
+    client.close()
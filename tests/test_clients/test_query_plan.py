@@ -0,0 +1,22 @@
+from src.clients.query_plan import estimate_sqlite_plan, get_table_aliases
+
+
+def test_estimate_sqlite_plan_formats() -> None:
+    """Plans of SQLite >= 3.36 and of older versions ("SCAN TABLE x") cost the same."""
+    sql_query = "SELECT * FROM sales s JOIN customers c ON c.id = s.customer_id"
+    aliases = get_table_aliases(sql_query, "sqlite")
+    table_rows = {"sales": 2_000_000, "customers": 1023}
+
+    current = [
+        (2, 0, 0, "SCAN s"),
+        (3, 0, 0, "SEARCH c USING INTEGER PRIMARY KEY (rowid=?)"),
+    ]
+    legacy = [
+        (0, 0, 0, "SCAN TABLE sales AS s"),
+        (0, 0, 0, "SEARCH TABLE customers AS c USING INTEGER PRIMARY KEY (rowid=?)"),
+    ]
+
+    for plan_rows in (current, legacy):
+        cost, full_scans = estimate_sqlite_plan(plan_rows, aliases, table_rows, 1_000_000)
+        assert cost == 2_000_000 * 10
+        assert full_scans == ["sales"]
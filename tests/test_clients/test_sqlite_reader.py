@@ -0,0 +1,129 @@
+import sqlite3
+
+import numpy as np
+import pytest
+
+from src.clients.db_client import DatabaseClient
+from src.clients.sqlite_reader import get_declared_types, get_type_affinity, read_sqlite_query
+from src.models.schemas import ColumnInfo, TableInfo
+
+
+@pytest.fixture
+def connection():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE sales (id INTEGER, price REAL, model TEXT, discount INTEGER)")
+    conn.executemany(
+        "INSERT INTO sales VALUES (?, ?, ?, ?)",
+        [(1, 10.5, "911", 5), (2, 20.0, "Taycan", None), (3, 30.25, None, 7)],
+    )
+    yield conn
+    conn.close()
+
+
+@pytest.mark.parametrize(
+    "declared_type, kind",
+    [
+        ("INTEGER", "int"),
+        ("BIGINT", "int"),
+        ("VARCHAR(50)", "object"),
+        ("DOUBLE PRECISION", "float"),
+        ("NUMERIC", None),
+        (None, None),
+    ],
+)
+def test_get_type_affinity(declared_type, kind) -> None:
+    """Declared types follow the SQLite affinity rules."""
+    assert get_type_affinity(declared_type) == kind
+
+
+def test_get_declared_types() -> None:
+    """Plain and aliased columns of the referenced tables are typed."""
+    tables = {
+        "sales": TableInfo(
+            name="sales",
+            columns=[
+                ColumnInfo(name="id", data_type="INTEGER"),
+                ColumnInfo(name="price", data_type="REAL"),
+            ],
+        ),
+        "models": TableInfo(
+            name="models",
+            columns=[
+                ColumnInfo(name="id", data_type="TEXT"),
+                ColumnInfo(name="name", data_type="TEXT"),
+            ],
+        ),
+    }
+
+    declared = get_declared_types(
+        "SELECT s.price AS revenue, m.name FROM sales s JOIN models m ON m.id = s.id",
+        tables,
+    )
+
+    assert declared["revenue"] == "REAL"
+    assert declared["name"] == "TEXT"
+    assert "id" not in declared  # ambiguous between the two tables
+
+
+def test_read_sqlite_query_dtypes(connection) -> None:
+    """Numeric columns are read into int64/float64 arrays, NULLs demote to NaN."""
+    names, columns, row_count = read_sqlite_query(
+        connection,
+        "SELECT id, price, model, discount FROM sales ORDER BY id",
+        {"id": "INTEGER", "price": "REAL", "discount": "INTEGER"},
+        fetch_size=2,
+    )
+
+    assert names == ["id", "price", "model", "discount"]
+    assert row_count == 3
+    assert columns["id"].dtype == np.int64
+    assert columns["price"].dtype == np.float64
+    assert columns["model"].dtype == object
+    assert columns["model"].tolist() == ["911", "Taycan", None]
+    assert columns["discount"].dtype == np.float64
+    np.testing.assert_array_equal(columns["discount"], [5.0, np.nan, 7.0])
+
+
+def test_read_sqlite_query_mixed_types(connection) -> None:
+    """Values that don't fit the column kind demote it to Python objects."""
+    connection.execute("INSERT INTO sales VALUES (4, 1.0, 'Macan', 'n/a')")
+
+    _, columns, _ = read_sqlite_query(
+        connection, "SELECT discount FROM sales ORDER BY id", {"discount": "INTEGER"}
+    )
+
+    assert columns["discount"].dtype == object
+    assert columns["discount"].tolist() == [5, None, 7, "n/a"]
+
+
+def test_read_sqlite_query_empty_result(connection) -> None:
+    """An empty result keeps its columns."""
+    names, columns, row_count = read_sqlite_query(
+        connection, "SELECT id, model FROM sales WHERE id > 10"
+    )
+
+    assert names == ["id", "model"]
+    assert row_count == 0
+    assert len(columns["id"]) == 0
+
+
+def test_execute_query_sqlite_fast_path_matches_pandas(tmp_path) -> None:
+    """The SQLite reader returns the same result as the pandas path."""
+    url = f"sqlite:///{tmp_path / 'test.db'}"
+    conn = sqlite3.connect(tmp_path / "test.db")
+    conn.execute("CREATE TABLE sales (id INTEGER, price REAL, model TEXT)")
+    conn.executemany(
+        "INSERT INTO sales VALUES (?, ?, ?)",
+        [(i, i * 1.5, f"model_{i % 3}") for i in range(100)],
+    )
+    conn.commit()
+    conn.close()
+
+    query = "SELECT model, SUM(price) AS revenue, COUNT(*) AS n FROM sales GROUP BY model"
+    fast = DatabaseClient(url).execute_query(query)
+    slow = DatabaseClient(url, sqlite_fast_path=False).execute_query(query)
+
+    assert fast.column_names == slow.column_names
+    assert fast.data == slow.data
+    for name in fast.column_names:
+        assert fast.columns[name].dtype == slow.columns[name].dtype
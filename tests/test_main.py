@@ -5,7 +5,14 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from main import get_active_issue_ids_from_jira, get_jira_tickets
+from main import (
+    JIRA_SEARCH_WORKERS,
+    get_active_issue_ids_from_jira,
+    get_jira_tickets,
+    run_polling_cycle,
+)
+from src.clients.jira_client import ISSUE_DETAIL_FIELDS
+from src.models.schemas import TicketRunSummary
 
 @pytest.fixture
 def mock_jira_client() -> MagicMock:
@@ -16,7 +23,6 @@ def mock_jira_client() -> MagicMock:
 
 
 def test_get_jira_tickets(mock_jira_client: MagicMock) -> None:
-    mock_jira_client.get_issue.return_value = MagicMock()
     mock_jira_client.extract_issue_details.side_effect = [
         {
             "ticket_id": "DATA-1",
@@ -32,10 +38,134 @@ def test_get_jira_tickets(mock_jira_client: MagicMock) -> None:
         },
     ]
 
-    with patch("main.get_active_issue_ids_from_jira", return_value=["DATA-1", "DATA-2"]):
-        result = get_jira_tickets(mock_jira_client, ["DATA-1", "DATA-2"])
+    issues = [{"key": "DATA-1", "fields": {}}, {"key": "DATA-2", "fields": {}}]
+    result = get_jira_tickets(mock_jira_client, issues)
 
     assert isinstance(result, list)
     assert len(result) == 2
     assert result[0]["ticket_id"] == "DATA-1"
     assert result[0]["summary"] == "Test Ticket"
+    # payloads from search are reused -> no extra intake round trips
+    mock_jira_client.get_issue.assert_not_called()
+    mock_jira_client.get_active_issues.assert_not_called()
+    mock_jira_client.extract_issue_details.assert_any_call(issues[0])
+
+
+def test_get_active_issue_ids_from_jira(
+    mock_jira_client: MagicMock,
+    sample_issue_comments_empty: dict,
+    sample_issue_comments_with_bot_last: dict,
+    sample_issue_comments_with_user_last: dict,
+) -> None:
+    mock_jira_client.get_active_issues.return_value = [
+        {"key": "DATA-1", "fields": {"comment": sample_issue_comments_with_bot_last}},
+        {"key": "DATA-2", "fields": {"comment": sample_issue_comments_with_user_last}},
+        {"key": "DATA-3", "fields": {"comment": sample_issue_comments_empty}},
+    ]
+
+    result = get_active_issue_ids_from_jira(mock_jira_client)
+
+    assert result == ["DATA-2", "DATA-3"]
+    mock_jira_client.get_active_issues.assert_called_once_with(
+        fields=ISSUE_DETAIL_FIELDS + ["comment"],
+        max_workers=JIRA_SEARCH_WORKERS,
+        updated_within_minutes=None,
+        include_keys=None,
+    )
+    mock_jira_client.get_comments.assert_not_called()
+
+
+def test_get_active_issue_ids_from_jira_truncated_comments(
+    mock_jira_client: MagicMock,
+    sample_issue_comments_with_bot_last: dict,
+    sample_issue_comments_with_user_last: dict,
+) -> None:
+    # search returned only the first comment out of two
+    truncated = {"comments": sample_issue_comments_with_user_last["comments"][:1], "total": 2}
+    mock_jira_client.get_active_issues.return_value = [
+        {"key": "DATA-1", "fields": {"comment": truncated}},
+    ]
+    mock_jira_client.get_comments.return_value = sample_issue_comments_with_user_last
+
+    result = get_active_issue_ids_from_jira(mock_jira_client)
+
+    assert result == ["DATA-1"]
+    mock_jira_client.get_comments.assert_called_once_with(issue_key="DATA-1")
+
+
+def test_run_polling_cycle_incremental(mock_jira_client: MagicMock) -> None:
+    mock_jira_client.get_active_issues.return_value = [{"key": "DATA-1", "fields": {}}]
+    mock_jira_client.request_count = 0
+    mock_jira_client.extract_issue_details.return_value = {
+        "ticket_id": "DATA-1",
+        "summary": "Test Ticket",
+        "description": "Desc 1",
+        "status": "Open",
+        "project": "DATA",
+        "issue_type": "Task",
+    }
+    agent = MagicMock()
+    agent.jira_client = mock_jira_client
+
+    assert run_polling_cycle(mock_jira_client, agent, updated_within_minutes=5)
+
+    assert mock_jira_client.get_active_issues.call_args.kwargs["updated_within_minutes"] == 5
+    tickets = agent.process_tickets.call_args.kwargs["tickets"]
+    assert [ticket.ticket_id for ticket in tickets] == ["DATA-1"]
+
+
+def test_run_polling_cycle_failure(mock_jira_client: MagicMock) -> None:
+    mock_jira_client.get_active_issues.side_effect = ConnectionError("Jira is down")
+    mock_jira_client.request_count = 0
+    agent = MagicMock()
+    agent.jira_client = mock_jira_client
+
+    assert not run_polling_cycle(mock_jira_client, agent)
+    agent.process_tickets.assert_not_called()
+
+
+def test_run_polling_cycle_retries_failed_tickets(mock_jira_client: MagicMock) -> None:
+    """A failed ticket is fetched again by the next cycle although nobody updated it."""
+    mock_jira_client.request_count = 0
+    mock_jira_client.get_active_issues.return_value = [
+        {"key": "DATA-1", "fields": {}},
+        {"key": "DATA-2", "fields": {}},
+    ]
+    mock_jira_client.extract_issue_details.side_effect = lambda issue: {
+        "ticket_id": issue["key"],
+        "summary": "Test Ticket",
+        "description": "Desc",
+        "status": "Open",
+        "project": "DATA",
+        "issue_type": "Task",
+    }
+    agent = MagicMock()
+    agent.jira_client = mock_jira_client
+    agent.process_tickets.return_value = [
+        TicketRunSummary(ticket_id="DATA-1", succeeded=True, wall_time_ms=1.0),
+        TicketRunSummary(
+            ticket_id="DATA-2", succeeded=False, wall_time_ms=1.0, error="LLM is down"
+        ),
+    ]
+    failed_ticket_ids = set()
+
+    assert run_polling_cycle(mock_jira_client, agent, failed_ticket_ids=failed_ticket_ids)
+    assert failed_ticket_ids == {"DATA-2"}
+
+    # the next cycle re-includes the failed ticket, its success clears it
+    mock_jira_client.get_active_issues.return_value = [{"key": "DATA-2", "fields": {}}]
+    agent.process_tickets.return_value = [
+        TicketRunSummary(ticket_id="DATA-2", succeeded=True, wall_time_ms=1.0)
+    ]
+    assert run_polling_cycle(
+        mock_jira_client, agent, updated_within_minutes=2, failed_ticket_ids=failed_ticket_ids
+    )
+    assert mock_jira_client.get_active_issues.call_args.kwargs["include_keys"] == ["DATA-2"]
+    assert failed_ticket_ids == set()
+
+    # a failed cycle keeps the tickets to retry
+    failed_ticket_ids.add("DATA-3")
+    mock_jira_client.get_active_issues.side_effect = ConnectionError("Jira is down")
+    assert not run_polling_cycle(mock_jira_client, agent, failed_ticket_ids=failed_ticket_ids)
+    assert failed_ticket_ids == {"DATA-3"}
+
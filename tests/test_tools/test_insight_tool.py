@@ -1,3 +1,4 @@
+import numpy as np
 from unittest.mock import patch, MagicMock
 from src.tools.insight_tool import InsightTool
 from src.models.schemas import QueryResult
@@ -46,3 +47,24 @@ def test_generate_insights_success(mock_logger) -> None:
     assert insight_text == "This is a test insight."
     mock_llm.invoke.assert_called_once()
     mock_logger.info.assert_called()  # Now this should work correctly
+
+
+def test_format_result_summary_approximate() -> None:
+    """Approximate results are flagged and every aggregate shows its error bound."""
+    query_result = QueryResult(
+        data=[{"region": "EU", "revenue": 1000.0}],
+        row_count=1,
+        column_names=["region", "revenue"],
+        execution_time_ms=1.0,
+    ).model_copy(
+        update={
+            "is_approximate": True,
+            "sample_fraction": 0.01,
+            "error_bounds": {"revenue": np.array([25.0])},
+        }
+    )
+
+    summary = InsightTool(llm=MagicMock()).format_result_summary(query_result)
+
+    assert "approximate, computed on a 1.00% uniform sample" in summary
+    assert "error bounds: {'revenue': '±25'}" in summary
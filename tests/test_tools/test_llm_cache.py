@@ -0,0 +1,151 @@
+from unittest.mock import MagicMock
+
+from langchain_core.prompts import PromptTemplate
+
+from src.models.schemas import QueryResult
+from src.tools.insight_tool import InsightTool
+from src.tools.llm_cache import CachedLLM, LLMResponseCache, make_cache_key
+from src.tools.sql_tool import SQLTool
+
+
+def _llm(content="SELECT 1", model_name="gpt-4", temperature=0.1, max_tokens=1500):
+    llm = MagicMock(model_name=model_name, temperature=temperature, max_tokens=max_tokens)
+    llm.invoke.return_value.content = content
+    return llm
+
+
+def test_cache_key_depends_on_model_parameters():
+    key = make_cache_key("gpt-4", 0.1, 1500, "prompt")
+
+    assert key == make_cache_key("gpt-4", 0.1, 1500, "prompt")
+    assert key != make_cache_key("gpt-4o", 0.1, 1500, "prompt")
+    assert key != make_cache_key("gpt-4", 0.0, 1500, "prompt")
+    assert key != make_cache_key("gpt-4", 0.1, 500, "prompt")
+    assert key != make_cache_key("gpt-4", 0.1, 1500, "prompt ")
+
+
+def test_cached_llm_skips_repeated_prompts():
+    llm = _llm()
+    cached_llm = CachedLLM(llm, LLMResponseCache(), tool="sql_generation")
+
+    assert cached_llm.invoke("prompt").content == "SELECT 1"
+    assert cached_llm.invoke("prompt").content == "SELECT 1"
+    cached_llm.invoke("other prompt")
+
+    assert llm.invoke.call_count == 2
+    assert cached_llm.model_name == "gpt-4"  # attributes of the wrapped LLM
+
+
+def test_cached_llm_keys_prompt_values_by_text():
+    llm = _llm()
+    cached_llm = CachedLLM(llm, LLMResponseCache(), tool="insight")
+    template = PromptTemplate.from_template("Summarize {data}")
+
+    cached_llm.invoke(template.format_prompt(data="rows"))
+    cached_llm.invoke("Summarize rows")
+
+    llm.invoke.assert_called_once()
+
+
+def test_cache_is_shared_by_models_with_same_parameters_only():
+    cache = LLMResponseCache()
+    gpt4, cold_gpt4 = _llm("a"), _llm("b", temperature=0.0)
+
+    CachedLLM(gpt4, cache, tool="sql_generation").invoke("prompt")
+
+    assert CachedLLM(_llm("c"), cache, tool="insight").invoke("prompt").content == "a"
+    assert CachedLLM(cold_gpt4, cache, tool="insight").invoke("prompt").content == "b"
+
+
+def test_cache_memory_eviction_and_persistence(tmp_path):
+    """Responses evicted from memory are still served by the file, also after restarts."""
+    path = str(tmp_path / "llm_cache.db")
+    cache = LLMResponseCache(path, max_entries=1)
+    cache.put("a", "response a")
+    cache.put("b", "response b")
+
+    assert list(cache._entries) == ["b"]
+    assert cache.get("a") == "response a"
+    cache.close()
+
+    reopened = LLMResponseCache(path)
+    assert reopened.get("b") == "response b"
+    assert reopened.get("c") is None
+    assert reopened.get_stats()["persistent_hits"] == 1
+
+
+def test_cache_persistent_eviction(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "llm_cache.db"), max_persistent_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, f"response {key}")
+
+    rows = cache._conn.execute("SELECT key FROM llm_responses ORDER BY key").fetchall()
+    assert rows == [("b",), ("c",)]
+
+
+def test_cache_stats_by_tool():
+    cache = LLMResponseCache()
+    sql_llm = CachedLLM(_llm(), cache, tool="sql_generation")
+    insight_llm = CachedLLM(_llm("insight"), cache, tool="insight")
+
+    for _ in range(3):
+        sql_llm.invoke("sql prompt")
+    insight_llm.invoke("insight prompt")
+
+    stats = cache.get_stats()
+    assert stats["tools"]["sql_generation"] == {"hits": 2, "misses": 1, "hit_rate": 2 / 3}
+    assert stats["tools"]["insight"] == {"hits": 0, "misses": 1, "hit_rate": 0.0}
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (2, 2, 0.5)
+
+
+def test_tools_use_cached_responses():
+    llm = _llm()
+    cache = LLMResponseCache()
+    sql_tool = SQLTool(
+        llm=CachedLLM(llm, cache, tool="sql_generation"),
+        db_schema={"models": [{"column_name": "model_id", "data_type": "INTEGER"}]},
+    )
+
+    assert sql_tool.generate_query("Count models") == "SELECT 1"
+    assert sql_tool.generate_query("Count models") == "SELECT 1"
+    llm.invoke.assert_called_once()
+
+    llm.invoke.return_value.content = "Sales grew."
+    insight_tool = InsightTool(llm=CachedLLM(llm, cache, tool="insight"))
+    result = QueryResult(
+        data=[{"year": 2024}], row_count=1, column_names=["year"], execution_time_ms=1.0
+    )
+    first = insight_tool.generate_insights("Sales per year", result)
+    second = insight_tool.generate_insights("Sales per year", result)
+
+    assert first == second
+    assert llm.invoke.call_count == 2
+
+
+def test_cache_invalidate_response(tmp_path):
+    """A rejected response is dropped from memory and from the file."""
+    path = str(tmp_path / "llm_cache.db")
+    cache = LLMResponseCache(path)
+    cache.put("a", "SELECT bad\n")
+    cache.put("b", "SELECT 1")
+
+    assert cache.invalidate_response("SELECT bad") == 1
+    assert cache.get("a") is None
+    assert LLMResponseCache(path).get("a") is None
+    assert cache.get("b") == "SELECT 1"
+
+
+def test_sql_tool_forgets_rejected_query():
+    """The same prompt reaches the LLM again once its SQL was rejected."""
+    llm = _llm("SELECT bad")
+    tool = SQLTool(
+        llm=CachedLLM(llm, LLMResponseCache(), tool="sql_generation"),
+        db_schema={"models": [{"column_name": "model_id", "data_type": "INTEGER"}]},
+    )
+    assert tool.generate_query("Count models") == "SELECT bad"
+
+    tool.forget_query("SELECT bad")
+    llm.invoke.return_value.content = "SELECT count(*) FROM models"
+
+    assert tool.generate_query("Count models") == "SELECT count(*) FROM models"
+    assert llm.invoke.call_count == 2
@@ -0,0 +1,150 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.models.schemas import ColumnInfo, ForeignKeyInfo, TableInfo
+from src.tools.schema_retriever import SchemaRetriever, tokenize
+from src.tools.sql_tool import SQLTool
+
+
+def _table(name, columns, foreign_keys=()):
+    return TableInfo(
+        name=name,
+        columns=[ColumnInfo(name=column, data_type=type_) for column, type_ in columns],
+        foreign_keys=[
+            ForeignKeyInfo(
+                columns=[column], referred_table=table, referred_columns=[referred]
+            )
+            for column, table, referred in foreign_keys
+        ],
+    )
+
+
+@pytest.fixture
+def tables():
+    return {
+        "models": _table("models", [("model_id", "INTEGER"), ("segment", "TEXT")]),
+        "dealerships": _table(
+            "dealerships", [("dealership_id", "INTEGER"), ("region", "TEXT")]
+        ),
+        "customers": _table(
+            "customers", [("customer_id", "INTEGER"), ("email", "TEXT")]
+        ),
+        "sales": _table(
+            "sales",
+            [
+                ("sale_id", "INTEGER"),
+                ("model_id", "INTEGER"),
+                ("dealership_id", "INTEGER"),
+            ],
+            foreign_keys=[
+                ("model_id", "models", "model_id"),
+                ("dealership_id", "dealerships", "dealership_id"),
+            ],
+        ),
+        "weather": _table("weather", [("day", "TEXT"), ("temperature", "REAL")]),
+    }
+
+
+def test_tokenize():
+    assert tokenize("Dealerships sales_records by Categories") == [
+        "dealership",
+        "sale",
+        "record",
+        "by",
+        "category",
+    ]
+
+
+def test_retrieve_adds_join_path(tables):
+    """Tables joined through a table that isn't named are connected by their FK path."""
+    retriever = SchemaRetriever(tables, top_k=2)
+
+    selected = retriever.retrieve("Number of cars per segment and region")
+
+    assert sorted(selected) == ["dealerships", "models", "sales"]
+
+
+def test_retrieve_uses_sample_values(tables):
+    """Values of text columns make a table relevant (e.g. "Cayenne" -> models)."""
+    retriever = SchemaRetriever(
+        tables, sample_values={"models": ["Cayenne", "SUV"]}, top_k=1
+    )
+
+    assert retriever.retrieve("How many Cayenne were there?") == ["models"]
+
+
+def test_get_schema(tables):
+    """The pruned schema keeps the FK references between selected tables."""
+    retriever = SchemaRetriever(tables, top_k=2)
+
+    schema = retriever.get_schema("Sales per model")
+
+    assert set(schema) == {"sales", "models"}
+    assert {
+        "column_name": "model_id",
+        "data_type": "INTEGER",
+        "references": "models.model_id",
+    } in schema["sales"]
+    assert retriever.get_schema("Nothing relevant here") is None  # full schema
+
+
+def test_from_database_indexes_column_values(tables):
+    db_client = MagicMock()
+    db_client.get_schema_catalog.return_value = {"models": tables["models"]}
+    db_client.get_column_values.return_value = {"models": {"segment": ["SUV"]}}
+
+    retriever = SchemaRetriever.from_database(
+        db_client, top_k=1, sample_values_per_column=3
+    )
+
+    db_client.get_column_values.assert_called_once_with(
+        {"models": tables["models"]}, values_per_column=3
+    )
+    db_client.execute_query.assert_not_called()
+    assert retriever.documents["models"]["suv"] == 1
+
+
+def test_sql_tool_prompts_pruned_schema(tables):
+    """The first attempt sees the relevant tables, retries the full schema."""
+    mock_llm = MagicMock()
+    schema_dict = {
+        name: [{"column_name": c.name, "data_type": c.data_type} for c in table.columns]
+        for name, table in tables.items()
+    }
+    tool = SQLTool(
+        llm=mock_llm,
+        db_schema=schema_dict,
+        schema_retriever=SchemaRetriever(tables, top_k=1),
+        prune_schema=True,
+    )
+
+    tool.generate_query(task_description="Weather temperature per day")
+    tool.generate_query(task_description="Weather temperature per day", full_schema=True)
+    pruned, full = [call.args[0] for call in mock_llm.invoke.call_args_list]
+
+    assert "Table: weather" in pruned and "Table: sales" not in pruned
+    assert "Table: sales" in full
+
+
+def test_sql_tool_hints_relevant_tables(tables):
+    """Without pruning every prompt starts with the full schema prefix."""
+    mock_llm = MagicMock()
+    schema_dict = {
+        name: [{"column_name": c.name, "data_type": c.data_type} for c in table.columns]
+        for name, table in tables.items()
+    }
+    tool = SQLTool(
+        llm=mock_llm,
+        db_schema=schema_dict,
+        schema_retriever=SchemaRetriever(tables, top_k=1),
+    )
+
+    tool.generate_query(task_description="Weather temperature per day")
+    tool.generate_query(task_description="Number of customers per email")
+    weather, customers = [call.args[0] for call in mock_llm.invoke.call_args_list]
+
+    assert weather.startswith(tool.prompt_prefix)
+    assert customers.startswith(tool.prompt_prefix)
+    assert weather.endswith("join others only if required):\nweather\n")
+    assert "customers\n" in customers[len(tool.prompt_prefix):]
@@ -0,0 +1,157 @@
+from unittest.mock import MagicMock
+
+from src.tools.semantic_cache import (
+    HashingEmbeddings,
+    SemanticCache,
+    extract_literals,
+    extract_terms,
+)
+from src.tools.sql_tool import SQLTool
+
+TASK = "Which regions have the most dealerships? Sort by dealership_count."
+
+
+def test_semantic_cache_hit_and_miss(tmp_path) -> None:
+    """Near-identical tasks hit, different tasks and schema versions miss."""
+    cache = SemanticCache(str(tmp_path / "cache.db"))
+    cache.put(TASK, "SELECT region FROM dealerships", schema_version="v1")
+
+    assert cache.get(TASK.replace("?", "!"), "v1") == "SELECT region FROM dealerships"
+    assert cache.get("Average sale price per car model", "v1") is None
+    assert cache.get(TASK, "v2") is None  # the schema changed
+    assert cache.get_stats() == {"entries": 1, "hits": 1, "misses": 2, "hit_rate": 1 / 3}
+
+
+def test_semantic_cache_threshold_separates_close_tasks(tmp_path) -> None:
+    """A single different word in a short task stays below the default threshold."""
+    cache = SemanticCache(str(tmp_path / "cache.db"))
+    cache.put("Sort the dealerships in ascending order", "SELECT 1", "v1")
+
+    assert cache.get("Sort the dealerships in descending order", "v1") is None
+
+
+def test_semantic_cache_persistence_and_eviction(tmp_path) -> None:
+    """Entries survive restarts, the least recently used ones are evicted."""
+    path = str(tmp_path / "cache.db")
+    cache = SemanticCache(path, max_entries=2)
+    cache.put("count models", "SELECT 1", "v1")
+    cache.put("count dealerships", "SELECT 2", "v1")
+    assert cache.get("count models", "v1") == "SELECT 1"  # most recently used
+    cache.put("count customers", "SELECT 3", "v1")
+    cache.close()
+
+    reopened = SemanticCache(path, max_entries=2)
+    assert reopened.get("count models", "v1") == "SELECT 1"
+    assert reopened.get("count dealerships", "v1") is None
+    assert reopened.get("count customers", "v1") == "SELECT 3"
+
+
+def test_semantic_cache_sees_other_process_writes(tmp_path) -> None:
+    """Entries written through another connection are picked up."""
+    path = str(tmp_path / "cache.db")
+    reader, writer = SemanticCache(path), SemanticCache(path)
+    assert reader.get("count models", "v1") is None
+
+    writer.put("count models", "SELECT 1", "v1")
+
+    assert reader.get("count models", "v1") == "SELECT 1"
+
+
+def test_semantic_cache_custom_embeddings(tmp_path) -> None:
+    embeddings = MagicMock()
+    embeddings.embed_query.side_effect = lambda text: (
+        [1.0, 0.0] if "model" in text else [0.0, 1.0]
+    )
+    cache = SemanticCache(str(tmp_path / "cache.db"), embeddings=embeddings)
+    cache.put("count models", "SELECT 1", "v1")
+
+    assert cache.get("how many car models", "v1") == "SELECT 1"
+    assert cache.get("count dealerships", "v1") is None
+
+
+def test_hashing_embeddings_are_deterministic() -> None:
+    embeddings = HashingEmbeddings(dimensions=64)
+    assert embeddings.embed_query(TASK) == embeddings.embed_query(TASK)
+    assert len(embeddings.embed_query(TASK)) == 64
+
+
+def test_sql_tool_semantic_cache(tmp_path) -> None:
+    """A cached task skips the LLM, retries bypass the cache."""
+    mock_llm = MagicMock()
+    mock_llm.invoke.return_value.content = "SELECT 2"
+    tool = SQLTool(
+        llm=mock_llm,
+        db_schema={"dealerships": [{"column_name": "region", "data_type": "TEXT"}]},
+        semantic_cache=SemanticCache(str(tmp_path / "cache.db")),
+    )
+
+    tool.remember_query(TASK, "SELECT 1")
+
+    assert tool.generate_query(task_description=TASK) == "SELECT 1"
+    mock_llm.invoke.assert_not_called()
+    assert tool.generate_query(task_description=TASK, use_cache=False) == "SELECT 2"
+
+    tool.set_schema({"dealerships": []})  # new schema version
+    assert tool.generate_query(task_description=TASK) == "SELECT 2"
+
+
+def test_semantic_cache_requires_same_literals(tmp_path) -> None:
+    """Tasks differing only in a year, a date or a quoted value don't share SQL."""
+    cache = SemanticCache(str(tmp_path / "cache.db"))
+    task = (
+        "Calculate the total revenue in 2023 for every dealership region and car "
+        "segment, include the number of sold cars and the average sale price, and "
+        "sort the results in descending order by the total revenue per region."
+    )
+    cache.put(task, "SELECT 2023", "v1")
+
+    # the hashed embeddings alone can't tell these tasks apart
+    other_year = task.replace("2023", "2024")
+    assert cache._embed(task) @ cache._embed(other_year) >= cache.similarity_threshold
+
+    assert cache.get(other_year, "v1") is None
+    assert cache.get(task.replace("in 2023", "in March 2023"), "v1") is None
+    assert cache.get(task.replace("segment", "segment 'SUV'"), "v1") is None
+    assert cache.get(task.replace(", and", " and"), "v1") == "SELECT 2023"
+
+
+def test_extract_literals() -> None:
+    assert extract_literals("Sales in Q2 2024 vs '911' since 2024-01-31, top 5.5%") == [
+        "'911'",
+        "2",
+        "2024",
+        "2024-01-31",
+        "5.5",
+    ]
+    assert extract_literals("Market share by decade in September") == ["september"]
+
+
+def test_semantic_cache_hashed_embeddings_require_same_terms(tmp_path) -> None:
+    """Without an embedding model, one meaning-changing word is a miss."""
+    cache = SemanticCache(str(tmp_path / "cache.db"))
+    task = (
+        "Calculate the total revenue for every dealership region and car segment, "
+        "include the number of sold cars and the average sale price, and list the "
+        "dealership with the highest total revenue in every region first."
+    )
+    cache.put(task, "SELECT 'highest'", "v1")
+
+    lowest = task.replace("highest", "lowest")
+    # same literals and close enough for the threshold, but a different question
+    assert cache._embed(task) @ cache._embed(lowest) >= cache.similarity_threshold
+    assert extract_literals(task) == extract_literals(lowest)
+
+    assert cache.get(lowest, "v1") is None
+    assert cache.get(task.replace("revenue", "number of units sold"), "v1") is None
+    # stopwords, case, plurals and word order don't matter
+    assert cache.get("please " + task.upper().replace("CARS", "CAR"), "v1") == (
+        "SELECT 'highest'"
+    )
+
+
+def test_extract_terms() -> None:
+    assert extract_terms("Show me the highest sales of the dealerships") == {
+        "highest",
+        "sale",
+        "dealership",
+    }
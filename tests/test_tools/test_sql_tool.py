@@ -47,4 +47,56 @@ def test_generate_query():
     assert isinstance(query, str)
     assert "SELECT * FROM table1" in query
     assert "table1" in query
-    mock_llm.invoke.assert_called_once()
\ No newline at end of file
+    mock_llm.invoke.assert_called_once()
+
+def test_generate_query_reuses_prompt_prefix():
+    """The schema is rendered once, prompts share the prefix and end with the task."""
+    mock_llm = MagicMock()
+    mock_llm.get_num_tokens.return_value = 42
+    schema_dict = {"table1": [{"column_name": "col1", "data_type": "INTEGER"}]}
+    tool = SQLTool(llm=mock_llm, db_schema=schema_dict)
+
+    with patch.object(tool, "_format_schema", wraps=tool._format_schema) as format_schema:
+        tool.generate_query(task_description="Count rows")
+        tool.generate_query(task_description="Sum col1")
+    first, second = [call.args[0] for call in mock_llm.invoke.call_args_list]
+
+    format_schema.assert_not_called()
+    assert first.startswith(tool.prompt_prefix) and second.startswith(tool.prompt_prefix)
+    assert first.index("col1 (INTEGER)") < first.index("Count rows")
+    assert tool.prefix_token_count == 42
+    mock_llm.get_num_tokens.assert_called_once_with(tool.prompt_prefix)
+
+
+def test_set_schema_renders_changed_schema_only():
+    """The prefix is re-rendered when the schema version changes."""
+    mock_llm = MagicMock()
+    tool = SQLTool(llm=mock_llm, db_schema={"table1": []}, schema_version="v1")
+
+    tool.set_schema({"table2": []}, schema_version="v1")
+    assert "table1" in tool.prompt_prefix  # same version, nothing to render
+
+    tool.set_schema({"table2": []})
+    assert "table2" in tool.prompt_prefix and "table1" not in tool.prompt_prefix
+    assert mock_llm.get_num_tokens.call_count == 2
+
+
+def test_generate_query_repairs_previous_query():
+    """A retry prompt carries the failing query and its errors after the request."""
+    mock_llm = MagicMock()
+    mock_llm.invoke.return_value.content = "SELECT col1 FROM table1"
+    schema_dict = {"table1": [{"column_name": "col1", "data_type": "INTEGER"}]}
+    tool = SQLTool(llm=mock_llm, db_schema=schema_dict)
+
+    tool.generate_query(task_description="Get col1")
+    tool.generate_query(
+        task_description="Get col1",
+        previous_sql="SELECT col2 FROM table1",
+        error_feedback="- Column 'col2' doesn't exist in the schema",
+    )
+    first, repair = [call.args[0] for call in mock_llm.invoke.call_args_list]
+
+    assert "PREVIOUS QUERY" not in first
+    assert repair.startswith(first)
+    assert "SELECT col2 FROM table1" in repair
+    assert "Column 'col2' doesn't exist" in repair
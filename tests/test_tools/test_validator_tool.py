@@ -164,3 +164,20 @@ def test_validate_sql_with_errors() -> None:
     tool.check_syntax.assert_called_once()
     tool.check_dangerous_patterns.assert_called_once()
     tool.check_schema_compatibility.assert_called_once()
+
+
+def test_validate_sql_without_dangerous_patterns_check() -> None:
+    """The regex pass is skipped when the database enforces read-only access."""
+    tool = ValidatorTool(
+        schema_dict={"table1": [{"column_name": "col1", "data_type": "INTEGER"}]},
+        check_dangerous=False,
+    )
+
+    tool.check_syntax = MagicMock(return_value=(True, None))
+    tool.check_dangerous_patterns = MagicMock(return_value=(False, "Dangerous operation"))
+    tool.check_schema_compatibility = MagicMock(return_value=(True, None))
+
+    result = tool.validate_sql("SELECT col1 FROM table1")
+
+    assert result.is_valid is True
+    tool.check_dangerous_patterns.assert_not_called()
@@ -0,0 +1,139 @@
+import argparse
+import logging
+import os
+import sys
+import time
+from statistics import mean
+
+import sqlglot
+from sqlglot import exp
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.constants import TICKETS_TO_TEST
+from src.clients.db_client import DatabaseClient
+from src.tools.schema_retriever import SchemaRetriever
+from src.tools.sql_tool import SQLTool
+
+logging.basicConfig(level=logging.ERROR)
+
+DEFAULT_CONNECTION_STRING = "sqlite:///data/porsche_analytics.db"
+
+
+def count_tokens(text: str) -> int:
+    """Tokens of the GPT-4 tokenizer, about 4 characters per token if it is unavailable."""
+    try:
+        import tiktoken
+
+        return len(tiktoken.encoding_for_model("gpt-4").encode(text))
+    except Exception:
+        return round(len(text) / 4)
+
+
+def get_reference_tables(sql: str) -> set:
+    """Tables read by the reference SQL of a ticket (CTEs excluded)."""
+    tree = sqlglot.parse_one(sql, read="sqlite")
+    ctes = {cte.alias_or_name for cte in tree.find_all(exp.CTE)}
+    return {table.name for table in tree.find_all(exp.Table)} - ctes
+
+
+def get_prompt(tool: SQLTool, task: str) -> str:
+    """First SQL generation prompt of a task (prefix, task and relevant tables hint)."""
+    return (
+        tool._get_prompt_prefix(task, full_schema=False)
+        + tool.task_prompt.format(task_description=task)
+        + tool._get_tables_hint(task, full_schema=False)
+    )
+
+
+def measure(connection_string: str, top_k: int, invoke: bool) -> None:
+    """
+    Compare the SQL generation prompts of the test tickets: full schema without
+    retrieval (baseline), full schema with the relevant tables hint (default, the
+    prefix stays cacheable by the provider) and pruned schema ("prune: true").
+    """
+    db_client = DatabaseClient(connection_string, read_only=True)
+    db_schema = db_client.get_database_schema()
+    retriever = SchemaRetriever.from_database(db_client, top_k=top_k)
+
+    llm = None
+    if invoke:
+        from langchain_openai import ChatOpenAI
+
+        llm = ChatOpenAI(model="gpt-4", temperature=0.1, max_tokens=1500)
+    full_tool = SQLTool(llm=llm, db_schema=db_schema)
+    hinted_tool = SQLTool(llm=llm, db_schema=db_schema, schema_retriever=retriever)
+    pruned_tool = SQLTool(
+        llm=llm, db_schema=db_schema, schema_retriever=retriever, prune_schema=True
+    )
+
+    rows = []
+    for ticket in TICKETS_TO_TEST:
+        task = ticket["description"]
+        start = time.perf_counter()
+        selected = retriever.retrieve(task)
+        retrieval_ms = (time.perf_counter() - start) * 1000
+
+        covered = not selected or get_reference_tables(ticket["sql"]) <= set(selected)
+
+        row = {
+            "id": ticket["id"],
+            "tables": len(selected) or len(db_schema),
+            "full_tokens": count_tokens(get_prompt(full_tool, task)),
+            "hinted_tokens": count_tokens(get_prompt(hinted_tool, task)),
+            "pruned_tokens": count_tokens(get_prompt(pruned_tool, task)),
+            "retrieval_ms": retrieval_ms,
+            "covered": covered,
+        }
+        if invoke:
+            tools = (("full", full_tool), ("hinted", hinted_tool), ("pruned", pruned_tool))
+            for name, tool in tools:
+                start = time.perf_counter()
+                tool.generate_query(task)
+                row[f"{name}_llm_ms"] = (time.perf_counter() - start) * 1000
+        rows.append(row)
+
+    print(
+        f"{'ticket':>6} {'tables':>6} {'full tok':>9} {'hinted tok':>11} "
+        f"{'pruned tok':>11} {'covered':>8}"
+    )
+    for row in rows:
+        print(
+            f"{row['id']:>6} {row['tables']:>6} {row['full_tokens']:>9} "
+            f"{row['hinted_tokens']:>11} {row['pruned_tokens']:>11} "
+            f"{str(row['covered']):>8}"
+        )
+
+    full_tokens = mean(row["full_tokens"] for row in rows)
+    hinted_tokens = mean(row["hinted_tokens"] for row in rows)
+    pruned_tokens = mean(row["pruned_tokens"] for row in rows)
+    print(f"\nschema tables: {len(db_schema)}, top_k: {top_k}")
+    print(
+        f"prompt tokens, full schema + hint (default): {full_tokens:.0f} -> "
+        f"{hinted_tokens:.0f} ({hinted_tokens / full_tokens - 1:+.1%}, shared prefix)"
+    )
+    print(
+        f"prompt tokens, pruned schema (prune: true): {full_tokens:.0f} -> "
+        f"{pruned_tokens:.0f} ({pruned_tokens / full_tokens - 1:+.1%})"
+    )
+    print(f"reference tables covered: {sum(row['covered'] for row in rows)}/{len(rows)}")
+    print(f"retrieval time: {mean(row['retrieval_ms'] for row in rows):.2f} ms per ticket")
+    if invoke:
+        print(
+            f"LLM latency: {mean(row['full_llm_ms'] for row in rows):.0f} ms full, "
+            f"{mean(row['hinted_llm_ms'] for row in rows):.0f} ms hinted, "
+            f"{mean(row['pruned_llm_ms'] for row in rows):.0f} ms pruned"
+        )
+    db_client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure schema pruning on the test tickets")
+    parser.add_argument("--connection-string", default=DEFAULT_CONNECTION_STRING)
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument(
+        "--invoke", action="store_true", help="also measure LLM latency (needs an API key)"
+    )
+    args = parser.parse_args()
+
+    measure(args.connection_string, args.top_k, args.invoke)
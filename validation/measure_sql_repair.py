@@ -0,0 +1,135 @@
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+from statistics import mean
+
+import yaml
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.constants import TICKETS_TO_TEST
+from src.agent.agent import DataAnalysisAgent
+from src.clients.db_client import DatabaseClient
+from src.models.schemas import JiraTicket
+
+logging.basicConfig(level=logging.ERROR)
+
+DEFAULT_CONFIG = "config/config.yaml"
+DEFAULT_CONNECTION_STRING = "sqlite:///data/porsche_analytics.db"
+
+
+class CountingLLM:
+    """LLM wrapper counting the calls (reset before every ticket)."""
+
+    def __init__(self, llm):
+        self.llm = llm
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, *args, **kwargs):
+        with self._lock:
+            self.calls += 1
+        return self.llm.invoke(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
+
+
+class DryRunJiraClient:
+    """JIRA client discarding the updates (the test tickets aren't in JIRA)."""
+
+    def transition_issue(self, **kwargs):
+        pass
+
+    def add_comment(self, **kwargs):
+        pass
+
+
+def create_agent(config_path: str, db_client, llm, repair: bool) -> DataAnalysisAgent:
+    """Agent without response caches (every attempt is a real LLM call)."""
+    with open(config_path) as file:
+        config = yaml.safe_load(file)
+    config["agent"]["repair_failed_sql"] = repair
+    config["agent"].pop("semantic_cache", None)
+    config["agent"].pop("llm_cache", None)
+
+    with tempfile.NamedTemporaryFile("w", suffix=".yaml", delete=False) as file:
+        yaml.safe_dump(config, file)
+    try:
+        return DataAnalysisAgent(
+            agent_config=file.name,
+            db_client=db_client,
+            max_retries=config["agent"]["max_retries"],
+            jira_client=DryRunJiraClient(),
+            llm=llm,
+        )
+    finally:
+        os.remove(file.name)
+
+
+def measure(config_path: str, connection_string: str, runs: int) -> None:
+    """Compare LLM calls and success of the test tickets with and without repair."""
+    from langchain_openai import ChatOpenAI
+
+    with open(config_path) as file:
+        llm_config = yaml.safe_load(file)["agent"]["llm"]
+    llm = CountingLLM(
+        ChatOpenAI(
+            model=llm_config["model_name"],
+            temperature=llm_config["temperature"],
+            max_tokens=llm_config["max_tokens"],
+        )
+    )
+    db_client = DatabaseClient(connection_string, read_only=True)
+
+    results = {}
+    for repair in (False, True):
+        agent = create_agent(config_path, db_client, llm, repair)
+        rows = []
+        for _ in range(runs):
+            for ticket in TICKETS_TO_TEST:
+                llm.calls = 0
+                final_state = agent.process_ticket(
+                    JiraTicket(
+                        ticket_id=str(ticket["id"]),
+                        summary=ticket["summary"],
+                        description=ticket["description"],
+                        status="Open",
+                    )
+                )
+                rows.append(
+                    {
+                        "id": ticket["id"],
+                        "llm_calls": llm.calls,
+                        "retries": final_state.retry_count,
+                        "succeeded": final_state.query_result is not None,
+                    }
+                )
+        results["repair" if repair else "regenerate"] = rows
+
+    print(f"{'mode':>10} {'LLM calls':>10} {'retries':>8} {'succeeded':>10}")
+    for mode, rows in results.items():
+        print(
+            f"{mode:>10} {mean(row['llm_calls'] for row in rows):>10.2f} "
+            f"{mean(row['retries'] for row in rows):>8.2f} "
+            f"{sum(row['succeeded'] for row in rows):>5}/{len(rows)}"
+        )
+    before = mean(row["llm_calls"] for row in results["regenerate"])
+    after = mean(row["llm_calls"] for row in results["repair"])
+    print(f"\nLLM calls per ticket: {before:.2f} -> {after:.2f} ({1 - after / before:.1%} fewer)")
+    db_client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure LLM calls per ticket with and without SQL repair (needs an API key)"
+    )
+    parser.add_argument("--config", default=DEFAULT_CONFIG)
+    parser.add_argument("--connection-string", default=DEFAULT_CONNECTION_STRING)
+    parser.add_argument("--runs", type=int, default=1, help="passes over the test tickets")
+    args = parser.parse_args()
+
+    measure(args.config, args.connection_string, args.runs)